@@ -0,0 +1,48 @@
+"""
+Micro-benchmark: WaveContext serialization.
+
+Compares the original path (dataclasses.asdict + json.dumps(indent=2))
+with the hand-written to_dict and the pretty/compact to_json modes.
+
+Usage:
+    python benchmarks/bench_context_json.py [--number N]
+"""
+
+import argparse
+import json
+import sys
+import timeit
+from dataclasses import asdict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from wave_toolkit.context import get_wave_context
+from wave_toolkit.jsonutil import available_backend
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--number", type=int, default=20000, help="Calls per case")
+    args = parser.parse_args()
+
+    ctx = get_wave_context()
+    cases = [
+        ("asdict", lambda: asdict(ctx)),
+        ("to_dict", ctx.to_dict),
+        ("asdict + json.dumps(indent=2)", lambda: json.dumps(asdict(ctx), indent=2)),
+        ("to_json()", ctx.to_json),
+        ("to_json(compact=True)", lambda: ctx.to_json(compact=True)),
+    ]
+
+    print(f"JSON backend: {available_backend()}, {args.number} calls per case")
+    baseline = {}
+    for name, func in cases:
+        seconds = min(timeit.repeat(func, number=args.number, repeat=3))
+        per_call = seconds / args.number * 1e6
+        reference = baseline.setdefault("dict" if "json" not in name else "json", per_call)
+        print(f"  {name:32} {per_call:8.2f} us/call  {reference / per_call:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
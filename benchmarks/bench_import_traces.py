@@ -0,0 +1,326 @@
+"""
+Scale benchmark: trace loading.
+
+Generates trace files of 10^3 to 10^7 records with configurable payload
+size, invalid-record ratio, layout (JSON array or JSON Lines) and
+compression, then measures every loading mode on each file:
+
+    full     import_traces(path)
+    stream   iter_traces(path, skip_invalid=True)
+    head     import_traces(path, head=1000)
+    sample   import_traces(path, sample=1000, seed=0)       (reservoir)
+    seek     import_traces(path, sample=1000, seed=0, seek=True)
+             (uncompressed JSON Lines only)
+
+Each case runs in a fresh interpreter so peak RSS is its own. Reported per
+case: records/sec, time to first trace (for list-returning modes, the time
+to the whole list) and peak RSS. Modes that reject a file with invalid
+records still report the time the rejection took.
+
+Results are written as JSON; pass an earlier result file to --compare to
+print the speedup of every matching case against that baseline.
+
+Usage:
+    python benchmarks/bench_import_traces.py [--sizes 1e3,1e5,1e7] [--payload 256]
+        [--invalid 0.01] [--compression none,gzip,bgzf,zstd] [--format jsonl,json]
+        [--modes full,stream,head,sample,seek] [--output FILE] [--compare FILE]
+"""
+
+import argparse
+import bz2
+import gzip
+import json
+import lzma
+import os
+import platform
+import random
+import struct
+import subprocess
+import sys
+import time
+import zlib
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+try:
+    import zstandard
+except ImportError:  # zstd cases are skipped
+    zstandard = None
+
+MODES = ("full", "stream", "head", "sample", "seek")
+COMPRESSIONS = ("none", "gzip", "bgzf", "bz2", "xz", "zstd")
+FORMATS = ("jsonl", "json")
+EXTENSIONS = {"none": "", "gzip": ".gz", "bgzf": ".gz", "bz2": ".bz2", "xz": ".xz", "zstd": ".zst"}
+
+PREVIEW_SIZE = 1000
+STATES = ("completed", "completed", "completed", "running", "failed", "timeout")
+
+# Uncompressed bytes per BGZF block / zstd frame
+BGZF_BLOCK = 65280
+ZSTD_FRAME = 1 << 20
+WRITE_BATCH = 1 << 20
+
+
+class BgzfWriter:
+    """Minimal bgzip-compatible writer: independent gzip members with their size in a BC extra field."""
+
+    def __init__(self, fp):
+        self._fp = fp
+        self._buf = b""
+
+    def _block(self, data: bytes):
+        compressor = zlib.compressobj(6, zlib.DEFLATED, -15)
+        deflated = compressor.compress(data) + compressor.flush()
+        size = 18 + len(deflated) + 8
+        header = b"\x1f\x8b\x08\x04\x00\x00\x00\x00\x00\xff\x06\x00BC\x02\x00" + struct.pack("<H", size - 1)
+        self._fp.write(header + deflated + struct.pack("<II", zlib.crc32(data), len(data)))
+
+    def write(self, data: bytes):
+        data, pos = self._buf + data, 0
+        while len(data) - pos >= BGZF_BLOCK:
+            self._block(data[pos:pos + BGZF_BLOCK])
+            pos += BGZF_BLOCK
+        self._buf = data[pos:]
+
+    def close(self):
+        if self._buf:
+            self._block(self._buf)
+        self._block(b"")  # EOF marker
+        self._fp.close()
+
+
+class ZstdFramedWriter:
+    """Writes independently compressed zstd frames, as pzstd does."""
+
+    def __init__(self, fp):
+        self._fp = fp
+        self._cctx = zstandard.ZstdCompressor(level=3)
+        self._buf = b""
+
+    def write(self, data: bytes):
+        data, pos = self._buf + data, 0
+        while len(data) - pos >= ZSTD_FRAME:
+            self._fp.write(self._cctx.compress(data[pos:pos + ZSTD_FRAME]))
+            pos += ZSTD_FRAME
+        self._buf = data[pos:]
+
+    def close(self):
+        if self._buf:
+            self._fp.write(self._cctx.compress(self._buf))
+        self._fp.close()
+
+
+def open_writer(path: Path, compression: str):
+    if compression == "none":
+        return open(path, "wb")
+    if compression == "gzip":
+        return gzip.open(path, "wb", compresslevel=6)
+    if compression == "bz2":
+        return bz2.open(path, "wb")
+    if compression == "xz":
+        return lzma.open(path, "wb", preset=1)
+    if compression == "bgzf":
+        return BgzfWriter(open(path, "wb"))
+    return ZstdFramedWriter(open(path, "wb"))
+
+
+def trace_lines(records: int, payload: int, invalid: float, seed: int = 0):
+    """Yield one encoded trace per record; a fraction ``invalid`` lack their output."""
+    rng = random.Random(seed)
+    text = "".join(rng.choice("abcdefghijklmnopqrstuvwxyz ") for _ in range(max(payload // 2, 1)))
+    output = json.dumps({"response": text})
+    start = 1_700_000_000
+    for i in range(records):
+        state = STATES[i % len(STATES)]
+        tail = "" if rng.random() < invalid else f', "output": {output}'
+        yield (
+            f'{{"trace_id": "trace_{i:08d}", "state": "{state}", "timestamp": {start + i}, '
+            f'"input": {{"query": "q{i}", "context": "{text}"}}{tail}}}'
+        )
+
+
+def generate(path: Path, records: int, payload: int, invalid: float, fmt: str, compression: str):
+    """Write a trace file without holding it in memory."""
+    tmp = path.with_name(path.name + ".tmp")
+    out = open_writer(tmp, compression)
+    batch: List[str] = []
+    size = 0
+    first = True
+    if fmt == "json":
+        out.write(b"[\n")
+    for line in trace_lines(records, payload, invalid):
+        if fmt == "json" and not first:
+            line = ",\n" + line
+        elif fmt == "jsonl":
+            line += "\n"
+        first = False
+        batch.append(line)
+        size += len(line)
+        if size >= WRITE_BATCH:
+            out.write("".join(batch).encode("utf-8"))
+            batch, size = [], 0
+    out.write("".join(batch).encode("utf-8"))
+    if fmt == "json":
+        out.write(b"\n]\n")
+    out.close()
+    os.replace(tmp, path)
+
+
+def dataset_path(data_dir: Path, records: int, payload: int, invalid: float, fmt: str, compression: str) -> Path:
+    name = f"traces-{records}-p{payload}-i{invalid:g}-{compression}.{fmt}{EXTENSIONS[compression]}"
+    return data_dir / name
+
+
+def run_case(case: Dict[str, Any]) -> Dict[str, Any]:
+    """Load one file in one mode; runs in the child interpreter."""
+    from wave_toolkit.perf import peak_memory
+    from wave_toolkit.traces import import_traces, iter_traces
+
+    path, mode = case["path"], case["mode"]
+    base_rss = peak_memory()["peak_rss_bytes"]
+    start = time.perf_counter()
+    first = None
+    loaded = 0
+    outcome = "ok"
+    try:
+        if mode == "stream":
+            for _ in iter_traces(path, skip_invalid=True):
+                if first is None:
+                    first = time.perf_counter() - start
+                loaded += 1
+        else:
+            kwargs = {
+                "full": {},
+                "head": {"head": PREVIEW_SIZE},
+                "sample": {"sample": PREVIEW_SIZE, "seed": 0},
+                "seek": {"sample": PREVIEW_SIZE, "seed": 0, "seek": True},
+            }[mode]
+            loaded = len(import_traces(path, **kwargs))
+    except ValueError as e:
+        outcome = "rejected" if "invalid trace" in str(e) else f"error: {e}"
+    seconds = time.perf_counter() - start
+    return {
+        "loaded": loaded,
+        "seconds": seconds,
+        "first_seconds": first if first is not None else seconds,
+        "records_per_sec": loaded / seconds if seconds and loaded else 0.0,
+        "peak_rss_bytes": peak_memory()["peak_rss_bytes"],
+        "base_rss_bytes": base_rss,
+        "outcome": outcome,
+    }
+
+
+def case_key(case: Dict[str, Any]) -> str:
+    return "{records}/p{payload}/i{invalid:g}/{format}/{compression}/{mode}".format(**case)
+
+
+def parse_list(value: str, choices) -> List[str]:
+    items = [item.strip() for item in value.split(",") if item.strip()]
+    unknown = [item for item in items if item not in choices]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown value(s) {', '.join(unknown)}; choose from {', '.join(choices)}")
+    return items
+
+
+def environment() -> Dict[str, Any]:
+    commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True)
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "commit": commit.stdout.strip() or None,
+        "zstandard": zstandard is not None,
+    }
+
+
+def format_rate(value: float) -> str:
+    return f"{value / 1e6:.2f}M" if value >= 1e6 else f"{value / 1e3:.1f}k"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", default="1e3,1e4,1e5", help="Comma-separated record counts (default: 1e3,1e4,1e5)")
+    parser.add_argument("--payload", type=int, default=256, help="Approximate payload bytes per trace")
+    parser.add_argument("--invalid", type=float, default=0.0, help="Fraction of records missing a required field")
+    parser.add_argument("--compression", default="none,gzip", help=f"Comma-separated: {', '.join(COMPRESSIONS)}")
+    parser.add_argument("--format", default="jsonl", help=f"Comma-separated: {', '.join(FORMATS)}")
+    parser.add_argument("--modes", default=",".join(MODES), help=f"Comma-separated: {', '.join(MODES)}")
+    parser.add_argument("--data-dir", default=".claude/bench/traces", help="Where generated files are kept")
+    parser.add_argument("--output", default=".claude/bench/import_traces.json", help="Result file")
+    parser.add_argument("--compare", help="Earlier result file to compare against")
+    parser.add_argument("--timeout", type=float, default=3600, help="Seconds allowed per case")
+    parser.add_argument("--run-case", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.run_case:
+        print(json.dumps(run_case(json.loads(args.run_case))))
+        return 0
+
+    try:
+        sizes = [int(float(size)) for size in args.sizes.split(",")]
+        compressions = parse_list(args.compression, COMPRESSIONS)
+        formats = parse_list(args.format, FORMATS)
+        modes = parse_list(args.modes, MODES)
+    except (ValueError, argparse.ArgumentTypeError) as e:
+        parser.error(str(e))
+    if "zstd" in compressions and zstandard is None:
+        print("zstandard is not installed; skipping zstd cases", file=sys.stderr)
+        compressions.remove("zstd")
+
+    baseline = {}
+    if args.compare:
+        baseline = {case_key(r): r for r in json.loads(Path(args.compare).read_text())["results"]}
+
+    data_dir = Path(args.data_dir)
+    data_dir.mkdir(parents=True, exist_ok=True)
+    results = []
+    print(f"{'case':54} {'records/s':>10} {'first':>9} {'peak RSS':>9}  outcome")
+    for records in sizes:
+        for fmt in formats:
+            for compression in compressions:
+                path = dataset_path(data_dir, records, args.payload, args.invalid, fmt, compression)
+                if not path.exists():
+                    started = time.perf_counter()
+                    generate(path, records, args.payload, args.invalid, fmt, compression)
+                    print(f"  generated {path.name} ({path.stat().st_size / 1e6:.1f} MB, "
+                          f"{time.perf_counter() - started:.1f}s)", file=sys.stderr)
+                for mode in modes:
+                    if mode == "seek" and (fmt != "jsonl" or compression != "none"):
+                        continue
+                    case = {"records": records, "payload": args.payload, "invalid": args.invalid,
+                            "format": fmt, "compression": compression, "mode": mode,
+                            "file_bytes": path.stat().st_size}
+                    proc = subprocess.run(
+                        [sys.executable, __file__, "--run-case", json.dumps({"path": str(path), "mode": mode})],
+                        capture_output=True, text=True, timeout=args.timeout,
+                    )
+                    if proc.returncode != 0:
+                        case.update(outcome=f"crashed: {proc.stderr.strip().splitlines()[-1:]}")
+                        results.append(case)
+                        print(f"{case_key(case):54} {case['outcome']}")
+                        continue
+                    case.update(json.loads(proc.stdout))
+                    results.append(case)
+
+                    line = (f"{case_key(case):54} {format_rate(case['records_per_sec']):>10} "
+                            f"{case['first_seconds'] * 1e3:7.1f}ms {case['peak_rss_bytes'] / 2**20:7.1f}MB  "
+                            f"{case['outcome']}")
+                    previous = baseline.get(case_key(case))
+                    if previous and previous.get("seconds"):
+                        line += f"  {previous['seconds'] / case['seconds']:.2f}x vs baseline"
+                    print(line)
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps({"environment": environment(), "results": results}, indent=2), encoding="utf-8")
+    print(f"Results written to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
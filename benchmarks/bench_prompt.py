@@ -0,0 +1,99 @@
+"""
+Micro-benchmark: system prompt rendering.
+
+Compares the original notebook implementation (one hand-written f-string
+per call) with the compiled ``generate_system_prompt`` and
+``render_system_prompts``.
+
+Usage:
+    python benchmarks/bench_prompt.py [--number N] [--repeat R]
+"""
+
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from wave_toolkit.context import get_wave_context
+from wave_toolkit.prompt import generate_system_prompt, render_system_prompts
+
+
+def baseline_prompt(ctx) -> str:
+    """generate_system_prompt as it was in project-book.ipynb."""
+    tools_list = []
+    if ctx.tools.git:
+        tools_list.append("git")
+    if ctx.tools.node:
+        tools_list.append("node/npm")
+    if ctx.tools.python:
+        tools_list.append("python")
+    if ctx.tools.docker:
+        tools_list.append("docker")
+    if ctx.tools.jupyter:
+        tools_list.append("jupyter")
+
+    tools_str = ", ".join(tools_list) if tools_list else "none detected"
+    git_status = f"Yes (branch: {ctx.session.git_branch})" if ctx.session.is_git_repo else "No"
+    user_info = f"{ctx.user.domain}\\{ctx.user.name}" if ctx.user.domain else ctx.user.name
+
+    return f"""# Claude System Context
+
+You are Claude, running in an interactive Jupyter notebook within the Wave Toolkit ecosystem.
+
+## Environment (Auto-Detected)
+- **Machine:** {ctx.machine.name} ({ctx.machine.arch}, {ctx.machine.cores} cores)
+- **OS:** {ctx.machine.os}
+- **User:** {user_info}
+- **Environment:** {ctx.shell.name} {ctx.shell.version} ({ctx.shell.environment})
+- **Working Directory:** {ctx.session.cwd}
+- **Git Repo:** {git_status}
+- **Available Tools:** {tools_str}
+
+## Operating Principles
+1. Provide concrete, executable code cells for Python/Jupyter
+2. Prefer idempotent operations (safe to re-run)
+3. Include verification steps after actions
+4. State assumptions explicitly
+5. When uncertain, ask rather than guess
+
+## Collaboration Style
+- Think out loud - share reasoning
+- Offer alternatives when multiple approaches exist
+- Build on context from earlier in the session
+- Trust flows both ways
+
+*Context generated: {ctx.timestamp}*
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--number", type=int, default=100000, help="Calls per case")
+    parser.add_argument("--repeat", type=int, default=7, help="Timing rounds (best is kept)")
+    args = parser.parse_args()
+
+    ctx = get_wave_context()
+    assert generate_system_prompt(ctx) == baseline_prompt(ctx)
+    batch = [ctx] * 100
+    cases = [
+        ("baseline f-string", lambda: baseline_prompt(ctx), 1),
+        ("generate_system_prompt", lambda: generate_system_prompt(ctx), 1),
+        ("render_system_prompts (per prompt)", lambda: render_system_prompts(batch), len(batch)),
+    ]
+
+    # Interleave the repeats so every case sees the same machine conditions
+    best = [float("inf")] * len(cases)
+    for _ in range(args.repeat):
+        for i, (_name, func, per_call) in enumerate(cases):
+            calls = max(1, args.number // per_call)
+            best[i] = min(best[i], timeit.timeit(func, number=calls) / (calls * per_call))
+
+    print(f"{args.number} prompts per case")
+    reference = best[0]
+    for (name, _func, _per_call), seconds in zip(cases, best):
+        print(f"  {name:36} {seconds * 1e6:8.3f} us/prompt  {reference / seconds:5.2f}x")
+
+if __name__ == "__main__":
+    main()
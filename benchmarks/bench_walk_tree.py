@@ -0,0 +1,114 @@
+"""
+Scale benchmark: repository directory walk.
+
+Generates a synthetic tree (default 20000 directories, a few files each)
+and compares a serial ``os.walk`` that counts files and languages, the
+previous walk_tree (one thread pool task per directory) and the current
+walk_tree, serial (workers=1) and with the default pool.
+
+Usage:
+    python benchmarks/bench_walk_tree.py [--dirs N] [--fanout F] [--files K]
+        [--repeat R] [--workers W]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from wave_toolkit.framework import LANG_EXTENSIONS, is_ignored, scan_directory, walk_tree
+
+EXTENSIONS = (".py", ".md", ".json", ".txt", ".ts")
+
+
+def generate(root: str, dirs: int, fanout: int, files: int):
+    """Create ``dirs`` directories breadth-first, ``fanout`` per parent, ``files`` files each."""
+    queue = [root]
+    made = 0
+    for parent in queue:
+        for i in range(files):
+            open(os.path.join(parent, f"file{i}{EXTENSIONS[i % len(EXTENSIONS)]}"), "w").close()
+        for i in range(fanout):
+            if made == dirs:
+                break
+            child = os.path.join(parent, f"d{i}")
+            os.mkdir(child)
+            queue.append(child)
+            made += 1
+
+
+def os_walk(root: str) -> int:
+    """Serial os.walk with the same pruning and language counting."""
+    count = 0
+    languages = {}
+    for _path, dirnames, filenames in os.walk(root):
+        dirnames[:] = [name for name in dirnames if not is_ignored(name)]
+        for name in filenames:
+            if is_ignored(name):
+                continue
+            count += 1
+            lang = LANG_EXTENSIONS.get(os.path.splitext(name)[1].lower())
+            if lang:
+                languages[lang] = languages.get(lang, 0) + 1
+    return count
+
+
+def per_directory_walk(root: str, workers=None) -> int:
+    """walk_tree as it was: every directory is its own task."""
+    scans = {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = {pool.submit(scan_directory, root): ""}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                rel = pending.pop(future)
+                scan = future.result()
+                scans[rel] = scan
+                for name in scan.subdirs:
+                    child = f"{rel}/{name}" if rel else name
+                    pending[pool.submit(scan_directory, os.path.join(root, child))] = child
+    return sum(scan.file_count for scan in scans.values())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--dirs", type=int, default=20000, help="Directories to generate")
+    parser.add_argument("--fanout", type=int, default=8, help="Subdirectories per directory")
+    parser.add_argument("--files", type=int, default=4, help="Files per directory")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing rounds (best is kept)")
+    parser.add_argument("--workers", type=int, default=None, help="Pool size for the parallel walks")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        generate(root, args.dirs, args.fanout, args.files)
+        cases = [
+            ("os.walk (serial)", lambda: os_walk(root)),
+            ("per-directory tasks (previous)", lambda: per_directory_walk(root, args.workers)),
+            ("walk_tree workers=1", lambda: sum(s.file_count for s in walk_tree(root, 1).values())),
+            ("walk_tree", lambda: sum(s.file_count for s in walk_tree(root, args.workers).values())),
+        ]
+        expected = cases[0][1]()
+        for name, func in cases:
+            assert func() == expected, name
+
+        # Interleave the repeats so every case sees the same page cache state
+        best = [float("inf")] * len(cases)
+        for _ in range(args.repeat):
+            for i, (_name, func) in enumerate(cases):
+                start = time.perf_counter()
+                func()
+                best[i] = min(best[i], time.perf_counter() - start)
+
+    print(f"{args.dirs} directories, {expected} files, {os.cpu_count()} CPUs")
+    reference = best[0]
+    for (name, _func), seconds in zip(cases, best):
+        print(f"  {name:32} {seconds * 1e3:9.1f} ms  {reference / seconds:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,87 +4,13 @@ Demonstration of the import_traces() function.
 This script shows how to use the import_traces() function with various scenarios.
 """
 import json
+import sys
 import tempfile
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
 
-# The import_traces function (from project-book.ipynb)
-def import_traces(json_file_path):
-    """
-    Import trace data from a JSON file with proper error handling.
-    
-    See project-book.ipynb for full implementation.
-    """
-    # Check if file exists
-    if not Path(json_file_path).exists():
-        raise FileNotFoundError(f"Trace file not found: {json_file_path}")
-    
-    # Read and parse JSON
-    try:
-        with open(json_file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-    except json.JSONDecodeError as e:
-        raise json.JSONDecodeError(
-            f"Invalid JSON in file {json_file_path}: {str(e)}", 
-            e.doc, 
-            e.pos
-        )
-    
-    # Ensure data is a list
-    if isinstance(data, dict):
-        data = [data]
-    elif not isinstance(data, list):
-        raise ValueError(
-            f"Expected JSON to contain a list or dict, got {type(data).__name__}"
-        )
-    
-    # Required fields for trace data
-    required_fields = ['trace_id', 'state', 'input', 'output']
-    
-    # Validate each trace
-    validated_traces = []
-    errors = []
-    
-    for idx, trace in enumerate(data):
-        if not isinstance(trace, dict):
-            errors.append(f"Trace at index {idx} is not a dictionary: {type(trace).__name__}")
-            continue
-        
-        # Check for missing required fields
-        missing_fields = [field for field in required_fields if field not in trace]
-        
-        if missing_fields:
-            error_msg = (
-                f"Trace at index {idx} is missing required fields: {', '.join(missing_fields)}. "
-                f"Available fields: {', '.join(trace.keys()) if trace.keys() else 'none'}. "
-                f"Required fields are: {', '.join(required_fields)}"
-            )
-            errors.append(error_msg)
-            continue
-        
-        # Validate that required fields are not None
-        none_fields = [field for field in required_fields if trace[field] is None]
-        if none_fields:
-            error_msg = (
-                f"Trace at index {idx} has null values for required fields: {', '.join(none_fields)}"
-            )
-            errors.append(error_msg)
-            continue
-        
-        validated_traces.append(trace)
-    
-    # If we have errors, raise a comprehensive error message
-    if errors:
-        error_summary = f"Found {len(errors)} invalid trace(s) in {json_file_path}:\n"
-        error_summary += "\n".join(f"  - {err}" for err in errors[:5])
-        if len(errors) > 5:
-            error_summary += f"\n  ... and {len(errors) - 5} more error(s)"
-        raise ValueError(error_summary)
-    
-    if not validated_traces:
-        raise ValueError(f"No valid traces found in {json_file_path}")
-    
-    return validated_traces
+from wave_toolkit.traces import import_traces
 
 
 def demo():
@@ -0,0 +1,40 @@
+"""
+Shared test fixtures.
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from wave_toolkit.context import (
+    MachineContext,
+    SessionContext,
+    ShellContext,
+    ToolsContext,
+    UserContext,
+    WaveContext,
+)
+
+
+@pytest.fixture
+def make_context():
+    """Factory for WaveContext objects with fixed, overridable values."""
+    def make(
+        timestamp: str = "2025-01-01T12:00:00",
+        machine: str = "spiral",
+        cwd: str = "/home/wave/repo",
+        branch: str = "main",
+        domain=None,
+        docker: bool = False,
+    ) -> WaveContext:
+        return WaveContext(
+            timestamp=timestamp,
+            machine=MachineContext(machine, "x86_64", "Linux 6.1", 8),
+            user=UserContext("wave", "/home/wave", domain),
+            shell=ShellContext("Python/Jupyter", "3.11.7", "notebook"),
+            session=SessionContext(cwd, True, branch),
+            tools=ToolsContext(True, False, True, docker, True, True),
+        )
+    return make
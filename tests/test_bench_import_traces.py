@@ -0,0 +1,58 @@
+"""
+Tests for the trace loading benchmark's data generator and runner.
+"""
+import gzip
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "benchmarks"))
+
+import bench_import_traces as bench
+from wave_toolkit._compressed import bgzf_blocks
+from wave_toolkit.traces import iter_traces
+
+
+class TestBenchImportTraces:
+    """Test suite for benchmarks/bench_import_traces.py."""
+
+    @pytest.mark.parametrize("compression", ["none", "gzip", "bgzf", "bz2", "xz"])
+    @pytest.mark.parametrize("fmt", ["jsonl", "json"])
+    def test_generated_files_load(self, tmp_path, compression, fmt):
+        path = bench.dataset_path(tmp_path, 300, 64, 0.1, fmt, compression)
+        bench.generate(path, 300, 64, 0.1, fmt, compression)
+
+        records = list(iter_traces(str(path), skip_invalid=True))
+        assert 240 < len(records) < 300
+        ids = [r["trace_id"] for r in records]
+        assert ids == sorted(ids)
+        assert all(len(r["input"]["context"]) == 32 for r in records)
+
+    def test_bgzf_writer(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(bench, "BGZF_BLOCK", 1000)
+        path = tmp_path / "t.jsonl.gz"
+        bench.generate(path, 100, 64, 0, "jsonl", "bgzf")
+        data = path.read_bytes()
+        assert len(bgzf_blocks(data)) > 5
+        assert gzip.decompress(data).count(b"\n") == 100
+
+    def test_run(self, tmp_path, capsys):
+        output = tmp_path / "results.json"
+        args = ["--sizes", "500", "--payload", "32", "--compression", "none", "--modes", "full,seek",
+                "--data-dir", str(tmp_path / "data"), "--output", str(output)]
+        assert bench.main(args) == 0
+        results = json.loads(output.read_text())["results"]
+        assert [r["mode"] for r in results] == ["full", "seek"]
+        assert results[0]["loaded"] == 500 and results[0]["records"] == 500
+        assert all(r["outcome"] == "ok" and r["peak_rss_bytes"] > 0 for r in results)
+
+        assert bench.main(args + ["--compare", str(output), "--output", str(tmp_path / "again.json")]) == 0
+        assert "vs baseline" in capsys.readouterr().out
+
+    def test_rejects_unknown_choices(self):
+        with pytest.raises(SystemExit):
+            bench.main(["--compression", "lz4"])
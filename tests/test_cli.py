@@ -0,0 +1,91 @@
+"""
+Tests for the package's lazy imports and the wave command line.
+"""
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+import wave_toolkit
+from wave_toolkit.cli import main
+
+
+def run_python(code: str) -> str:
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return result.stdout
+
+
+class TestLazyPackage:
+    """Test suite for the wave_toolkit package root."""
+
+    def test_import_loads_no_submodules(self):
+        out = run_python(
+            "import sys, wave_toolkit\n"
+            "print(sorted(m for m in sys.modules if m.startswith('wave_toolkit.')))"
+        )
+        assert out.strip() == "[]"
+
+    def test_name_access_loads_only_its_module(self):
+        out = run_python(
+            "import sys\n"
+            "from wave_toolkit import import_traces\n"
+            "print(sorted(m for m in sys.modules if m.startswith('wave_toolkit.')))"
+        )
+        assert out.strip() == "['wave_toolkit.perf', 'wave_toolkit.traces']"
+
+    def test_lazy_names_resolve(self):
+        from wave_toolkit.context import get_wave_context
+
+        assert wave_toolkit.get_wave_context is get_wave_context
+        for name in wave_toolkit.__all__:
+            assert getattr(wave_toolkit, name) is not None
+        assert wave_toolkit.snapshots.SnapshotStore is wave_toolkit.SnapshotStore
+        assert "analyze_framework" in dir(wave_toolkit)
+        with pytest.raises(AttributeError):
+            wave_toolkit.no_such_name
+
+
+class TestCli:
+    """Test suite for the wave command."""
+
+    def test_context_json(self, capsys):
+        assert main(["context", "--json", "--compact"]) == 0
+        data = json.loads(capsys.readouterr().out)
+        assert set(data) == {"timestamp", "machine", "user", "shell", "session", "tools"}
+
+    def test_context_text(self, capsys):
+        assert main(["context"]) == 0
+        assert "Wave Context" in capsys.readouterr().out
+
+    def test_analyze(self, tmp_path, capsys):
+        (tmp_path / "a.py").write_text("")
+        assert main(["analyze", str(tmp_path), "--json"]) == 0
+        assert json.loads(capsys.readouterr().out)["file_count"] == 1
+        assert main(["analyze", str(tmp_path / "missing")]) == 1
+
+    def test_traces(self, tmp_path, capsys):
+        traces = tmp_path / "traces.json"
+        traces.write_text(json.dumps([
+            {"trace_id": "a", "state": "done", "input": {}, "output": {}},
+            {"trace_id": "b", "state": "done", "input": {}, "output": {}},
+        ]))
+        assert main(["traces", str(traces)]) == 0
+        assert "2 traces" in capsys.readouterr().out
+        assert main(["traces", str(traces), "--head", "1"]) == 0
+        assert "1 traces (sample)" in capsys.readouterr().out
+        assert main(["traces", str(traces), "--sample", "5", "--seed", "1"]) == 0
+        assert "2 traces (sample)" in capsys.readouterr().out
+        traces.write_text("[{}]")
+        assert main(["traces", str(traces)]) == 1
+
+    def test_module_entry_point(self):
+        result = subprocess.run(
+            [sys.executable, "-m", "wave_toolkit", "context", "--json"],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        )
+        assert json.loads(result.stdout)["shell"]["name"] == "Python/Jupyter"
@@ -0,0 +1,88 @@
+"""
+Tests for the frozen, interned model variants.
+"""
+import dataclasses
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from wave_toolkit.compact import FrozenWaveContext, Interner, freeze, thaw
+from wave_toolkit.context import ShellContext
+from wave_toolkit.ecosystem import ECOSYSTEM_REPOS
+from wave_toolkit.framework import FrameworkAnalysis
+from wave_toolkit.logs import LogSource
+
+
+@dataclasses.dataclass(frozen=True)
+class FrozenKey:
+    name: str
+
+
+class TestCompactModels:
+    """Test suite for freeze/thaw and interning."""
+
+    def test_models_are_slotted(self, make_context):
+        ctx = make_context("t")
+        assert not hasattr(ctx, "__dict__")
+        with pytest.raises(AttributeError):
+            ctx.extra = 1
+
+    def test_identical_parts_are_shared(self, make_context):
+        interner = Interner()
+        first = freeze(make_context("t1"), interner)
+        second = freeze(make_context("t2"), interner)
+        third = freeze(make_context("t3", cwd="/tmp"), interner)
+
+        assert isinstance(first, FrozenWaveContext)
+        assert first.machine is second.machine is third.machine
+        assert first.tools is third.tools
+        assert first.session is second.session
+        assert first.session is not third.session
+        assert len(interner) == 6
+
+    def test_frozen(self, make_context):
+        frozen = freeze(make_context("t"), Interner())
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            frozen.machine.cores = 4
+        assert hash(frozen) == hash(freeze(make_context("t"), Interner()))
+
+    def test_round_trip(self, make_context):
+        ctx = make_context("t")
+        frozen = freeze(ctx, Interner())
+        assert frozen.to_dict() == ctx.to_dict()
+        assert thaw(frozen) == ctx
+
+        analysis = FrameworkAnalysis("/r", "r", 3, {"Python": 2}, {"src": ["a.py"]}, True, False, False)
+        assert thaw(freeze(analysis, Interner())) == analysis
+
+        source = LogSource("/var/log/a.log", "spiralsafe", "SpiralSafe", "text", True)
+        assert thaw(freeze(source, Interner())) == source
+
+        repo = ECOSYSTEM_REPOS[0]
+        interner = Interner()
+        assert freeze(repo, interner) is freeze(dataclasses.replace(repo), interner)
+        assert thaw(freeze(repo, interner)) == repo
+
+    def test_bounded_pool_drops_least_recent(self):
+        interner = Interner(maxsize=2)
+        a, b, c = (FrozenKey(name) for name in "abc")
+        interner.intern(a)
+        interner.intern(b)
+        assert interner.intern(FrozenKey("a")) is a  # Refreshes a
+        interner.intern(c)
+        assert len(interner) == 2
+        assert interner.intern(FrozenKey("a")) is a
+        assert interner.intern(FrozenKey("b")) is not b
+
+    def test_non_string_values_are_not_interned(self):
+        shell = ShellContext("pwsh", 7.4, "terminal")
+        assert freeze(shell, Interner()).version == 7.4
+
+    def test_unsupported_type(self):
+        with pytest.raises(TypeError):
+            freeze(object())
+        with pytest.raises(TypeError):
+            thaw(object())
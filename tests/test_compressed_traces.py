@@ -0,0 +1,195 @@
+"""
+Tests for compressed trace input.
+"""
+import bz2
+import gzip
+import json
+import lzma
+import struct
+import sys
+import zlib
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from wave_toolkit import _compressed
+from wave_toolkit._compressed import (
+    bgzf_blocks,
+    detect_compression,
+    open_text,
+    parallel_map,
+    zstd_frames,
+)
+from wave_toolkit.traces import import_traces, iter_traces
+
+
+def make_traces(n):
+    return [{"trace_id": f"t{i}", "state": "completed", "input": {"i": i}, "output": "é" * (i % 7)} for i in range(n)]
+
+
+def jsonl(traces) -> bytes:
+    return "".join(json.dumps(t, ensure_ascii=False) + "\n" for t in traces).encode("utf-8")
+
+
+def bgzf_block(data: bytes) -> bytes:
+    """One BGZF member: a gzip header with a BC extra field holding the block size."""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, -15)
+    deflated = compressor.compress(data) + compressor.flush()
+    header = b"\x1f\x8b\x08\x04" + b"\x00" * 4 + b"\x00\xff" + struct.pack("<H", 6) + b"BC" + struct.pack("<H", 2)
+    block_size = len(header) + 2 + len(deflated) + 8
+    return header + struct.pack("<H", block_size - 1) + deflated + struct.pack("<II", zlib.crc32(data), len(data))
+
+
+def bgzf(data: bytes, block: int = 1000) -> bytes:
+    # Split mid-line and mid-character on purpose; the reader joins the pieces
+    blocks = [bgzf_block(data[i:i + block]) for i in range(0, len(data), block)]
+    return b"".join(blocks) + bgzf_block(b"")  # Empty EOF marker block
+
+
+def zstd_raw_frame(data: bytes, checksum: bool = False) -> bytes:
+    """A zstd frame of raw (stored) blocks - valid zstd built without the library."""
+    descriptor = 0x20 | (0x04 if checksum else 0)  # Single segment, 1-byte content size
+    assert len(data) < 256
+    frame = struct.pack("<I", _compressed.ZSTD_MAGIC) + bytes([descriptor, len(data)])
+    half = len(data) // 2
+    for piece, last in ((data[:half], 0), (data[half:], 1)):
+        frame += struct.pack("<I", len(piece) << 3 | last)[:3] + piece
+    return frame + (b"\x00" * 4 if checksum else b"")
+
+
+class TestDetection:
+    """Test suite for magic byte detection."""
+
+    def test_formats(self, tmp_path):
+        data = jsonl(make_traces(3))
+        cases = {
+            "plain.jsonl": (data, None),
+            "a.gz": (gzip.compress(data), "gzip"),
+            "a.bz2": (bz2.compress(data), "bzip2"),
+            "a.xz": (lzma.compress(data), "xz"),
+            "a.zst": (zstd_raw_frame(b"[]"), "zstd"),
+            "empty": (b"", None),
+        }
+        for name, (content, kind) in cases.items():
+            (tmp_path / name).write_bytes(content)
+            assert detect_compression(str(tmp_path / name)) == kind, name
+
+
+class TestCompressedTraces:
+    """Test suite for reading compressed trace files."""
+
+    @pytest.mark.parametrize("compress", [gzip.compress, bz2.compress, lzma.compress])
+    def test_stdlib_formats(self, tmp_path, compress):
+        traces = make_traces(50)
+        path = tmp_path / "traces.jsonl.x"
+        path.write_bytes(compress(jsonl(traces)))
+        assert list(iter_traces(str(path))) == traces
+
+        array = tmp_path / "traces.json.x"
+        array.write_bytes(compress(json.dumps(traces).encode()))
+        assert import_traces(str(array)) == traces
+
+    def test_multi_member_gzip(self, tmp_path):
+        traces = make_traces(30)
+        path = tmp_path / "traces.jsonl.gz"
+        path.write_bytes(gzip.compress(jsonl(traces[:10])) + gzip.compress(jsonl(traces[10:])))
+        assert bgzf_blocks(path.read_bytes()) is None
+        assert list(iter_traces(str(path))) == traces
+
+    @pytest.mark.parametrize("workers", [1, 4])
+    def test_bgzf_parallel(self, tmp_path, workers, monkeypatch):
+        monkeypatch.setattr(_compressed, "BATCH_BYTES", 300)
+        traces = make_traces(500)
+        data = jsonl(traces)
+        path = tmp_path / "traces.jsonl.gz"
+        path.write_bytes(bgzf(data))
+
+        assert len(bgzf_blocks(path.read_bytes())) == len(data) // 1000 + 2
+        with open_text(str(path), workers=workers) as f:
+            assert f.read() == data.decode("utf-8")
+        assert gzip.decompress(path.read_bytes()) == data  # Still a valid gzip file
+        assert list(iter_traces(str(path))) == traces
+
+    def test_corrupt_bgzf(self, tmp_path):
+        damaged = bytearray(bgzf(jsonl(make_traces(100))))
+        damaged[40:60] = b"\x00" * 20
+        path = tmp_path / "damaged.gz"
+        path.write_bytes(bytes(damaged))
+        with pytest.raises(ValueError, match="Corrupt compressed trace file"):
+            list(iter_traces(str(path)))
+
+    def test_zstd_frames(self):
+        frames = [zstd_raw_frame(b'{"a": 1}\n'), zstd_raw_frame(b'{"b": 2}\n', checksum=True)]
+        skippable = struct.pack("<II", _compressed.ZSTD_SKIPPABLE_MAGIC + 14, 5) + b"index"
+        data = frames[0] + skippable + frames[1]
+        start = len(frames[0]) + len(skippable)
+        assert zstd_frames(data) == [(0, len(frames[0])), (start, len(data))]
+        with pytest.raises(ValueError, match="Truncated"):
+            zstd_frames(data[:-2])
+        with pytest.raises(ValueError, match="magic"):
+            zstd_frames(frames[0] + b"garbage!")
+
+    def test_zstd_requires_zstandard(self, tmp_path):
+        if _compressed.zstandard is not None:
+            pytest.skip("zstandard is installed")
+        path = tmp_path / "traces.jsonl.zst"
+        path.write_bytes(zstd_raw_frame(b"[]"))
+        with pytest.raises(ValueError, match="zstandard"):
+            import_traces(str(path))
+
+    def test_zstd_multi_frame(self, tmp_path):
+        zstandard = pytest.importorskip("zstandard")
+        traces = make_traces(300)
+        cctx = zstandard.ZstdCompressor()
+        path = tmp_path / "traces.jsonl.zst"
+        path.write_bytes(b"".join(cctx.compress(jsonl(traces[i:i + 40])) for i in range(0, 300, 40)))
+        assert len(zstd_frames(path.read_bytes())) == 8
+        assert list(iter_traces(str(path))) == traces
+
+        single = tmp_path / "single.json.zst"
+        single.write_bytes(cctx.compress(json.dumps(traces).encode()))
+        assert import_traces(str(single)) == traces
+
+    @pytest.mark.parametrize("content_size", [True, False])
+    def test_zstd_large_frame_is_streamed(self, tmp_path, monkeypatch, content_size):
+        zstandard = pytest.importorskip("zstandard")
+        monkeypatch.setattr(_compressed, "BATCH_BYTES", 1 << 16)
+        monkeypatch.setattr(_compressed, "STREAM_CHUNK_BYTES", 1 << 12)
+        traces = make_traces(3000)
+        small, large = jsonl(traces[:10]), jsonl(traces[10:])
+        cctx = zstandard.ZstdCompressor(write_content_size=content_size)
+        if content_size:
+            large_frame = cctx.compress(large)
+        else:
+            compressor = cctx.compressobj()  # Streaming: the header omits the size
+            large_frame = compressor.compress(large) + compressor.flush()
+        path = tmp_path / "traces.jsonl.zst"
+        path.write_bytes(cctx.compress(small) + large_frame)
+
+        data = path.read_bytes()
+        frames = zstd_frames(data)
+        assert _compressed.zstd_content_size(data, frames[1]) == (len(large) if content_size else None)
+        chunks = list(_compressed._parallel_chunks(str(path), data, "zstd", frames, workers=4))
+        assert b"".join(chunks) == small + large
+        assert len(large) > 1 << 16 and max(len(c) for c in chunks) <= 1 << 12
+        assert list(iter_traces(str(path))) == traces
+
+    def test_parallel_map_keeps_order(self):
+        assert list(parallel_map(lambda x: x * x, range(100), workers=4)) == [x * x for x in range(100)]
+
+    def test_parallel_map_budget(self):
+        pulled = []
+
+        def items():
+            for i in range(50):
+                pulled.append(i)
+                yield i
+
+        weights = [1 + i % 7 for i in range(50)]
+        for done, result in enumerate(parallel_map(lambda i: i, items(), workers=8,
+                                                   weight=weights.__getitem__, budget=10)):
+            assert result == done
+            # Submitted but not yet yielded; the last item pulled may still be waiting
+            assert sum(weights[i] for i in pulled[done:-1]) <= 10
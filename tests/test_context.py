@@ -0,0 +1,66 @@
+"""
+Tests for the context model, sessions and JSON output.
+"""
+import json
+import sys
+from dataclasses import asdict
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from wave_toolkit import jsonutil
+from wave_toolkit.context import WaveContext, get_wave_context
+from wave_toolkit.session import WaveSession
+from wave_toolkit.session_index import SessionIndex
+
+
+class TestWaveContext:
+    """Test suite for WaveContext serialization."""
+
+    def test_to_dict_matches_asdict(self, make_context):
+        ctx = make_context(domain="WAVÉ")
+        assert ctx.to_dict() == asdict(ctx)
+        assert list(ctx.to_dict()) == list(asdict(ctx))
+        live = get_wave_context()
+        assert live.to_dict() == asdict(live)
+
+    def test_pretty_json_matches_stdlib(self, make_context):
+        ctx = make_context(domain="WAVÉ")
+        assert json.loads(ctx.to_json()) == asdict(ctx)
+        assert jsonutil.dumps(ctx.to_dict(), backend="json") == json.dumps(asdict(ctx), indent=2)
+
+    def test_compact_json(self, make_context):
+        text = make_context(domain="WAVÉ").to_json(compact=True)
+        assert "\n" not in text and ", " not in text
+        assert WaveContext.from_dict(json.loads(text)) == make_context(domain="WAVÉ")
+
+    @pytest.mark.skipif(jsonutil.orjson is None, reason="orjson not installed")
+    @pytest.mark.parametrize("options", [{}, {"indent": None}, {"compact": True}])
+    def test_backends_agree(self, make_context, options):
+        data = {
+            "context": make_context().to_dict(),
+            "counts": {1: "one", 2.5: "two and a half", None: "none", False: "no"},
+            "empty": [{}, []],
+        }
+        assert jsonutil.dumps(data, backend="orjson", **options) == jsonutil.dumps(data, backend="json", **options)
+
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError):
+            jsonutil.dumps({}, backend="simdjson")
+
+
+class TestWaveSession:
+    """Test suite for WaveSession persistence."""
+
+    def test_save_compact_and_index(self, make_context, tmp_path):
+        session = WaveSession("20250101_120000", "2025-01-01T12:00:00", make_context(domain="WAVÉ"), "prompt", "task")
+        session.add_log("note", "hello")
+        path = session.save(str(tmp_path), compact=True)
+
+        text = Path(path).read_text(encoding="utf-8")
+        assert "\n" not in text
+        assert json.loads(text) == session.to_dict()
+        with SessionIndex(str(tmp_path)) as index:
+            assert [r.task for r in index.query()] == ["task"]
@@ -0,0 +1,105 @@
+"""
+Tests for ecosystem repository discovery and the location cache.
+"""
+import json
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from wave_toolkit import ecosystem
+from wave_toolkit.ecosystem import ECOSYSTEM_REPOS, RepoDiscovery, discover_local_repos
+
+
+def make_checkout(path: Path) -> Path:
+    (path / ".git").mkdir(parents=True)
+    return path
+
+
+@pytest.fixture
+def workspace(tmp_path):
+    home = tmp_path / "home"
+    make_checkout(home / "SpiralSafe")
+    make_checkout(home / "repos" / "kenl")
+    make_checkout(home / "repos" / "wave-toolkit")
+    make_checkout(home / "work" / "toolate28" / "quantum-redstone")
+    (home / "projects" / "ClaudeNPC-Server-Suite").mkdir(parents=True)  # not a checkout
+    return home
+
+
+def search_paths(home):
+    return [str(home), str(home / "repos"), str(home / "projects")]
+
+
+def available(repos):
+    return {r.name: r.local_path for r in repos if r.is_available}
+
+
+class TestDiscoverLocalRepos:
+    """Test suite for discover_local_repos."""
+
+    def test_finds_checkouts_in_search_paths(self, workspace):
+        repos = discover_local_repos(search_paths(workspace))
+
+        assert [r.name for r in repos] == [r.name for r in ECOSYSTEM_REPOS]
+        assert available(repos) == {
+            "SpiralSafe": str(workspace / "SpiralSafe"),
+            "wave-toolkit": str(workspace / "repos" / "wave-toolkit"),
+            "kenl": str(workspace / "repos" / "kenl"),
+        }
+        assert all(r.local_path is None for r in ECOSYSTEM_REPOS)
+
+    def test_first_search_path_wins(self, workspace):
+        make_checkout(workspace / "projects" / "kenl")
+        repos = discover_local_repos([str(workspace / "projects"), str(workspace / "repos")])
+        assert available(repos)["kenl"] == str(workspace / "projects" / "kenl")
+
+
+class TestRepoDiscovery:
+    """Test suite for the cached RepoDiscovery service."""
+
+    def test_cache_revalidates_only_known_path(self, workspace, tmp_path, monkeypatch):
+        cache_file = tmp_path / "cache.json"
+        RepoDiscovery(search_paths(workspace), str(cache_file)).discover()
+        assert json.loads(cache_file.read_text())["kenl"] == {"path": str(workspace / "repos" / "kenl")}
+
+        probed = []
+        original = ecosystem.is_repo_checkout
+        monkeypatch.setattr(ecosystem, "is_repo_checkout", lambda p: probed.append(p) or original(p))
+
+        repos = RepoDiscovery(search_paths(workspace), str(cache_file)).discover()
+        assert len(available(repos)) == 3
+        # One check per cached hit; cached misses are not re-probed within the TTL
+        assert sorted(probed) == sorted(available(repos).values())
+
+    def test_moved_repo_is_found_again(self, workspace, tmp_path):
+        discovery = RepoDiscovery(search_paths(workspace), str(tmp_path / "cache.json"))
+        discovery.discover()
+
+        shutil.move(str(workspace / "repos" / "kenl"), str(workspace / "projects" / "kenl"))
+        assert available(discovery.discover())["kenl"] == str(workspace / "projects" / "kenl")
+
+    def test_miss_ttl_expiry(self, workspace, tmp_path):
+        discovery = RepoDiscovery(search_paths(workspace), None, miss_ttl=0)
+        discovery.discover()
+        make_checkout(workspace / "projects" / "ClaudeNPC-Server-Suite")
+        assert "ClaudeNPC-Server-Suite" in available(discovery.discover())
+
+    def test_bounded_depth_search(self, workspace):
+        shallow = RepoDiscovery(search_paths(workspace), None, max_depth=1)
+        assert "quantum-redstone" not in available(shallow.discover())
+
+        deep = RepoDiscovery(search_paths(workspace), None, max_depth=3)
+        assert available(deep.discover())["quantum-redstone"] == str(
+            workspace / "work" / "toolate28" / "quantum-redstone"
+        )
+
+    def test_invalidate(self, workspace, tmp_path):
+        cache_file = tmp_path / "cache.json"
+        discovery = RepoDiscovery(search_paths(workspace), str(cache_file))
+        discovery.discover()
+        discovery.invalidate()
+        assert json.loads(cache_file.read_text()) == {}
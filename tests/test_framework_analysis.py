@@ -0,0 +1,277 @@
+"""
+Tests for analyze_framework and the parallel directory walker.
+"""
+import os
+import shutil
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from wave_toolkit import framework
+from wave_toolkit.framework import (
+    FrameworkCache,
+    analyze_framework,
+    directory_fingerprint,
+    scan_directory,
+    walk_tree,
+)
+from wave_toolkit.gitindex import GitIgnore, read_git_index
+
+
+def make_tree(root: Path, files):
+    for rel in files:
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("x")
+
+
+@pytest.fixture
+def repo(tmp_path):
+    root = tmp_path / "demo-repo"
+    make_tree(root, [
+        "README.md",
+        "AI_AGENTS.md",
+        "setup.py",
+        ".gitignore",
+        ".git/objects/ab/cdef",
+        "node_modules/pkg/index.js",
+        "src/__pycache__/mod.cpython-311.pyc",
+        "src/app.py",
+        "src/util.py",
+        "src/deep/a.ts",
+        "src/deep/b.ts",
+        "src/deep/c.ts",
+        "src/deep/d.ts",
+        "src/.hidden/secret.py",
+        "tests/test_app.py",
+        "docs/guide.md",
+        "scripts/run.sh",
+        "scripts/Tool.psm1",
+        "data/config.yml",
+    ])
+    return root
+
+
+class TestAnalyzeFramework:
+    """Test suite for analyze_framework."""
+
+    def test_counts_skip_ignored_directories(self, repo):
+        analysis = analyze_framework(str(repo))
+
+        assert analysis.name == "demo-repo"
+        assert analysis.file_count == 14
+        assert analysis.languages == {
+            "Markdown": 3,
+            "Python": 4,
+            "TypeScript": 4,
+            "Shell": 1,
+            "PowerShell": 1,
+            "YAML": 1,
+        }
+        assert analysis.has_tests and analysis.has_docs and analysis.has_ai_agents_config
+
+    def test_structure_samples_are_deterministic(self, repo):
+        analysis = analyze_framework(str(repo), workers=4)
+
+        assert set(analysis.structure) == {"src", "tests", "docs", "scripts", "data"}
+        assert analysis.structure["src"] == ["app.py", "util.py", "a.ts", "b.ts", "c.ts"]
+        assert analysis.structure["scripts"] == ["Tool.psm1", "run.sh"]
+
+    def test_missing_path(self, tmp_path):
+        assert analyze_framework(str(tmp_path / "missing")) is None
+
+    def test_repo_inside_hidden_directory(self, tmp_path):
+        root = tmp_path / ".workspace" / "repo"
+        make_tree(root, ["src/main.py"])
+        analysis = analyze_framework(str(root))
+        assert analysis.file_count == 1
+        assert analysis.structure == {"src": ["main.py"]}
+
+
+class TestWalker:
+    """Test suite for the scandir-based walker."""
+
+    def test_walk_prunes_before_descending(self, repo):
+        scans = walk_tree(str(repo))
+        assert "" in scans and "src/deep" in scans
+        assert not any(
+            part.startswith(".") or part in ("node_modules", "__pycache__")
+            for rel in scans for part in rel.split("/")
+        )
+
+    @pytest.mark.parametrize("with_cache", [False, True])
+    def test_parallel_walk_matches_serial(self, repo, tmp_path, monkeypatch, with_cache):
+        make_tree(repo, [f"pkg{i}/sub{j}/mod.py" for i in range(6) for j in range(3)])
+        backdate(repo)
+        serial = walk_tree(str(repo), workers=1)
+
+        monkeypatch.setattr(framework, "PARALLEL_MIN_DIRS", 2)
+        monkeypatch.setattr(framework, "PARALLEL_TASKS", 3)
+        cache = FrameworkCache(str(tmp_path / "cache")) if with_cache else None
+        assert walk_tree(str(repo), workers=4, cache=cache) == serial
+        if cache is not None:
+            assert walk_tree(str(repo), workers=4, cache=cache) == serial
+            assert (cache.hits, cache.misses) == (len(serial), len(serial))
+
+    def test_scan_directory_unreadable(self, tmp_path):
+        scan = scan_directory(str(tmp_path / "missing"))
+        assert scan.file_count == 0 and scan.subdirs == []
+
+
+def backdate(root: Path, seconds: int = 3600):
+    """Age every directory so its fingerprint is outside the racy window."""
+    for dirpath, _dirnames, _filenames in os.walk(root):
+        st = os.stat(dirpath)
+        os.utime(dirpath, ns=(st.st_atime_ns, st.st_mtime_ns - seconds * 1_000_000_000))
+
+
+class TestFrameworkCache:
+    """Test suite for incremental analysis with FrameworkCache."""
+
+    def test_unchanged_tree_is_served_from_cache(self, repo, tmp_path):
+        backdate(repo)
+        cache = FrameworkCache(str(tmp_path / "cache"))
+
+        first = analyze_framework(str(repo), cache=cache)
+        assert (cache.hits, cache.misses) == (0, 7)
+
+        second = analyze_framework(str(repo), cache=cache)
+        assert (cache.hits, cache.misses) == (7, 7)
+        assert second == first
+
+    def test_only_changed_directory_is_rescanned(self, repo, tmp_path):
+        backdate(repo)
+        cache = FrameworkCache(str(tmp_path / "cache"))
+        analyze_framework(str(repo), cache=cache)
+
+        (repo / "src" / "deep" / "e.ts").write_text("x")
+        cache.hits = cache.misses = 0
+        analysis = analyze_framework(str(repo), cache=cache)
+
+        assert (cache.hits, cache.misses) == (6, 1)
+        assert analysis.languages["TypeScript"] == 5
+        assert analysis == analyze_framework(str(repo))
+
+    def test_cache_persists_across_instances(self, repo, tmp_path):
+        backdate(repo)
+        analyze_framework(str(repo), cache=FrameworkCache(str(tmp_path / "cache")))
+
+        reloaded = FrameworkCache(str(tmp_path / "cache"))
+        analysis = analyze_framework(str(repo), cache=reloaded)
+        assert (reloaded.hits, reloaded.misses) == (7, 0)
+        assert analysis.file_count == 14
+
+    def test_shared_between_threads(self, repo, tmp_path, monkeypatch):
+        make_tree(repo, [f"pkg{i}/sub{j}/mod.py" for i in range(6) for j in range(3)])
+        backdate(repo)
+        monkeypatch.setattr(framework, "PARALLEL_MIN_DIRS", 2)
+        cache = FrameworkCache(str(tmp_path / "cache"))
+        expected = analyze_framework(str(repo))
+        dirs = len(walk_tree(str(repo)))
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(lambda _: analyze_framework(str(repo), workers=2, cache=cache), range(16)))
+
+        assert all(result == expected for result in results)
+        assert cache.hits + cache.misses == 16 * dirs
+        assert not list((tmp_path / "cache").glob("*.tmp"))
+        assert analyze_framework(str(repo), cache=FrameworkCache(str(tmp_path / "cache"))) == expected
+
+    def test_subdirectory_added_under_restored_mtime(self, repo, tmp_path):
+        if os.stat(repo / "docs").st_nlink != 2:
+            pytest.skip("filesystem does not count subdirectories in st_nlink")
+        backdate(repo)
+        cache = FrameworkCache(str(tmp_path / "cache"))
+        analyze_framework(str(repo), cache=cache)
+
+        before = directory_fingerprint(str(repo / "docs"))
+        st = os.stat(repo / "docs")
+        make_tree(repo, ["docs/api/index.md"])
+        backdate(repo / "docs" / "api")
+        os.utime(repo / "docs", ns=(st.st_atime_ns, st.st_mtime_ns))
+        assert directory_fingerprint(str(repo / "docs")) != before
+
+        analysis = analyze_framework(str(repo), cache=cache)
+        assert analysis.languages["Markdown"] == 4
+        assert analysis == analyze_framework(str(repo))
+
+    def test_recently_modified_directories_are_not_trusted(self, repo, tmp_path):
+        cache = FrameworkCache(str(tmp_path / "cache"))
+        analyze_framework(str(repo), cache=cache)
+        analyze_framework(str(repo), cache=cache)
+        assert cache.hits == 0
+
+
+def git(repo: Path, *args):
+    subprocess.run(
+        ["git", "-c", "user.name=wave", "-c", "user.email=wave@example.com", *args],
+        cwd=repo, check=True, capture_output=True,
+    )
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+class TestGitSource:
+    """Test suite for index-backed enumeration (source="git")."""
+
+    @pytest.fixture
+    def git_repo(self, repo):
+        (repo / ".gitignore").write_text("build/\n*.log\n!keep.log\n/data/\n")
+        make_tree(repo, ["build/out.js", "src/debug.log", "src/keep.log", "src/new_module.py"])
+        git(repo, "init", "-q")
+        git(repo, "add", "README.md", "AI_AGENTS.md", "setup.py", ".gitignore", "src/app.py",
+            "src/util.py", "src/deep", "tests", "docs", "scripts")
+        git(repo, "add", "-f", "data/config.yml")
+        return repo
+
+    @pytest.mark.parametrize("version", ["2", "3", "4"])
+    def test_read_git_index_matches_ls_files(self, git_repo, version):
+        git(git_repo, "update-index", "--index-version", version)
+        listed = subprocess.run(
+            ["git", "ls-files"], cwd=git_repo, check=True, capture_output=True, text=True,
+        ).stdout.split()
+        assert read_git_index(str(git_repo)) == listed
+
+    def test_tracked_only(self, git_repo):
+        analysis = analyze_framework(str(git_repo), source="git")
+        # .gitignore is tracked but hidden, so it is skipped like in a walk
+        assert analysis.file_count == 14
+        assert "JavaScript" not in analysis.languages
+        assert analysis.structure["data"] == ["config.yml"]
+
+    def test_untracked_respects_gitignore(self, git_repo):
+        analysis = analyze_framework(str(git_repo), source="git", include_untracked=True)
+        assert analysis.file_count == 16  # + src/keep.log, src/new_module.py
+        assert analysis.languages["Python"] == 5
+        assert "JavaScript" not in analysis.languages
+
+    def test_falls_back_to_walk_outside_repo(self, repo):
+        assert analyze_framework(str(repo), source="git") == analyze_framework(str(repo))
+
+    def test_unknown_source(self, repo):
+        with pytest.raises(ValueError):
+            analyze_framework(str(repo), source="svn")
+
+
+class TestGitIgnore:
+    """Test suite for .gitignore matching."""
+
+    def test_patterns(self):
+        ignore = GitIgnore()
+        ignore.add_patterns(["*.pyc", "/dist", "logs/", "docs/**/draft.md", "!important.pyc"])
+        ignore.add_patterns(["local.cfg"], base="pkg")
+
+        assert ignore.is_ignored("a/b/mod.pyc")
+        assert not ignore.is_ignored("a/important.pyc")
+        assert ignore.is_ignored("dist", is_dir=True)
+        assert not ignore.is_ignored("src/dist", is_dir=True)
+        assert ignore.is_ignored("src/logs", is_dir=True)
+        assert not ignore.is_ignored("src/logs")
+        assert ignore.is_ignored("docs/draft.md")
+        assert ignore.is_ignored("docs/a/b/draft.md")
+        assert ignore.is_ignored("pkg/sub/local.cfg")
+        assert not ignore.is_ignored("local.cfg")
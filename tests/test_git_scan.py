@@ -0,0 +1,111 @@
+"""
+Tests for scanning git refs through git cat-file --batch.
+"""
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "tools"))
+
+from git_scan import BlobScanner, CatFile, GitError, list_tree
+from scan_euler_precision import load_rules
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+
+
+def git(repo, *args):
+    subprocess.run(
+        ["git", "-C", str(repo), "-c", "user.name=t", "-c", "user.email=t@t", *args],
+        check=True,
+        capture_output=True,
+    )
+
+
+@pytest.fixture
+def repo(tmp_path):
+    repo = tmp_path / "repo"
+    (repo / "src").mkdir(parents=True)
+    (repo / "node_modules").mkdir()
+    git(repo, "init", "-q")
+    (repo / "src" / "sim.py").write_text("x = pow(2.718, t)\n")
+    (repo / "src" / "copy.py").write_text("x = pow(2.718, t)\n")
+    (repo / "src" / "notes.txt").write_text("pow(2.718, t)\n")
+    (repo / "node_modules" / "dep.js").write_text("Math.pow(2.718, x)\n")
+    git(repo, "add", "-A")
+    git(repo, "commit", "-qm", "one")
+    git(repo, "tag", "v1")
+    (repo / "src" / "sim.py").write_text("x = math.exp(t)\n")
+    (repo / "src" / "new.js").write_text("Math.pow(2.71828, x)\n")
+    git(repo, "add", "-A")
+    git(repo, "commit", "-qm", "two")
+    git(repo, "tag", "v2")
+    # Working tree changes must not affect ref scans
+    (repo / "src" / "copy.py").write_text("clean\n")
+    return repo
+
+
+class TestGitScan:
+    """Test suite for git ref scanning."""
+
+    def test_list_tree(self, repo):
+        paths = sorted(path for _oid, path in list_tree(repo, "v1", [".py", ".js"]))
+        assert paths == ["src/copy.py", "src/sim.py"]
+        with pytest.raises(GitError):
+            list_tree(repo, "no-such-ref", [".py"])
+
+    def test_cat_file_batch(self, repo):
+        blobs = list_tree(repo, "v1", [".py"])
+        with CatFile(repo) as cat:
+            contents = dict(cat.iter_blobs([oid for oid, _ in blobs] + ["0" * 40]))
+        assert contents["0" * 40] is None
+        assert all(data == b"x = pow(2.718, t)\n" for oid, data in contents.items() if oid != "0" * 40)
+
+    def test_cat_file_early_exit(self, repo):
+        oid = list_tree(repo, "v1", [".py"])[0][0]
+        with CatFile(repo) as cat:
+            blobs = cat.iter_blobs([oid] * 5000)  # Far more output than a pipe holds
+            assert next(blobs) == (oid, b"x = pow(2.718, t)\n")
+            blobs.close()
+            assert list(cat.iter_blobs([oid, "0" * 40])) == [(oid, b"x = pow(2.718, t)\n"), ("0" * 40, None)]
+
+    def test_missing_blob_is_not_cached(self, repo):
+        oid = next(oid for oid, path in list_tree(repo, "v2", [".js"]) if path == "src/new.js")
+        loose = repo / ".git" / "objects" / oid[:2] / oid[2:]
+        hidden = loose.with_name("hidden")
+        loose.rename(hidden)
+        scanner = BlobScanner(load_rules(["euler"]))
+        assert "src/new.js" not in {f.file_path for f in scanner.scan_ref(repo, "v2")}
+
+        hidden.rename(loose)
+        assert "src/new.js" in {f.file_path for f in scanner.scan_ref(repo, "v2")}
+
+    def test_scan_refs_reuses_blobs(self, repo):
+        scanner = BlobScanner(load_rules(["euler"]))
+        v1 = scanner.scan_ref(repo, "v1", "repo")
+        assert sorted((f.repo, f.file_path) for f in v1) == [("repo@v1", "src/copy.py"), ("repo@v1", "src/sim.py")]
+        # Identical contents at two paths are one blob
+        assert scanner.scanned == 1
+
+        v2 = scanner.scan_ref(repo, "v2", "repo")
+        assert sorted(f.file_path for f in v2) == ["src/copy.py", "src/new.js", "src/new.js"]
+        # Only the changed sim.py and new.js were read
+        assert scanner.scanned == 3
+
+    def test_persistent_cache(self, repo, tmp_path):
+        cache = tmp_path / "cache" / "blobs.json"
+        rules = load_rules(["euler"])
+        first = BlobScanner(rules, str(cache))
+        expected = first.scan_refs(repo, ["v1", "v2"])
+        first.save()
+
+        second = BlobScanner(rules, str(cache))
+        assert [str(f) for f in second.scan_refs(repo, ["v1", "v2"])] == [str(f) for f in expected]
+        assert second.scanned == 0
+
+        # Different rules invalidate the cache
+        third = BlobScanner(load_rules(["euler", "constants"]), str(cache))
+        third.scan_ref(repo, "v1")
+        assert third.scanned == 1
@@ -0,0 +1,149 @@
+"""
+Tests for the indexed handoff marker store.
+"""
+import json
+import os
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from wave_toolkit.handoffs import HandoffStore, load_columns
+
+
+def make_marker(i: int, session: str = "session-a", state: str = "PASS", **extra):
+    marker = {
+        "id": f"handoff-{session}-{i}",
+        "timestamp": f"2025-01-01T12:00:{i:02d}.000Z",
+        "fromAgent": "claude",
+        "toAgent": "copilot" if i % 2 else "cursor",
+        "state": state,
+        "context": {"task": f"step {i}", "note": "ü"},
+        "atomTrailId": f"atom-{i}",
+        "sessionId": session,
+    }
+    marker.update(extra)
+    return marker
+
+
+@pytest.fixture
+def store(tmp_path):
+    with HandoffStore(str(tmp_path / "handoffs")) as store:
+        yield store
+
+
+class TestHandoffStore:
+    """Test suite for HandoffStore."""
+
+    def test_save_and_get(self, store):
+        for i in range(5):
+            store.save_marker(make_marker(i))
+        location = store.save_marker(make_marker(5, coherenceScore=0.9))
+
+        assert location.file == "session-a.jsonl"
+        assert store.get("handoff-session-a-5")["coherenceScore"] == 0.9
+        assert store.get("handoff-session-a-2")["context"]["task"] == "step 2"
+        assert store.get("missing") is None
+
+    def test_writes_same_format_as_typescript_storage(self, store):
+        marker = make_marker(0)
+        store.save_marker(marker)
+        line = store.session_file("session-a").read_text(encoding="utf-8")
+        assert line == json.dumps(marker, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+    def test_indexes_files_written_externally(self, store):
+        path = store.session_file("session-b")
+        path.write_text("".join(json.dumps(make_marker(i, "session-b")) + "\n" for i in range(3)))
+        assert store.refresh() == 3
+        assert store.refresh() == 0
+        assert store.get("handoff-session-b-1")["atomTrailId"] == "atom-1"
+        assert store.sessions() == ["session-b"]
+
+    def test_partial_and_corrupt_lines(self, store):
+        path = store.session_file("session-a")
+        complete = json.dumps(make_marker(0)) + "\n" + "not json\n"
+        partial = json.dumps(make_marker(1))
+        path.write_text(complete + partial[:20])
+        assert store.refresh() == 1
+
+        with open(path, "a") as f:
+            f.write(partial[20:] + "\n")
+        assert store.refresh() == 1
+        assert store.get("handoff-session-a-1")["id"] == "handoff-session-a-1"
+
+    def test_truncated_file_is_reindexed(self, store):
+        for i in range(4):
+            store.save_marker(make_marker(i))
+        path = store.session_file("session-a")
+        path.write_text(json.dumps(make_marker(9)) + "\n")
+
+        assert store.refresh() == 1
+        assert store.get("handoff-session-a-0") is None
+        assert store.get("handoff-session-a-9") is not None
+        assert len(store.query()) == 1
+
+    def test_index_persists_across_instances(self, tmp_path):
+        base = str(tmp_path / "handoffs")
+        with HandoffStore(base) as store:
+            for i in range(3):
+                store.save_marker(make_marker(i))
+        with HandoffStore(base) as store:
+            assert store.refresh() == 0
+            assert store.locate("handoff-session-a-2") is not None
+
+    def test_query(self, store):
+        for i in range(6):
+            store.save_marker(make_marker(i, state="BLOCK" if i % 3 == 0 else "PASS"))
+        store.save_marker(make_marker(2, session="session-b", state="BLOCK"))
+
+        blocked = store.query(state="BLOCK")
+        assert [m["id"] for m in blocked] == [
+            "handoff-session-a-0",
+            "handoff-session-b-2",
+            "handoff-session-a-3",
+        ]
+        assert len(store.query(session_id="session-a", to_agent="copilot")) == 3
+        window = store.query(since="2025-01-01T12:00:02", until="2025-01-01T12:00:04")
+        assert len(window) == 3
+        assert len(store.query(limit=2)) == 2
+
+    def test_iter_markers_streams_files(self, store):
+        for i in range(3):
+            store.save_marker(make_marker(i))
+        store.save_marker(make_marker(0, session="session-b"))
+        assert len(list(store.iter_markers())) == 4
+        assert len(list(store.iter_markers("session-b"))) == 1
+
+    def test_follow(self, store, tmp_path):
+        store.save_marker(make_marker(0))
+        path = store.session_file("session-a")
+        stop = threading.Event()
+        seen = []
+
+        def writer():
+            with open(path, "a") as f:
+                f.write(json.dumps(make_marker(1)) + "\n")
+
+        follower = store.follow(interval=0.01, max_interval=0.05, stop=stop)
+        threading.Timer(0.05, writer).start()
+        for marker in follower:
+            seen.append(marker["id"])
+            stop.set()
+        assert seen == ["handoff-session-a-1"]
+
+    def test_export_columns(self, store, tmp_path):
+        np = pytest.importorskip("numpy")
+        for i in range(4):
+            store.save_marker(make_marker(i, coherenceScore=0.5) if i else make_marker(i))
+
+        output = tmp_path / "out" / "markers.npz"
+        assert store.export_columns(str(output)) == 4
+        columns = load_columns(str(output))
+        assert list(columns["id"]) == [f"handoff-session-a-{i}" for i in range(4)]
+        assert np.isnan(columns["coherence_score"][0])
+        assert columns["coherence_score"][1] == 0.5
+        assert columns["timestamp"][3] == np.datetime64("2025-01-01T12:00:03.000", "ms")
+        assert not any(name.endswith(".tmp") for name in os.listdir(output.parent))
@@ -5,106 +5,13 @@ Tests error handling for missing required fields in trace JSON files.
 """
 import json
 import pytest
+import sys
 import tempfile
 from pathlib import Path
-from typing import List, Dict, Any
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
 
-# Function is defined locally for testing purposes.
-# The actual implementation is in project-book.ipynb.
-def import_traces(json_file_path: str) -> List[Dict[str, Any]]:
-    """
-    Import trace data from a JSON file with proper error handling.
-    
-    Handles JSON files containing trace data with required fields:
-    - trace_id: Unique identifier for the trace
-    - state: Current state of the trace
-    - input: Input data for the trace
-    - output: Output data from the trace
-    
-    Args:
-        json_file_path: Path to the JSON file containing trace data
-        
-    Returns:
-        List of trace dictionaries with validated fields
-        
-    Raises:
-        FileNotFoundError: If the JSON file doesn't exist
-        json.JSONDecodeError: If the file contains invalid JSON
-        ValueError: If required fields are missing or invalid
-    """
-    # Check if file exists
-    if not Path(json_file_path).exists():
-        raise FileNotFoundError(f"Trace file not found: {json_file_path}")
-    
-    # Read and parse JSON
-    try:
-        with open(json_file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-    except json.JSONDecodeError as e:
-        raise json.JSONDecodeError(
-            f"Invalid JSON in file {json_file_path}: {str(e)}", 
-            e.doc, 
-            e.pos
-        )
-    
-    # Ensure data is a list
-    if isinstance(data, dict):
-        # If it's a single trace object, wrap it in a list
-        data = [data]
-    elif not isinstance(data, list):
-        raise ValueError(
-            f"Expected JSON to contain a list or dict, got {type(data).__name__}"
-        )
-    
-    # Required fields for trace data
-    required_fields = ['trace_id', 'state', 'input', 'output']
-    
-    # Validate each trace
-    validated_traces = []
-    errors = []
-    
-    for idx, trace in enumerate(data):
-        if not isinstance(trace, dict):
-            errors.append(f"Trace at index {idx} is not a dictionary: {type(trace).__name__}")
-            continue
-        
-        # Check for missing required fields
-        missing_fields = [field for field in required_fields if field not in trace]
-        
-        if missing_fields:
-            # Build a helpful error message
-            error_msg = (
-                f"Trace at index {idx} is missing required fields: {', '.join(missing_fields)}. "
-                f"Available fields: {', '.join(trace.keys()) if trace.keys() else 'none'}. "
-                f"Required fields are: {', '.join(required_fields)}"
-            )
-            errors.append(error_msg)
-            continue
-        
-        # Validate that required fields are not None
-        none_fields = [field for field in required_fields if trace[field] is None]
-        if none_fields:
-            error_msg = (
-                f"Trace at index {idx} has null values for required fields: {', '.join(none_fields)}"
-            )
-            errors.append(error_msg)
-            continue
-        
-        validated_traces.append(trace)
-    
-    # If we have errors, raise a comprehensive error message
-    if errors:
-        error_summary = f"Found {len(errors)} invalid trace(s) in {json_file_path}:\n"
-        error_summary += "\n".join(f"  - {err}" for err in errors[:5])  # Show first 5 errors
-        if len(errors) > 5:
-            error_summary += f"\n  ... and {len(errors) - 5} more error(s)"
-        raise ValueError(error_summary)
-    
-    if not validated_traces:
-        raise ValueError(f"No valid traces found in {json_file_path}")
-    
-    return validated_traces
+from wave_toolkit.traces import import_traces
 
 
 class TestImportTraces:
@@ -328,6 +235,27 @@ class TestImportTraces:
         
         assert "invalid trace(s)" in str(exc_info.value)
     
+    def test_json_lines(self, tmp_path):
+        """Test importing a JSON Lines file with one trace per line."""
+        trace_file = tmp_path / "traces.jsonl"
+        trace_file.write_text("".join(json.dumps(make_trace(i)) + "\n" for i in range(3)) + "\n")
+        
+        traces = import_traces(str(trace_file))
+        
+        assert [t["trace_id"] for t in traces] == ["trace_00000", "trace_00001", "trace_00002"]
+    
+    @pytest.mark.parametrize("layout", ["{a}{b}", "[{a}][{b}]", "{a} {b}\n", "{a_pretty}\n{b_pretty}"])
+    def test_concatenated_values_rejected(self, tmp_path, layout):
+        """Test that several top-level values are only accepted one per line."""
+        a, b = make_trace(0), make_trace(1)
+        text = (layout.replace("{a_pretty}", json.dumps(a, indent=2)).replace("{b_pretty}", json.dumps(b, indent=2))
+                .replace("{a}", json.dumps(a)).replace("{b}", json.dumps(b)))
+        trace_file = tmp_path / "traces.json"
+        trace_file.write_text(text)
+        
+        with pytest.raises(json.JSONDecodeError, match="Invalid JSON"):
+            import_traces(str(trace_file))
+    
     def test_extra_fields_allowed(self, tmp_path):
         """Test that traces can have additional fields beyond required ones."""
         trace_file = tmp_path / "extra_fields.json"
@@ -349,6 +277,103 @@ class TestImportTraces:
         assert traces[0]["timestamp"] == "2024-01-01T00:00:00Z"
 
 
+def make_trace(i):
+    return {"trace_id": f"trace_{i:05d}", "state": "completed" if i % 4 else "failed", "input": {"i": i}, "output": {}}
+
+
+def write_jsonl(path, n):
+    path.write_text("".join(json.dumps(make_trace(i)) + "\n" for i in range(n)))
+    return path
+
+
+class TestImportTracesSampling:
+    """Test suite for the head, sample and seek modes of import_traces."""
+    
+    def test_head(self, tmp_path):
+        """Test that head returns the first N traces of arrays and JSON Lines."""
+        array = tmp_path / "traces.json"
+        array.write_text(json.dumps([make_trace(i) for i in range(100)], indent=2))
+        lines = write_jsonl(tmp_path / "traces.jsonl", 100)
+        
+        for path in (array, lines):
+            traces = import_traces(str(path), head=5)
+            assert [t["trace_id"] for t in traces] == [f"trace_{i:05d}" for i in range(5)]
+        assert len(import_traces(str(lines), head=1000)) == 100
+    
+    def test_head_ignores_records_after_n(self, tmp_path):
+        """Test that records past the head are neither validated nor parsed."""
+        trace_file = tmp_path / "traces.jsonl"
+        trace_file.write_text(json.dumps(make_trace(0)) + "\n" + '{"trace_id": "x"}\n{not json')
+        
+        assert len(import_traces(str(trace_file), head=1)) == 1
+        with pytest.raises(ValueError, match="missing required fields"):
+            import_traces(str(trace_file), head=2)
+    
+    def test_reservoir_sample(self, tmp_path):
+        """Test that sample returns N distinct traces in file order, reproducibly."""
+        trace_file = write_jsonl(tmp_path / "traces.jsonl", 1000)
+        
+        sample = import_traces(str(trace_file), sample=50, seed=3)
+        ids = [t["trace_id"] for t in sample]
+        assert len(set(ids)) == 50
+        assert ids == sorted(ids)
+        assert import_traces(str(trace_file), sample=50, seed=3) == sample
+        assert import_traces(str(trace_file), sample=50, seed=4) != sample
+        assert len(import_traces(str(trace_file), sample=5000)) == 1000
+    
+    def test_reservoir_sample_is_uniform(self, tmp_path):
+        """Test that every position is about equally likely to be sampled."""
+        trace_file = write_jsonl(tmp_path / "traces.jsonl", 100)
+        hits = [0] * 100
+        for seed in range(200):
+            for trace in import_traces(str(trace_file), sample=10, seed=seed):
+                hits[int(trace["trace_id"][6:])] += 1
+        # 2000 draws over 100 positions: 20 expected each
+        assert sum(hits[:50]) == pytest.approx(1000, rel=0.1)
+        assert max(hits) < 45
+    
+    def test_seek_sample(self, tmp_path):
+        """Test seek sampling on JSON Lines, including resynchronising mid-line."""
+        trace_file = write_jsonl(tmp_path / "traces.jsonl", 2000)
+        
+        sample = import_traces(str(trace_file), sample=100, seed=1, seek=True)
+        ids = [t["trace_id"] for t in sample]
+        assert len(ids) == 100
+        assert ids == sorted(set(ids))
+        assert import_traces(str(trace_file), sample=100, seed=1, seek=True) == sample
+        # Roughly evenly spread across the file
+        assert 30 <= sum(int(i[6:]) < 1000 for i in ids) <= 70
+    
+    def test_seek_sample_small_file(self, tmp_path):
+        """Test that seek sampling stops on files with fewer lines than requested."""
+        trace_file = tmp_path / "traces.jsonl"
+        trace_file.write_text("\n" + json.dumps(make_trace(0)) + "\n\n" + json.dumps(make_trace(1)))
+        
+        traces = import_traces(str(trace_file), sample=10, seed=0, seek=True)
+        assert [t["trace_id"] for t in traces] == ["trace_00000", "trace_00001"]
+    
+    def test_seek_sample_rejects_non_jsonl(self, tmp_path):
+        """Test that seek sampling reports files it cannot seek in."""
+        import gzip
+        
+        compressed = tmp_path / "traces.jsonl.gz"
+        compressed.write_bytes(gzip.compress(b"{}"))
+        with pytest.raises(ValueError, match="uncompressed JSON Lines"):
+            import_traces(str(compressed), sample=1, seek=True)
+        
+        pretty = tmp_path / "traces.json"
+        pretty.write_text(json.dumps([make_trace(i) for i in range(20)], indent=2))
+        with pytest.raises(json.JSONDecodeError, match="JSON Lines"):
+            import_traces(str(pretty), sample=3, seed=0, seek=True)
+    
+    def test_invalid_arguments(self, tmp_path):
+        """Test rejected combinations of sampling arguments."""
+        trace_file = write_jsonl(tmp_path / "traces.jsonl", 3)
+        for kwargs in ({"head": 1, "sample": 1}, {"seek": True}, {"head": 0}, {"sample": -1}):
+            with pytest.raises(ValueError):
+                import_traces(str(trace_file), **kwargs)
+
+
 if __name__ == "__main__":
     # Run tests with pytest
     pytest.main([__file__, "-v"])
@@ -0,0 +1,104 @@
+"""
+Tests for log source discovery.
+"""
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from wave_toolkit.logs import (
+    LogDiscovery,
+    default_log_files,
+    default_log_roots,
+)
+
+
+def touch(path: Path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("line\n")
+
+
+def backdate(root: Path, seconds: int = 3600):
+    for dirpath, _dirnames, _filenames in os.walk(root):
+        st = os.stat(dirpath)
+        os.utime(dirpath, ns=(st.st_atime_ns, st.st_mtime_ns - seconds * 1_000_000_000))
+
+
+@pytest.fixture
+def home(tmp_path):
+    home = tmp_path / "home"
+    touch(home / "bf6_performance_log.csv")
+    touch(home / "SpiralSafe-FromGitHub" / "bridges" / "bridge.log")
+    touch(home / "SpiralSafe-FromGitHub" / "bridges" / "nested" / "sync.log")
+    touch(home / "quantum-redstone" / "logs" / "sim.log")
+    touch(home / "quantum-redstone" / "notes.txt")
+    server = home / "repos" / "ClaudeNPC-Server-Suite"
+    touch(server / "server" / "logs" / "latest.log")
+    touch(server / "server" / "world" / "region" / "debug.log")
+    touch(server / "server" / "cache" / "mojang.log")
+    touch(server / "a" / "b" / "c" / "d" / "deep.log")
+    return home
+
+
+def discovery(home, **kwargs):
+    kwargs.setdefault("cache_path", None)
+    return LogDiscovery(default_log_roots(home), default_log_files(home), **kwargs)
+
+
+def relative(home, sources):
+    return [str(Path(s.path).relative_to(home)) for s in sources if s.exists]
+
+
+class TestLogDiscovery:
+    """Test suite for LogDiscovery."""
+
+    def test_discover_skips_world_and_cache(self, home):
+        sources = discovery(home).discover()
+
+        assert relative(home, sources) == [
+            "bf6_performance_log.csv",
+            "SpiralSafe-FromGitHub/bridges/bridge.log",
+            "SpiralSafe-FromGitHub/bridges/nested/sync.log",
+            "quantum-redstone/logs/sim.log",
+            "repos/ClaudeNPC-Server-Suite/a/b/c/d/deep.log",
+            "repos/ClaudeNPC-Server-Suite/server/logs/latest.log",
+        ]
+        atom_trail = [s for s in sources if s.path.endswith(".atom-trail")][0]
+        assert atom_trail.exists is False
+        assert {s.kind for s in sources if s.repo == "gaming"} == {"csv"}
+
+    def test_depth_limit(self, home):
+        found = relative(home, discovery(home, max_depth=2).discover())
+        assert "repos/ClaudeNPC-Server-Suite/server/logs/latest.log" in found
+        assert "repos/ClaudeNPC-Server-Suite/a/b/c/d/deep.log" not in found
+
+    def test_missing_roots_are_ignored(self, tmp_path):
+        sources = discovery(tmp_path / "empty").discover()
+        assert [s.exists for s in sources] == [False, False]
+
+    def test_streaming_can_stop_early(self, home):
+        stream = discovery(home).iter_sources()
+        first = next(stream)
+        stream.close()
+        assert first.path.endswith("bf6_performance_log.csv")
+
+    def test_cached_listings_are_reused(self, home, tmp_path, monkeypatch):
+        backdate(home)
+        cache_file = tmp_path / "logcache.json"
+        discovery(home, cache_path=str(cache_file)).discover()
+        assert cache_file.exists()
+
+        listed = []
+        original = LogDiscovery._list_directory
+        monkeypatch.setattr(
+            LogDiscovery, "_list_directory",
+            lambda self, path, pattern: listed.append(path) or original(self, path, pattern),
+        )
+        touch(home / "quantum-redstone" / "logs" / "new.log")
+
+        sources = discovery(home, cache_path=str(cache_file)).discover()
+        assert listed == [str(home / "quantum-redstone" / "logs")]
+        assert "quantum-redstone/logs/new.log" in relative(home, sources)
@@ -0,0 +1,147 @@
+"""
+Tests for the tail-follow log ingestion engine.
+"""
+import os
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from wave_toolkit.ingest import LogIngestor
+from wave_toolkit.logs import LogSource
+
+CSV_HEADER = "Timestamp,CPU_Percent,RAM_Used_GB,RAM_Available_GB,GPU_Temp,FPS_Estimate,Network_Latency_ms,Disk_Usage_Percent\n"
+
+
+def append(path: Path, text: str, encoding: str = "utf-8"):
+    with open(path, "ab") as f:
+        f.write(text.encode(encoding))
+
+
+@pytest.fixture
+def logs(tmp_path):
+    csv_path = tmp_path / "bf6_performance_log.csv"
+    text_path = tmp_path / "latest.log"
+    json_path = tmp_path / "events.jsonl"
+    append(csv_path, CSV_HEADER + "2025-01-01 12:00:00,12.5,8.1,7.9,61,144,23,40\n")
+    append(text_path, "[12:00:01] [Server thread/INFO]: Starting\n")
+    append(json_path, '{"ts": "2025-01-01T12:00:02Z", "event": "start"}\n')
+    return {
+        "csv": LogSource(str(csv_path), "system", "gaming", "csv", True),
+        "text": LogSource(str(text_path), "claudenpc", "ClaudeNPC-Server-Suite", "text", True),
+        "json": LogSource(str(json_path), "spiralsafe", "SpiralSafe", "json", True),
+    }
+
+
+def ingestor(sources, tmp_path, **kwargs):
+    return LogIngestor(sources, state_path=str(tmp_path / "offsets.json"), **kwargs)
+
+
+class TestLogIngestor:
+    """Test suite for LogIngestor."""
+
+    def test_parses_each_kind(self, logs, tmp_path):
+        records = {r.kind: r for r in ingestor(logs.values(), tmp_path).poll()}
+
+        assert records["csv"].timestamp == "2025-01-01 12:00:00"
+        assert records["csv"].fields["FPS_Estimate"] == "144"
+        assert records["text"].timestamp == "12:00:01"
+        assert records["text"].fields["message"].endswith("Starting")
+        assert records["json"].timestamp == "2025-01-01T12:00:02Z"
+        assert records["json"].fields["event"] == "start"
+        assert records["json"].repo == "SpiralSafe"
+
+    def test_offsets_survive_restart(self, logs, tmp_path):
+        first = ingestor(logs.values(), tmp_path)
+        assert len(first.poll()) == 3
+        first.save_state()
+
+        append(Path(logs["csv"].path), "2025-01-01 12:00:05,20,8,8,62,140,25,40\n")
+        append(Path(logs["text"].path), "partial line without newline")
+
+        second = ingestor(logs.values(), tmp_path)
+        records = second.poll()
+        assert [r.fields["CPU_Percent"] for r in records] == ["20"]
+        assert second.poll() == []
+
+        append(Path(logs["text"].path), " finished\n")
+        assert [r.fields["message"] for r in second.poll()] == ["partial line without newline finished"]
+
+    def test_rotation_and_truncation(self, logs, tmp_path):
+        engine = ingestor([logs["text"]], tmp_path)
+        engine.poll()
+        path = Path(logs["text"].path)
+
+        os.replace(path, str(path) + ".1")
+        append(path, "rotated\n")
+        assert [r.fields["message"] for r in engine.poll()] == ["rotated"]
+
+        with open(path, "wb"):
+            pass
+        append(path, "x\n")
+        assert [r.fields["message"] for r in engine.poll()] == ["x"]
+
+    def test_batch_size_and_exact_offsets(self, logs, tmp_path):
+        path = Path(logs["json"].path)
+        append(path, "".join(f'{{"n": {i}}}\n' for i in range(10)))
+        engine = ingestor([logs["json"]], tmp_path, batch_size=4)
+
+        batches = [engine.poll() for _ in range(4)]
+        assert [len(b) for b in batches] == [4, 4, 3, 0]
+
+        data = path.read_bytes()
+        for record in batches[1]:
+            line = data[record.offset:data.index(b"\n", record.offset)].decode()
+            assert '"n": %d' % record.fields["n"] in line
+
+    def test_utf16_csv(self, tmp_path):
+        path = tmp_path / "bf6_performance_log.csv"
+        path.write_bytes(b"\xff\xfe" + (CSV_HEADER + "2025-01-01 12:00:00,1,2,3,4,5,6,7\n").encode("utf-16-le"))
+        source = LogSource(str(path), "system", "gaming", "csv", True)
+
+        engine = ingestor([source], tmp_path)
+        assert [r.fields["Disk_Usage_Percent"] for r in engine.poll()] == ["7"]
+        append(path, "2025-01-01 12:00:01,1,2,3,4,5,6,8\r\n", "utf-16-le")
+        assert [r.fields["Disk_Usage_Percent"] for r in engine.poll()] == ["8"]
+
+    def test_start_at_end_keeps_csv_header(self, logs, tmp_path):
+        engine = ingestor([logs["csv"]], tmp_path, start_at_end=True)
+        assert engine.poll() == []
+        append(Path(logs["csv"].path), "2025-01-01 12:00:09,99,8,8,62,140,25,40\n")
+        assert [r.fields["CPU_Percent"] for r in engine.poll()] == ["99"]
+
+    def test_missing_file_appears_later(self, tmp_path):
+        path = tmp_path / ".atom-trail"
+        engine = ingestor([LogSource(str(path), "spiralsafe", "SpiralSafe", "text")], tmp_path)
+        assert engine.poll() == []
+        append(path, "2025-01-01T00:00:00 decision recorded\n")
+        assert [r.timestamp for r in engine.poll()] == ["2025-01-01T00:00:00"]
+
+    def test_follow_stops_and_saves(self, logs, tmp_path):
+        stop = threading.Event()
+        engine = ingestor(logs.values(), tmp_path)
+        batches = []
+        for batch in engine.follow(interval=0.01, stop=stop):
+            batches.append(batch)
+            stop.set()
+        assert sum(len(b) for b in batches) == 3
+        assert (tmp_path / "offsets.json").exists()
+
+    def test_follow_redelivers_batch_when_consumer_fails(self, logs, tmp_path):
+        engine = ingestor(logs.values(), tmp_path)
+        with pytest.raises(RuntimeError):
+            for batch in engine.follow(interval=0.01):
+                raise RuntimeError("consumer failed")
+        assert len(engine.poll()) == 3
+        assert len(ingestor(logs.values(), tmp_path).poll()) == 3
+
+    def test_line_longer_than_read_size(self, tmp_path):
+        path = tmp_path / "latest.log"
+        append(path, "x" * 250 + "\n")
+        engine = ingestor([LogSource(str(path), "claudenpc", "ClaudeNPC-Server-Suite", "text")], tmp_path, max_read_bytes=100)
+        assert [len(r.fields["message"]) for r in engine.poll()] == [250]
+        append(path, "short\n")
+        assert [r.fields["message"] for r in engine.poll()] == ["short"]
@@ -0,0 +1,121 @@
+"""
+Tests for the opt-in performance instrumentation.
+"""
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from wave_toolkit import perf
+from wave_toolkit.framework import FrameworkCache, analyze_framework
+from wave_toolkit.traces import import_traces
+
+
+@pytest.fixture
+def profiler():
+    previous = perf.disable()
+    profiler = perf.enable()
+    yield profiler
+    perf.disable()
+    if previous is not None:
+        perf._profiler = previous
+
+
+class TestPerf:
+    """Test suite for wave_toolkit.perf."""
+
+    def test_disabled_is_noop(self):
+        previous = perf.disable()
+        try:
+            calls = []
+
+            @perf.profiled()
+            def work(x):
+                calls.append(x)
+                return x * 2
+
+            with perf.stage("outer"):
+                assert work(2) == 4
+            perf.count("files")
+            perf.cache("c", hits=1)
+            assert calls == [2]
+            assert perf.get_profiler() is None
+        finally:
+            perf._profiler = previous
+
+    def test_nested_stages(self, profiler):
+        @perf.profiled("inner")
+        def inner():
+            time.sleep(0.01)
+
+        with perf.stage("outer"):
+            inner()
+            inner()
+            time.sleep(0.01)
+
+        stages = {s["stack"]: s for s in profiler.report()["stages"]}
+        assert stages["outer;inner"]["calls"] == 2
+        assert stages["outer"]["calls"] == 1
+        assert stages["outer"]["total_ms"] >= stages["outer;inner"]["total_ms"] + 9
+        assert stages["outer"]["self_ms"] == pytest.approx(
+            stages["outer"]["total_ms"] - stages["outer;inner"]["total_ms"], abs=0.01
+        )
+
+        collapsed = dict(line.rsplit(" ", 1) for line in profiler.collapsed().splitlines())
+        assert set(collapsed) == {"outer", "outer;inner"}
+        assert int(collapsed["outer;inner"]) >= 20000
+
+    def test_counters_caches_and_dump(self, profiler, tmp_path):
+        perf.count("files")
+        perf.count("bytes", 100)
+        perf.count("bytes", 23)
+        perf.cache("framework", hits=3, misses=1)
+
+        json_path, collapsed_path = profiler.dump(str(tmp_path))
+        report = json.loads(json_path.read_text())
+        assert report["counters"] == {"bytes": 123, "files": 1}
+        assert report["caches"]["framework"] == {"hits": 3, "misses": 1, "hit_rate": 0.75}
+        assert report["peak_memory"]["peak_rss_bytes"] is None or report["peak_memory"]["peak_rss_bytes"] > 0
+        assert collapsed_path.exists()
+
+    def test_instrumented_hot_paths(self, profiler, tmp_path):
+        traces = tmp_path / "traces.json"
+        traces.write_text(json.dumps([{"trace_id": "t", "state": "s", "input": {}, "output": {}}]))
+        import_traces(str(traces))
+
+        repo = tmp_path / "repo"
+        (repo / "src").mkdir(parents=True)
+        (repo / "src" / "a.py").write_text("")
+        cache = FrameworkCache(str(tmp_path / "cache"))
+        analyze_framework(str(repo), cache=cache)
+        analyze_framework(str(repo), cache=cache)
+
+        report = profiler.report()
+        stages = {s["stack"]: s["calls"] for s in report["stages"]}
+        assert stages["traces.import_traces"] == 1
+        assert stages["framework.analyze_framework"] == 2
+        assert report["counters"]["traces.records"] == 1
+        assert report["counters"]["traces.bytes"] == traces.stat().st_size
+        assert report["counters"]["framework.files"] == 2
+        framework_cache = report["caches"]["framework"]
+        assert (framework_cache["hits"], framework_cache["misses"]) == (cache.hits, cache.misses) == (0, 4)
+
+    def test_env_var_dumps_at_exit(self, tmp_path):
+        root = Path(__file__).parent.parent
+        script = (
+            "from wave_toolkit import perf\n"
+            "with perf.stage('main'):\n"
+            "    perf.count('n', 5)\n"
+        )
+        env = dict(os.environ, WAVE_PROFILE="1", WAVE_PROFILE_DIR=str(tmp_path))
+        subprocess.run([sys.executable, "-c", script], cwd=root, env=env, check=True, capture_output=True)
+        profiles = list(tmp_path.glob("profile-*.json"))
+        assert len(profiles) == 1
+        assert json.loads(profiles[0].read_text())["counters"] == {"n": 5}
+        assert len(list(tmp_path.glob("profile-*.collapsed"))) == 1
@@ -0,0 +1,111 @@
+"""
+Tests for the BF6 performance log loader.
+"""
+import sys
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from wave_toolkit.perflog import PerformanceLog, per_minute, rolling_percentiles
+
+HEADER = "Timestamp,CPU_Percent,RAM_Used_GB,RAM_Available_GB,GPU_Temp,FPS_Estimate,Network_Latency_ms,Disk_Usage_Percent\n"
+FPS_BUCKETS = ("60+", "45-60", "30-45", "<30")
+
+
+def rows(start: int, count: int) -> str:
+    lines = []
+    for i in range(start, start + count):
+        minute, second = divmod(i * 10, 60)
+        gpu = "N/A" if i % 7 == 0 else str(60 + i % 5)
+        lines.append(
+            f"2025-01-01 12:{minute:02d}:{second:02d},{i % 100}.5,8.2,7.8,{gpu},"
+            f"{FPS_BUCKETS[i % 4]},{20 + i % 3},41.5\n"
+        )
+    return "".join(lines)
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / "bf6_performance_log.csv"
+    path.write_text(HEADER + rows(0, 30))
+    return path
+
+
+class TestPerformanceLog:
+    """Test suite for PerformanceLog."""
+
+    def test_loads_columns(self, csv_path):
+        log = PerformanceLog(str(csv_path), cache_dir=None, chunk_rows=4)
+
+        assert len(log) == 30
+        assert str(log.timestamps[1]) == "2025-01-01T12:00:10"
+        assert log.columns["CPU_Percent"][3] == 3.5
+        assert np.isnan(log.columns["GPU_Temp"][0])
+        assert list(log.columns["FPS_Estimate"][:4]) == [60, 45, 30, 30]
+        assert log.column("frame_time_ms")[0] == pytest.approx(1000 / 60)
+
+    def test_incremental_refresh_with_cache(self, csv_path, tmp_path):
+        cache_dir = str(tmp_path / "cache")
+        log = PerformanceLog(str(csv_path), cache_dir=cache_dir)
+        assert isinstance(log.columns["CPU_Percent"], np.memmap)
+
+        with open(csv_path, "a") as f:
+            f.write(rows(30, 5))
+            f.write("2025-01-01 12:05:50,1")  # incomplete line
+        assert log.refresh() == 5
+        assert len(log) == 35
+
+        reopened = PerformanceLog(str(csv_path), cache_dir=cache_dir)
+        assert len(reopened) == 35
+        assert reopened.refresh() == 0
+        np.testing.assert_array_equal(reopened.columns["Network_Latency_ms"], log.columns["Network_Latency_ms"])
+
+    def test_rewritten_file_is_reparsed(self, csv_path, tmp_path):
+        cache_dir = str(tmp_path / "cache")
+        PerformanceLog(str(csv_path), cache_dir=cache_dir)
+        csv_path.write_text(HEADER + rows(0, 3))
+        assert len(PerformanceLog(str(csv_path), cache_dir=cache_dir)) == 3
+
+    def test_utf16_log(self, tmp_path):
+        path = tmp_path / "bf6_performance_log.csv"
+        path.write_bytes(b"\xff\xfe" + (HEADER + rows(0, 6)).replace("\n", "\r\n").encode("utf-16-le"))
+        log = PerformanceLog(str(path), cache_dir=None)
+        assert len(log) == 6
+        assert log.columns["Disk_Usage_Percent"][5] == 41.5
+
+
+class TestAnalytics:
+    """Test suite for rolling percentiles and per-minute aggregates."""
+
+    def test_rolling_percentiles_match_numpy(self):
+        rng = np.random.default_rng(0)
+        values = rng.normal(16, 3, 500)
+        values[::11] = np.nan
+        stats = rolling_percentiles(values, window=25)
+
+        for i in (1, 5, 24, 300, 499):
+            window = values[max(0, i - 24):i + 1]
+            expected = np.nanpercentile(window, [50, 95, 99])
+            assert [stats["p50"][i], stats["p95"][i], stats["p99"][i]] == pytest.approx(list(expected))
+
+    def test_rolling_all_missing(self):
+        assert np.isnan(rolling_percentiles(np.full(3, np.nan), window=2)["p50"]).all()
+
+    def test_per_minute(self, csv_path):
+        log = PerformanceLog(str(csv_path), cache_dir=None)
+        stats = log.per_minute("GPU_Temp")
+
+        assert len(stats["minute"]) == 5
+        assert str(stats["minute"][0]) == "2025-01-01T12:00"
+        assert list(stats["count"][:2]) == [5, 5]  # rows 0 and 7 are N/A
+        assert stats["max"][0] == 64
+        assert stats["mean"][0] == pytest.approx(np.mean([61, 62, 63, 64, 60]))
+
+    def test_per_minute_unsorted(self):
+        timestamps = np.array(["2025-01-01T00:01:00", "2025-01-01T00:00:30"], dtype="datetime64[s]")
+        stats = per_minute(timestamps, np.array([2.0, 1.0]))
+        assert list(stats["mean"]) == [1.0, 2.0]
@@ -0,0 +1,125 @@
+"""
+Tests for the precision scanner's watch mode.
+"""
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "tools"))
+
+from precision_watch import InotifyWatcher, PrecisionWatcher
+from scan_euler_precision import load_rules
+
+MODES = [False] + ([True] if InotifyWatcher.available() else [])
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    monkeypatch.setattr(Path, "home", lambda: tmp_path)
+    base = tmp_path / "repo"
+    (base / "src").mkdir(parents=True)
+    (base / "src" / "sim.py").write_text("x = pow(2.718, t)\n")
+    (base / "src" / "clean.py").write_text("import math\n")
+    return base
+
+
+def start(watcher):
+    changes = []
+    event = threading.Event()
+    stop = threading.Event()
+
+    def on_change(added, removed):
+        changes.append((added, removed))
+        event.set()
+
+    thread = threading.Thread(target=watcher.run, args=(on_change, stop), daemon=True)
+    thread.start()
+    return changes, event, stop, thread
+
+
+def wait_for(event, timeout=5.0):
+    assert event.wait(timeout), "no change reported"
+    event.clear()
+
+
+@pytest.mark.parametrize("use_inotify", MODES)
+class TestPrecisionWatcher:
+    """Test suite for PrecisionWatcher."""
+
+    def test_incremental_rescans(self, repo, use_inotify):
+        watcher = PrecisionWatcher(["repo", "missing"], load_rules(["euler"]), debounce=0.02,
+                                   use_inotify=use_inotify, poll_interval=0.05)
+        initial = watcher.initial_scan()
+        assert [(f.file_path, f.pattern_name) for f in initial] == [("src/sim.py", "python_pow")]
+        changes, event, stop, thread = start(watcher)
+        try:
+            # Edit a clean file: one finding added
+            time.sleep(0.1)
+            (repo / "src" / "clean.py").write_text("import math\ne = 2.718\n")
+            wait_for(event)
+            added, removed = changes[-1]
+            assert [(f.file_path, f.line_num, f.pattern_name) for f in added] == [("src/clean.py", 2, "direct_const")]
+            assert removed == []
+
+            # Fix the original finding
+            (repo / "src" / "sim.py").write_text("x = math.exp(t)\n")
+            wait_for(event)
+            added, removed = changes[-1]
+            assert added == [] and [f.file_path for f in removed] == ["src/sim.py"]
+
+            # New directory with a new file
+            (repo / "lib").mkdir()
+            time.sleep(0.1)
+            (repo / "lib" / "mod.js").write_text("Math.pow(2.718, x)\n")
+            wait_for(event)
+            assert {f.file_path for f in changes[-1][0]} == {"lib/mod.js"}
+
+            # Deleting a file resolves its findings; skipped directories are ignored
+            (repo / "node_modules").mkdir()
+            (repo / "node_modules" / "dep.js").write_text("Math.pow(2.718, x)\n")
+            (repo / "src" / "clean.py").unlink()
+            wait_for(event)
+            assert [f.file_path for f in changes[-1][1]] == ["src/clean.py"]
+            assert {f.file_path for f in watcher.table.all()} == {"lib/mod.js"}
+        finally:
+            stop.set()
+            thread.join(timeout=5)
+        assert not thread.is_alive()
+
+
+@pytest.mark.skipif(not InotifyWatcher.available(), reason="inotify is Linux-only")
+class TestInotifyWatcher:
+    """Test suite for InotifyWatcher."""
+
+    def test_moved_out_directory_is_unwatched(self, tmp_path):
+        root = tmp_path / "repo"
+        (root / "pkg" / "sub").mkdir(parents=True)
+        watcher = InotifyWatcher([root])
+        try:
+            (root / "pkg").rename(tmp_path / "outside")
+            assert root / "pkg" in watcher.poll(1.0)
+            assert set(watcher._dirs.values()) == {root}
+
+            (tmp_path / "outside" / "sub" / "a.py").write_text("x = 1\n")
+            assert watcher.poll(0.1) == set()
+        finally:
+            watcher.close()
+
+    def test_edit_during_initial_scan_is_reported(self, repo, monkeypatch):
+        watcher = PrecisionWatcher(["repo"], load_rules(["euler"]), use_inotify=True)
+        scan_path = watcher.scan_path
+
+        def scan_then_edit(path):
+            result = scan_path(path)
+            (repo / "src" / "clean.py").write_text("e = 2.718\n")
+            return result
+
+        monkeypatch.setattr(watcher, "scan_path", scan_then_edit)
+        watcher.initial_scan()
+        try:
+            assert repo / "src" / "clean.py" in watcher._watcher.poll(1.0)
+        finally:
+            watcher.close()
@@ -0,0 +1,99 @@
+"""
+Tests for the system prompt renderer.
+"""
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from wave_toolkit.prompt import PromptRenderer, PromptTemplate, generate_system_prompt
+
+
+EXPECTED = """# Claude System Context
+
+You are Claude, running in an interactive Jupyter notebook within the Wave Toolkit ecosystem.
+
+## Environment (Auto-Detected)
+- **Machine:** spiral (x86_64, 8 cores)
+- **OS:** Linux 6.1
+- **User:** WAVE\\wave
+- **Environment:** Python/Jupyter 3.11.7 (notebook)
+- **Working Directory:** /home/wave/repo
+- **Git Repo:** Yes (branch: main)
+- **Available Tools:** git, python, jupyter
+
+## Operating Principles
+1. Provide concrete, executable code cells for Python/Jupyter
+2. Prefer idempotent operations (safe to re-run)
+3. Include verification steps after actions
+4. State assumptions explicitly
+5. When uncertain, ask rather than guess
+
+## Collaboration Style
+- Think out loud - share reasoning
+- Offer alternatives when multiple approaches exist
+- Build on context from earlier in the session
+- Trust flows both ways
+
+*Context generated: 2025-01-01T12:00:00*
+"""
+
+
+class TestPromptRenderer:
+    """Test suite for PromptRenderer."""
+
+    def test_output_matches_original_format(self, make_context):
+        assert generate_system_prompt(make_context(domain="WAVE")) == EXPECTED
+
+    def test_no_tools_and_no_repo(self, make_context):
+        ctx = make_context()
+        ctx.tools = SimpleNamespace(git=False, node=False, python=False, docker=False, claude=True, jupyter=False)
+        ctx.session.is_git_repo = False
+        prompt = generate_system_prompt(ctx)
+        assert "- **Available Tools:** none detected\n" in prompt
+        assert "- **Git Repo:** No\n" in prompt
+        assert "- **User:** wave\n" in prompt
+
+    def test_non_bool_tool_flags(self, make_context):
+        ctx = make_context()
+        ctx.tools = SimpleNamespace(git=1, node=0, python=None, docker="yes", jupyter="")
+        assert "- **Available Tools:** git, docker\n" in generate_system_prompt(ctx)
+
+    def test_values_are_formatted_with_str(self, make_context):
+        ctx = make_context()
+        ctx.machine.cores = 1.0
+        assert "(x86_64, 1.0 cores)" in generate_system_prompt(ctx)
+
+    def test_render_many(self, make_context):
+        renderer = PromptRenderer()
+        contexts = [make_context(timestamp=str(i), docker=i % 2 == 0) for i in range(6)]
+        assert renderer.render_many(contexts) == [generate_system_prompt(ctx) for ctx in contexts]
+
+    def test_custom_fields(self, make_context):
+        renderer = PromptRenderer(
+            template="{{{host}}} '{where}' \\ {count}\n",
+            fields={
+                "host": "ctx.machine.name",
+                "where": lambda ctx: ctx.session.cwd.upper(),
+                "count": "len(ctx.session.cwd) * 2",
+            },
+        )
+        assert renderer.render(make_context()) == (
+            "{spiral} '/HOME/WAVE/REPO' \\ 30\n*Context generated: 2025-01-01T12:00:00*\n"
+        )
+
+    def test_invalid_field_spec(self):
+        with pytest.raises(ValueError):
+            PromptRenderer(template="{a}", fields={"a": "ctx.("})
+        with pytest.raises(ValueError):
+            PromptRenderer(template="{a}", fields={"a": 3})
+
+    def test_template_fields(self):
+        template = PromptTemplate("{a} and {{literal}} then {b}")
+        assert template.fields == ["a", "b"]
+        assert template.render([1, 2]) == "1 and {literal} then 2"
+        with pytest.raises(ValueError):
+            PromptRenderer(template="{unknown}")
@@ -0,0 +1,119 @@
+"""
+Tests for the rule-pack scanning engine.
+"""
+import json
+import re
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "tools"))
+
+from rulepack import Automaton, Rule, RuleSet, default_rule_packs, load_rule_pack
+from scan_euler_precision import load_rules, scan_repo
+
+RULES_DIR = Path(__file__).parent.parent / "tools" / "rules"
+
+# The regexes scan_euler_precision.py used before rule packs
+LEGACY_PATTERNS = {
+    'python_pow': r'pow\s*\(\s*2\.71[0-9]*\s*,',
+    'python_exp': r'(?<![a-zA-Z_])2\.71[0-9]*\s*\*\*',
+    'js_java_pow': r'Math\.pow\s*\(\s*2\.71[0-9]*',
+    'direct_const': r'(?<![a-zA-Z_])e\s*=\s*2\.71[0-9]*',
+}
+
+SAMPLE = """import math
+x = pow(2.718, t)
+y = 2.71828 ** t
+z = Math.pow(2.718, t)
+e = 2.718
+ok = math.exp(t)
+version = "3.14"
+area = 3.14159 * r * r
+c = 299792458
+g = 9.81
+"""
+
+
+class TestAutomaton:
+    """Test suite for the Aho-Corasick automaton."""
+
+    def test_finds_overlapping_matches(self):
+        automaton = Automaton(["he", "she", "his", "hers"])
+        matches = sorted((start, automaton.words[i]) for start, i in automaton.iter_matches("ushers"))
+        assert matches == [(1, "she"), (2, "he"), (2, "hers")]
+
+    def test_matches_brute_force(self):
+        words = ["2.71", "2.718", "71", "1.414", "14", "3.14", "41"]
+        text = "a=2.71828; b=1.41421 3.1415 x41 271 2.7"
+        automaton = Automaton(words)
+        expected = sorted(
+            (m.start(), i) for i, w in enumerate(words) for m in re.finditer(f"(?={re.escape(w)})", text)
+        )
+        assert sorted(automaton.iter_matches(text)) == expected
+
+    def test_empty(self):
+        assert list(Automaton([]).iter_matches("anything")) == []
+
+
+class TestRuleSet:
+    """Test suite for RuleSet and rule packs."""
+
+    def test_euler_pack_matches_legacy_patterns(self):
+        rules = load_rules(["euler"])
+        legacy = [
+            (num, line, name)
+            for num, line in enumerate(SAMPLE.splitlines(keepends=True), 1)
+            for name, pattern in LEGACY_PATTERNS.items()
+            if re.search(pattern, line)
+        ]
+        assert rules.scan_text(SAMPLE, ".py") == legacy
+
+    def test_constants_pack(self):
+        rules = load_rules(["constants"])
+        found = {(num, rule_id) for num, _line, rule_id in rules.scan_text(SAMPLE, ".py")}
+        assert found == {(8, "pi_literal"), (9, "speed_of_light_literal"), (10, "standard_gravity_literal")}
+
+    def test_extensions_filter(self):
+        rules = RuleSet([Rule("py_only", ["2.71"], r"2\.71", extensions=[".py"])])
+        assert rules.scan_text("e = 2.71\n", ".py")
+        assert rules.scan_text("e = 2.71\n", ".js") == []
+        assert rules.extensions == [".py"]
+
+    def test_last_line_without_newline(self):
+        rules = RuleSet([Rule("pi", ["3.14"], r"3\.14")])
+        assert rules.scan_text("a\nb = 3.14", ".py") == [(2, "b = 3.14", "pi")]
+
+    def test_yaml_pack(self, tmp_path):
+        pytest.importorskip("yaml")
+        pack = tmp_path / "custom.yml"
+        pack.write_text("name: custom\nrules:\n  - id: answer\n    anchors: ['42']\n    pattern: '\\b42\\b'\n")
+        rules = RuleSet.from_packs([pack])
+        assert rules.rules[0].pack == "custom"
+        assert rules.scan_text("x = 42\ny = 142\n") == [(1, "x = 42\n", "answer")]
+
+    def test_invalid_packs(self, tmp_path):
+        pack = tmp_path / "bad.json"
+        pack.write_text(json.dumps({"rules": [{"id": "x", "anchors": [], "pattern": "x"}]}))
+        with pytest.raises(ValueError):
+            load_rule_pack(pack)
+        pack.write_text(json.dumps({"rules": [{"id": "x", "anchors": ["x"], "pattern": "("}]}))
+        with pytest.raises(ValueError):
+            load_rule_pack(pack)
+        with pytest.raises(ValueError):
+            RuleSet([Rule("x", ["a"], "a"), Rule("x", ["b"], "b")])
+
+    def test_shipped_packs_load_together(self):
+        rules = RuleSet.from_packs(default_rule_packs())
+        assert len(rules) == sum(len(load_rule_pack(p)) for p in RULES_DIR.glob("*.json"))
+
+    def test_scan_repo(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(Path, "home", lambda: tmp_path)
+        repo = tmp_path / "repo"
+        (repo / "node_modules").mkdir(parents=True)
+        (repo / "sim.py").write_text(SAMPLE)
+        (repo / "node_modules" / "dep.js").write_text("Math.pow(2.718, x)\n")
+        findings = scan_repo("repo", load_rules(["euler", "constants"]))
+        assert {f.file_path for f in findings} == {"sim.py"}
+        assert len(findings) == 8
@@ -0,0 +1,118 @@
+"""
+Tests for the SQLite session index over saved session files.
+"""
+import json
+import os
+import sys
+from datetime import date, datetime
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from wave_toolkit.session_index import SessionIndex
+
+
+def write_session(directory, session_id, task, machine="wave-host", branch="main", types=("action",)):
+    path = Path(directory) / f"session_{session_id}.json"
+    data = {
+        "session_id": session_id,
+        "timestamp": f"2026-{session_id[4:6]}-{session_id[6:8]}T10:00:00",
+        "task": task,
+        "context": {
+            "machine": {"name": machine, "arch": "x86_64", "os": "Linux", "cores": 4},
+            "user": {"name": "builder", "home": "/home/builder", "domain": None},
+            "session": {"cwd": "/work", "is_git_repo": True, "git_branch": branch},
+        },
+        "system_prompt": "# prompt",
+        "log_entries": [
+            {"timestamp": f"2026-01-01T00:00:0{i}", "type": entry_type, "content": str(i)}
+            for i, entry_type in enumerate(types)
+        ],
+    }
+    path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    return path
+
+
+@pytest.fixture
+def sessions_dir(tmp_path):
+    directory = tmp_path / "sessions"
+    directory.mkdir()
+    write_session(directory, "20260105_100000", "Refactor logging", types=("session_start", "task"))
+    write_session(directory, "20260210_100000", "Tune scanner", machine="laptop", types=("action", "action"))
+    write_session(directory, "20260315_100000", "Logging cleanup", branch="feature/logs")
+    return directory
+
+
+class TestSessionIndex:
+    """Test suite for SessionIndex."""
+
+    def test_refresh_indexes_all_sessions(self, sessions_dir):
+        with SessionIndex(str(sessions_dir)) as index:
+            assert index.refresh() == (3, 0)
+            assert index.refresh() == (0, 0)
+            assert len(index.query()) == 3
+
+    def test_query_filters(self, sessions_dir):
+        with SessionIndex(str(sessions_dir)) as index:
+            index.refresh()
+
+            assert [r.session_id for r in index.query(task="logging")] == [
+                "20260315_100000", "20260105_100000",
+            ]
+            assert [r.session_id for r in index.query(machine="laptop")] == ["20260210_100000"]
+            assert [r.session_id for r in index.query(git_branch="feature/logs")] == ["20260315_100000"]
+            assert [r.session_id for r in index.query(entry_type="task")] == ["20260105_100000"]
+
+            in_range = index.query(since=datetime(2026, 2, 1), until="2026-03-01")
+            assert [r.session_id for r in in_range] == ["20260210_100000"]
+
+    def test_date_only_until_includes_the_whole_day(self, sessions_dir):
+        write_session(sessions_dir, "20260301_100000", "Late day")
+        with SessionIndex(str(sessions_dir)) as index:
+            index.refresh()
+
+            expected = ["20260301_100000", "20260210_100000"]
+            assert [r.session_id for r in index.query(since="2026-02-01", until="2026-03-01")] == expected
+            assert [r.session_id for r in index.query(since="2026-02-01", until=date(2026, 3, 1))] == expected
+            assert [r.session_id for r in index.query(until="2026-03-01T09:00:00")] == [
+                "20260210_100000", "20260105_100000",
+            ]
+
+    def test_record_contents(self, sessions_dir):
+        with SessionIndex(str(sessions_dir)) as index:
+            index.refresh()
+            record = index.query(machine="laptop")[0]
+
+        assert record.task == "Tune scanner"
+        assert record.entry_count == 2
+        assert record.entry_types == {"action": 2}
+        assert record.first_entry == "2026-01-01T00:00:00"
+        assert record.last_entry == "2026-01-01T00:00:01"
+
+    def test_incremental_update_and_removal(self, sessions_dir):
+        with SessionIndex(str(sessions_dir)) as index:
+            index.refresh()
+
+            changed = write_session(sessions_dir, "20260210_100000", "Tune scanner again", machine="laptop")
+            stat = changed.stat()
+            os.utime(changed, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+            (sessions_dir / "session_20260105_100000.json").unlink()
+
+            assert index.refresh() == (1, 1)
+            assert [r.task for r in index.query()] == ["Logging cleanup", "Tune scanner again"]
+            assert index.entry_type_totals() == {"action": 2}
+
+    def test_add_single_file(self, tmp_path):
+        directory = tmp_path / "sessions"
+        with SessionIndex(str(directory)) as index:
+            path = write_session(directory, "20260401_100000", "Saved session")
+            assert index.add(str(path)) is True
+            assert index.add(str(path)) is False
+            assert index.query()[0].task == "Saved session"
+
+    def test_corrupt_file_skipped(self, sessions_dir):
+        (sessions_dir / "session_broken.json").write_text('{"session_id": "broken", "log_entries": [')
+        with SessionIndex(str(sessions_dir)) as index:
+            assert index.refresh() == (3, 0)
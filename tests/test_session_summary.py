@@ -0,0 +1,160 @@
+"""
+Tests for session summary generation.
+
+Covers the in-memory summary, the streaming writer over saved session files
+and the incremental JSON reader underneath it.
+"""
+import io
+import json
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from wave_toolkit._jsonstream import iter_array, iter_object
+from wave_toolkit.summary import (
+    generate_session_summary,
+    read_session_file,
+    write_session_summary,
+)
+
+
+CONTEXT = {
+    "timestamp": "2026-01-21T00:31:25",
+    "machine": {"name": "wave-host", "arch": "x86_64", "os": "Linux 6.1", "cores": 8},
+    "user": {"name": "builder", "home": "/home/builder", "domain": None},
+    "shell": {"name": "Python/Jupyter", "version": "3.11.0", "environment": "notebook"},
+    "session": {"cwd": "/home/builder/wave-toolkit", "is_git_repo": True, "git_branch": "main"},
+    "tools": {"git": True, "node": False, "python": True, "docker": False, "claude": False, "jupyter": True},
+}
+
+
+def make_entries(count):
+    types = ["session_start", "task", "action", "action"]
+    return [
+        {
+            "timestamp": f"2026-01-21T{i // 60 % 24:02d}:{i % 60:02d}:00",
+            "type": types[i % len(types)],
+            "content": f"entry {i}",
+        }
+        for i in range(count)
+    ]
+
+
+def make_session(entries):
+    return SimpleNamespace(
+        session_id="20260121_003125",
+        timestamp="2026-01-21T00:31:25",
+        task="Summarise",
+        context=CONTEXT,
+        system_prompt="# prompt",
+        log_entries=entries,
+    )
+
+
+def save_session(tmp_path, session):
+    path = tmp_path / f"session_{session.session_id}.json"
+    data = {
+        "session_id": session.session_id,
+        "timestamp": session.timestamp,
+        "task": session.task,
+        "context": session.context,
+        "system_prompt": session.system_prompt,
+        "log_entries": session.log_entries,
+    }
+    path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    return path
+
+
+class TestJSONStream:
+    """Tests for the incremental JSON reader."""
+
+    @pytest.mark.parametrize("chunk_size", [1, 3, 7, 64])
+    def test_iter_array_small_chunks(self, chunk_size):
+        data = [1, 123456, "text", {"a": [1, 2]}, None, True, 2.5e10, []]
+        items = list(iter_array(io.StringIO(json.dumps(data, indent=2)), chunk_size))
+        assert items == data
+
+    def test_iter_array_empty(self):
+        assert list(iter_array(io.StringIO(" [ ] "))) == []
+
+    def test_iter_object_streams_keys(self):
+        doc = json.dumps({"a": 1, "items": [{"x": 1}, {"x": 2}], "b": "end"})
+        events = list(iter_object(io.StringIO(doc), stream_keys=("items",), chunk_size=5))
+        assert events == [
+            ("value", "a", 1),
+            ("item", "items", {"x": 1}),
+            ("item", "items", {"x": 2}),
+            ("value", "b", "end"),
+        ]
+
+    def test_malformed_raises(self):
+        with pytest.raises(json.JSONDecodeError):
+            list(iter_array(io.StringIO("[1, 2")))
+        with pytest.raises(json.JSONDecodeError):
+            list(iter_array(io.StringIO("{}")))
+
+
+class TestSessionSummary:
+    """Tests for generate_session_summary and write_session_summary."""
+
+    def test_generate_matches_entry_format(self):
+        session = make_session(make_entries(3))
+        summary = generate_session_summary(session)
+
+        assert summary.startswith("# Wave Session Summary\n")
+        assert "- **Task:** Summarise" in summary
+        assert "- **Machine:** wave-host (x86_64)" in summary
+        assert "- **Git Repo:** Yes" in summary
+        assert "## Log Entries\n- [2026-01-21T00:00:00] **session_start**: entry 0\n" in summary
+        assert summary.endswith("\n---\n*Generated by Wave Toolkit Project Book*\n")
+
+    def test_file_source_matches_object_source(self, tmp_path):
+        session = make_session(make_entries(50))
+        path = save_session(tmp_path, session)
+
+        out = io.StringIO()
+        count = write_session_summary(path, out)
+
+        assert count == 50
+        assert out.getvalue() == generate_session_summary(session)
+
+    def test_aggregate_modes(self, tmp_path):
+        session = make_session(make_entries(130))
+        path = save_session(tmp_path, session)
+        out_path = tmp_path / "out" / "summary.md"
+
+        write_session_summary(
+            str(path), str(out_path),
+            modes=("counts", "histogram", "edges"), edge_count=2,
+        )
+        text = out_path.read_text(encoding="utf-8")
+
+        assert "## Log Entries" not in text
+        assert "- **action**: 64\n" in text
+        assert "- **task**: 33\n" in text
+        assert "- 2026-01-21T00: 60\n" in text
+        assert "- 2026-01-21T02: 10\n" in text
+        assert "## First 2 Entries\n- [2026-01-21T00:00:00] **session_start**: entry 0\n" in text
+        assert "## Last 2 Entries\n- [2026-01-21T02:08:00] **session_start**: entry 128\n" in text
+
+    def test_read_session_file_header(self, tmp_path):
+        path = save_session(tmp_path, make_session(make_entries(5)))
+        header, entries = read_session_file(path)
+
+        assert header["session_id"] == "20260121_003125"
+        assert header["context"]["machine"]["name"] == "wave-host"
+        assert "log_entries" not in header
+        assert [e["content"] for e in entries] == [f"entry {i}" for i in range(5)]
+
+    def test_invalid_mode(self):
+        with pytest.raises(ValueError) as exc_info:
+            write_session_summary(make_session([]), io.StringIO(), modes=("bogus",))
+        assert "Unknown summary mode" in str(exc_info.value)
+
+    def test_missing_file(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            write_session_summary(tmp_path / "nope.json", io.StringIO())
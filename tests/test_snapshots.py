@@ -0,0 +1,136 @@
+"""
+Tests for the delta-encoded snapshot store.
+"""
+import json
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from wave_toolkit.snapshots import SnapshotReader, SnapshotStore
+
+
+def at(second: int) -> str:
+    return f"2025-01-01T12:{second // 60:02d}:{second % 60:02d}.{second:06d}"
+
+
+@pytest.fixture
+def history(make_context):
+    contexts = []
+    for i in range(50):
+        contexts.append(make_context(at(i), cwd="/tmp" if 20 <= i < 30 else "/home/wave/repo"))
+        contexts.append(make_context(at(i), machine="kenl-box", branch=f"b{i // 10}"))
+    return contexts
+
+
+def write(path, contexts, **kwargs):
+    with SnapshotStore(str(path), **kwargs) as store:
+        for ctx in contexts:
+            store.append(ctx)
+
+
+class TestSnapshotStore:
+    """Test suite for SnapshotStore and SnapshotReader."""
+
+    def test_random_access(self, history, tmp_path):
+        path = tmp_path / "snapshots.jsonl"
+        write(path, history, keyframe_interval=8)
+        reader = SnapshotReader(str(path))
+
+        assert reader.streams() == ["spiral", "kenl-box"]
+        assert reader.count("spiral") == 50 and len(reader) == 100
+        for seq in (0, 7, 8, 25, 49):
+            assert reader.get("spiral", seq) == history[seq * 2]
+            assert reader.get("kenl-box", seq) == history[seq * 2 + 1]
+        assert reader.get("spiral") == history[-2]
+        with pytest.raises(IndexError):
+            reader.get("spiral", 50)
+
+    def test_deltas_are_small(self, history, tmp_path):
+        path = tmp_path / "snapshots.jsonl"
+        write(path, history[::2])
+        lines = path.read_bytes().splitlines()
+        full = len(history[0].to_json().encode("utf-8"))
+
+        assert len(lines) == 1 + 1 + 49  # declaration, keyframe, deltas
+        assert json.loads(lines[2]) == {"s": 0, "t": 1000001}
+        assert path.stat().st_size * 10 < full * 50
+
+    def test_history(self, history, tmp_path):
+        path = tmp_path / "snapshots.jsonl"
+        write(path, history[::2], keyframe_interval=4)
+        changes = [(seq, c) for seq, _ts, c in SnapshotReader(str(path)).history("spiral") if c]
+
+        assert changes[0][0] == 0  # initial state
+        assert changes[1:] == [(20, {"session.cwd": "/tmp"}), (30, {"session.cwd": "/home/wave/repo"})]
+        timestamps = [ts for _seq, ts, _c in SnapshotReader(str(path)).history("spiral", start=45)]
+        assert timestamps == [c.timestamp for c in history[90::2]]
+
+    def test_reopen_continues_and_index_is_incremental(self, history, tmp_path):
+        path = tmp_path / "snapshots.jsonl"
+        write(path, history[:40], keyframe_interval=8)
+        assert (tmp_path / "snapshots.jsonl.idx").exists()
+        write(path, history[40:], keyframe_interval=8)
+
+        reader = SnapshotReader(str(path))
+        assert list(reader.iter_snapshots("kenl-box", start=15)) == history[31::2]
+
+    def test_timestamps_that_cannot_round_trip(self, make_context, tmp_path):
+        path = tmp_path / "snapshots.jsonl"
+        first, second = make_context(at(0)), make_context(at(1))
+        second.timestamp = "2025-01-01T12:00:01Z"
+        write(path, [first, second])
+        assert SnapshotReader(str(path)).get("spiral", 1).timestamp == "2025-01-01T12:00:01Z"
+
+    def test_partial_trailing_record_is_ignored(self, history, tmp_path):
+        path = tmp_path / "snapshots.jsonl"
+        write(path, history[:4])
+        with open(path, "ab") as f:
+            f.write(b'{"s": 0, "t": 5')
+        assert SnapshotReader(str(path)).count("spiral") == 2
+
+    def test_append_after_partial_record(self, history, tmp_path):
+        path = tmp_path / "snapshots.jsonl"
+        write(path, history[:4])
+        with open(path, "ab") as f:
+            f.write(b'{"s": 0, "t": 5')
+        write(path, history[4:6])
+        assert SnapshotReader(str(path)).get("spiral") == history[4]
+
+    def test_writers_sharing_a_file(self, make_context, tmp_path):
+        path = tmp_path / "snapshots.jsonl"
+        stores = [SnapshotStore(str(path), keyframe_interval=4) for _ in range(2)]
+        for i in range(10):
+            for n, store in enumerate(stores):
+                assert store.append(make_context(at(i * 2 + n))) == i * 2 + n
+                store.append(make_context(at(i), machine=f"box-{n}"))
+        for store in stores:
+            store.close()
+
+        reader = SnapshotReader(str(path))
+        assert reader.streams() == ["spiral", "box-0", "box-1"]
+        assert [c.timestamp for c in reader.iter_snapshots("spiral")] == [at(i) for i in range(20)]
+        assert reader.get("box-1") == make_context(at(9), machine="box-1")
+
+    def test_concurrent_appends(self, make_context, tmp_path):
+        path = tmp_path / "snapshots.jsonl"
+
+        def run(n):
+            with SnapshotStore(str(path)) as store:
+                for i in range(25):
+                    store.append(make_context(at(i), machine=f"box-{n % 2}"))
+
+        threads = [threading.Thread(target=run, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        reader = SnapshotReader(str(path))
+        assert sorted(reader.streams()) == ["box-0", "box-1"]
+        assert len(reader) == 100
+        for name in reader.streams():
+            assert len(list(reader.iter_snapshots(name))) == 50
@@ -0,0 +1,94 @@
+"""
+Tests for AI_AGENTS.md and badge template generation.
+"""
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from wave_toolkit.ecosystem import EcosystemRepo
+from wave_toolkit.framework import FrameworkCache
+from wave_toolkit.templates import (
+    GENERATED_MARKER,
+    generate_ai_agents_template,
+    generate_ecosystem_badge_header,
+    generate_ecosystem_templates,
+)
+
+
+def make_repo(root: Path, name: str, dirs) -> EcosystemRepo:
+    path = root / name
+    for d in dirs:
+        (path / d).mkdir(parents=True)
+        (path / d / "file.py").write_text("x = 1\n")
+    return EcosystemRepo(name, f"https://github.com/toolate28/{name}", "", "v1", str(path), True)
+
+
+@pytest.fixture
+def repos(tmp_path):
+    return [
+        make_repo(tmp_path, "SpiralSafe", ["docs", "tools"]),
+        make_repo(tmp_path, "kenl", ["src"]),
+        EcosystemRepo("quantum-redstone", "", "", "Available"),
+    ]
+
+
+class TestTemplates:
+    """Test suite for template generation."""
+
+    def test_ai_agents_template(self):
+        template = generate_ai_agents_template("kenl", {"src": [], "docs": []})
+        assert "```text\nkenl/\n├── src/\n├── docs/\n```" in template
+        assert "where to put things in kenl." in template
+
+    def test_badge_header(self):
+        assert "📦_kenl-Main-blue" in generate_ecosystem_badge_header("kenl")
+
+    def test_batch_writes_then_skips_unchanged(self, repos, tmp_path):
+        cache = FrameworkCache(str(tmp_path / "cache"))
+        results = generate_ecosystem_templates(repos, cache=cache, badge_filename="docs/BADGE.md")
+
+        assert [(r.repo, r.status) for r in results] == [
+            ("SpiralSafe", "written"),
+            ("SpiralSafe", "written"),
+            ("kenl", "written"),
+            ("kenl", "written"),
+            ("quantum-redstone", "unavailable"),
+        ]
+        agents = Path(repos[0].local_path) / "AI_AGENTS.md"
+        assert "├── docs/\n├── tools/" in agents.read_text(encoding="utf-8")
+        mtime = agents.stat().st_mtime_ns
+
+        rerun = generate_ecosystem_templates(repos, cache=cache, badge_filename="docs/BADGE.md")
+        assert {r.status for r in rerun if r.path} == {"unchanged"}
+        assert agents.stat().st_mtime_ns == mtime
+        assert not [p for p in os.listdir(repos[0].local_path) if p.endswith(".tmp")]
+
+    def test_changed_structure_is_rewritten(self, repos, tmp_path):
+        cache = FrameworkCache(str(tmp_path / "cache"))
+        generate_ecosystem_templates(repos, cache=cache)
+        (Path(repos[1].local_path) / "tests").mkdir()
+        (Path(repos[1].local_path) / "tests" / "test_x.py").write_text("")
+
+        results = {r.repo: r.status for r in generate_ecosystem_templates(repos, cache=cache)}
+        assert results == {"SpiralSafe": "unchanged", "kenl": "written", "quantum-redstone": "unavailable"}
+
+    def test_dry_run_writes_nothing(self, repos, tmp_path):
+        results = generate_ecosystem_templates(repos, cache=FrameworkCache(str(tmp_path / "c")), dry_run=True)
+        assert results[0].status == "written"
+        assert not (Path(repos[0].local_path) / "AI_AGENTS.md").exists()
+
+    def test_hand_written_file_is_kept(self, repos, tmp_path):
+        agents = Path(repos[0].local_path) / "AI_AGENTS.md"
+        agents.write_text("# Curated rules\n", encoding="utf-8")
+        cache = FrameworkCache(str(tmp_path / "cache"))
+
+        results = generate_ecosystem_templates(repos[:1], cache=cache)
+        assert [(r.status, r.error) for r in results] == [("skipped", "hand-written")]
+        assert agents.read_text(encoding="utf-8") == "# Curated rules\n"
+
+        assert generate_ecosystem_templates(repos[:1], cache=cache, overwrite=True)[0].status == "written"
+        assert agents.read_text(encoding="utf-8").endswith(GENERATED_MARKER)
@@ -0,0 +1,124 @@
+"""
+Tests for streamed trace reading and vectorized trace analytics.
+"""
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+np = pytest.importorskip("numpy")
+
+from wave_toolkit.trace_analytics import (
+    TraceAggregator,
+    payload_size,
+    summarize_traces,
+    trace_columns,
+)
+from wave_toolkit.traces import iter_traces
+
+
+def make_traces(n):
+    states = ["completed", "failed", "completed", "running"]
+    return [
+        {
+            "trace_id": f"t{i}",
+            "state": states[i % 4],
+            "input": {"i": i},
+            "output": "x" * (i % 50),
+            "timestamp": 1_700_000_000 + i * 600,
+            "agent": f"agent-{i % 3}",
+        }
+        for i in range(n)
+    ]
+
+
+class TestIterTraces:
+    """Test suite for iter_traces."""
+
+    def test_array_object_and_jsonl(self, tmp_path):
+        traces = make_traces(5)
+        array = tmp_path / "a.json"
+        array.write_text(json.dumps(traces, indent=2))
+        single = tmp_path / "s.json"
+        single.write_text(json.dumps(traces[0]))
+        lines = tmp_path / "l.jsonl"
+        lines.write_text("\n".join(json.dumps(t) for t in traces) + "\n")
+
+        assert list(iter_traces(str(array))) == traces
+        assert list(iter_traces(str(single))) == traces[:1]
+        assert list(iter_traces(str(lines))) == traces
+
+    def test_invalid_records(self, tmp_path):
+        path = tmp_path / "t.jsonl"
+        path.write_text('{"trace_id": "a", "state": "ok", "input": 1, "output": 2}\n{"trace_id": "b"}\n')
+        with pytest.raises(ValueError, match="missing required fields"):
+            list(iter_traces(str(path)))
+        assert [t["trace_id"] for t in iter_traces(str(path), skip_invalid=True)] == ["a"]
+
+    def test_missing_file(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            list(iter_traces(str(tmp_path / "missing.json")))
+
+
+class TestTraceAnalytics:
+    """Test suite for summarize_traces and TraceAggregator."""
+
+    def test_columns(self):
+        cols = trace_columns([
+            {"state": "FAILED", "input": "ab", "output": None},
+            {"state": "ok", "input": {}, "output": [1], "error": "boom", "created_at": "2024-01-01T00:00:00Z"},
+            {"output": 1},
+        ])
+        assert cols["key"].tolist() == ["FAILED", "ok", "<none>"]
+        assert cols["is_error"].tolist() == [True, True, False]
+        assert cols["input_size"].tolist() == [4, 2, 4]
+        assert cols["output_size"].tolist() == [4, 3, 1]
+        assert cols["timestamp"][1] == 1704067200.0
+        assert np.isnan(cols["timestamp"][0])
+
+    def test_matches_python_reference(self):
+        traces = make_traces(1000)
+        summary = summarize_traces(traces, chunk_size=97)
+
+        assert summary.total == 1000
+        assert summary.errors == 250
+        assert summary.counts() == {"completed": 500, "failed": 250, "running": 250}
+        for state, group in summary.groups.items():
+            sizes = sorted(payload_size(t["output"]) for t in traces if t["state"] == state)
+            assert group.output_bytes == sum(sizes)
+            assert group.input_bytes == sum(payload_size(t["input"]) for t in traces if t["state"] == state)
+            assert (group.output_min, group.output_max) == (sizes[0], sizes[-1])
+            exact_p95 = sizes[int(np.ceil(0.95 * len(sizes))) - 1]
+            assert exact_p95 <= group.output_p95 <= exact_p95 * 1.2 + 1
+        assert summary.groups["failed"].error_ratio == 1.0
+
+    def test_chunking_does_not_change_result(self):
+        traces = make_traces(500)
+        whole = summarize_traces(traces, by="agent", chunk_size=10_000).to_dict()
+        assert summarize_traces(traces, by="agent", chunk_size=7).to_dict() == whole
+        assert [g["key"] for g in whole["groups"]] == ["agent-0", "agent-1", "agent-2"]
+
+    def test_timeline(self):
+        traces = make_traces(12)  # One trace every 10 minutes
+        summary = summarize_traces(traces, bucket_seconds=3600)
+        assert sum(b.count for b in summary.timeline) == 12
+        assert sum(b.errors for b in summary.timeline) == 3
+        assert summary.timeline[0].start.endswith("+00:00")
+        starts = [b.start for b in summary.timeline]
+        assert starts == sorted(starts)
+
+    def test_streams_file(self, tmp_path):
+        traces = make_traces(300)
+        path = tmp_path / "traces.jsonl"
+        path.write_text("\n".join(json.dumps(t) for t in traces) + "\n")
+        from_file = summarize_traces(path, chunk_size=32)
+        assert from_file.to_dict() == summarize_traces(traces).to_dict()
+
+    def test_empty(self):
+        summary = TraceAggregator().result()
+        assert summary.total == 0
+        assert summary.groups == {}
+        assert summary.error_ratio == 0.0
@@ -0,0 +1,122 @@
+"""
+Tests for streaming trace diff and dedupe.
+"""
+import gzip
+import json
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from wave_toolkit import trace_diff
+from wave_toolkit.cli import main
+from wave_toolkit.trace_diff import ADDED, CHANGED, REMOVED, dedupe_traces, diff_traces, trace_digest
+
+
+def trace(trace_id, output="ok", **extra):
+    return {"trace_id": trace_id, "state": "completed", "input": {"q": trace_id}, "output": output, **extra}
+
+
+def write_jsonl(path, traces):
+    path.write_text("".join(json.dumps(t) + "\n" for t in traces))
+    return path
+
+
+def changes(a, b, **kwargs):
+    return {(c.kind, c.trace_id) for c in diff_traces(a, b, **kwargs)}
+
+
+class TestDiffTraces:
+    """Test suite for diff_traces."""
+
+    def test_added_removed_changed(self, tmp_path):
+        old = write_jsonl(tmp_path / "old.jsonl", [trace("a"), trace("b"), trace("c")])
+        new = write_jsonl(tmp_path / "new.jsonl", [trace("b"), trace("c", output="different"), trace("d")])
+        assert changes(old, new) == {(REMOVED, "a"), (CHANGED, "c"), (ADDED, "d")}
+        assert changes(old, old) == set()
+
+    def test_content_hash_ignores_formatting(self, tmp_path):
+        old = tmp_path / "old.json"
+        old.write_text(json.dumps([{"output": 1, "trace_id": "a", "input": {"x": 1, "y": 2}, "state": "s"}], indent=4))
+        new = write_jsonl(tmp_path / "new.jsonl", [{"trace_id": "a", "state": "s", "input": {"y": 2, "x": 1}, "output": 1}])
+        assert changes(old, new) == set()
+        assert trace_digest({"a": 1, "b": 2}) == trace_digest({"b": 2, "a": 1})
+
+    def test_partition_count_does_not_change_result(self, tmp_path):
+        rng = random.Random(7)
+        old_traces = [trace(f"t{i}") for i in range(2000)]
+        new_traces = [trace(f"t{i}", output=rng.choice(["ok", "ok", "ok", "new"])) for i in range(300, 2300)]
+        rng.shuffle(new_traces)
+        old = write_jsonl(tmp_path / "old.jsonl", old_traces)
+        new = write_jsonl(tmp_path / "new.jsonl", new_traces)
+
+        expected = changes(old, new, partitions=1)
+        assert changes(old, new, partitions=37, tmp_dir=str(tmp_path)) == expected
+        assert {kind for kind, _ in expected} == {ADDED, REMOVED, CHANGED}
+        assert sum(kind == ADDED for kind, _ in expected) == 300
+        assert sum(kind == REMOVED for kind, _ in expected) == 300
+        assert sorted(tmp_path.iterdir()) == sorted([old, new])  # Partition files are cleaned up
+
+    def test_automatic_partition_count(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(trace_diff, "PARTITION_BYTES", 1000)
+        data = "".join(json.dumps(trace(f"t{i}")) + "\n" for i in range(100)).encode()
+        plain = tmp_path / "t.jsonl"
+        plain.write_bytes(data)
+        packed = tmp_path / "t.jsonl.gz"
+        packed.write_bytes(gzip.compress(data))
+
+        # Compressed inputs are sized by their estimated decompressed bytes
+        assert trace_diff._partition_count([plain], None) == len(data) // 1000 + 1
+        assert trace_diff._partition_count([packed], None) >= trace_diff._partition_count([plain], None)
+        assert trace_diff._partition_count([[trace("a")]], None) == trace_diff.ITERABLE_PARTITIONS
+
+    def test_ids_of_different_types_stay_apart(self):
+        assert changes([trace(1)], [trace("1")]) == {(REMOVED, 1), (ADDED, "1")}
+
+    def test_repeated_ids_compare_first_occurrence(self):
+        old = [trace("a"), trace("a", output="later")]
+        new = [trace("a"), trace("a", output="other")]
+        assert changes(old, new) == set()
+
+    def test_invalid_partitions(self):
+        with pytest.raises(ValueError):
+            list(diff_traces([], [], partitions=0))
+
+
+class TestDedupeTraces:
+    """Test suite for dedupe_traces."""
+
+    def test_file_keeps_first_occurrence_in_order(self, tmp_path):
+        traces = [trace(f"t{i % 50}", output=i) for i in range(400)]
+        path = write_jsonl(tmp_path / "t.jsonl", traces)
+        for partitions in (1, 8):
+            result = list(dedupe_traces(path, partitions=partitions))
+            assert result == traces[:50]
+
+    def test_iterable_input(self):
+        traces = [trace("b"), trace("a"), trace("b", output="x"), trace("c")]
+        assert [t["trace_id"] for t in dedupe_traces(traces)] == ["b", "a", "c"]
+
+    def test_no_duplicates(self, tmp_path):
+        traces = [trace(f"t{i}") for i in range(20)]
+        assert list(dedupe_traces(write_jsonl(tmp_path / "t.jsonl", traces))) == traces
+
+
+class TestDiffCli:
+    """Test suite for the wave diff and dedupe commands."""
+
+    def test_diff_and_dedupe(self, tmp_path, capsys):
+        old = write_jsonl(tmp_path / "old.jsonl", [trace("a"), trace("b")])
+        new = write_jsonl(tmp_path / "new.jsonl", [trace("b", output="x"), trace("c"), trace("c")])
+
+        assert main(["diff", str(old), str(new), "--json"]) == 0
+        out = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert {(c["kind"], c["trace_id"]) for c in out} == {("removed", "a"), ("changed", "b"), ("added", "c")}
+
+        assert main(["dedupe", str(new)]) == 0
+        assert [json.loads(line)["trace_id"] for line in capsys.readouterr().out.splitlines()] == ["b", "c"]
+
+        assert main(["diff", str(old), str(tmp_path / "missing.jsonl")]) == 1
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Scan git refs without checking them out.
+
+``git ls-tree`` lists a ref's files, and their blobs are streamed through
+one long-lived ``git cat-file --batch`` process into the same rule-pack
+matcher that scans working trees. Results are cached by blob object id, so
+a blob shared by many tags (or by many paths) is only scanned once; with a
+cache file, that carries over between runs.
+
+Usage:
+    python3 tools/scan_euler_precision.py --ref v1.0 --ref v1.1 --ref main
+"""
+
+import hashlib
+import json
+import os
+import subprocess
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from rulepack import RuleSet
+from scan_euler_precision import SKIP_DIRS, Finding, scan_extensions
+from wave_toolkit import perf
+
+DEFAULT_CACHE_PATH = ".claude/cache/precision_blobs.json"
+
+# Requests in flight to cat-file; their ~41 bytes each stay far below a pipe
+# buffer, so writing one never blocks while git is busy writing a blob
+REQUEST_WINDOW = 256
+
+Match = Tuple[int, str, str]
+
+
+class GitError(RuntimeError):
+    """A git command failed."""
+
+
+def list_tree(repo: Path, ref: str, extensions: List[str]) -> List[Tuple[str, str]]:
+    """
+    List the scannable blobs of a ref.
+
+    Returns:
+        List of (object_id, path) pairs, skipping SKIP_DIRS, symlinks and
+        submodules
+    """
+    result = subprocess.run(
+        ["git", "-C", str(repo), "ls-tree", "-r", "-z", "--full-tree", ref],
+        capture_output=True,
+    )
+    if result.returncode != 0:
+        raise GitError(result.stderr.decode("utf-8", "replace").strip() or f"ls-tree {ref} failed")
+    blobs = []
+    for entry in result.stdout.split(b"\0"):
+        if not entry:
+            continue
+        meta, _, raw_path = entry.partition(b"\t")
+        mode, obj_type, oid = meta.split()
+        if obj_type != b"blob" or mode == b"120000":
+            continue
+        path = raw_path.decode("utf-8", "surrogateescape")
+        parts = path.split("/")
+        if any(part in SKIP_DIRS for part in parts[:-1]):
+            continue
+        if os.path.splitext(path)[1] in extensions:
+            blobs.append((oid.decode("ascii"), path))
+    return blobs
+
+
+class CatFile:
+    """
+    A long-lived ``git cat-file --batch`` process.
+
+    Example:
+        >>> with CatFile(repo) as cat:
+        ...     for oid, data in cat.iter_blobs(oids):
+        ...         ...
+    """
+
+    def __init__(self, repo: Path):
+        self._proc = subprocess.Popen(
+            ["git", "-C", str(repo), "cat-file", "--batch"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        self._lock = threading.Lock()
+
+    def _read(self) -> Optional[bytes]:
+        header = self._proc.stdout.readline()
+        if not header:
+            raise GitError("git cat-file exited unexpectedly")
+        fields = header.split()
+        if len(fields) < 3 or fields[1] == b"missing":
+            return None
+        data = self._proc.stdout.read(int(fields[2]))
+        self._proc.stdout.read(1)  # Trailing newline
+        return data
+
+    def iter_blobs(self, oids: List[str]) -> Iterator[Tuple[str, Optional[bytes]]]:
+        """
+        Yield (oid, contents) in request order; contents is None if missing.
+
+        Up to REQUEST_WINDOW requests are kept in flight so git never waits
+        on a round trip. If the consumer stops early, the answers still in
+        flight are read and dropped so the process stays usable.
+        """
+        if not oids:
+            return
+        with self._lock:
+            stdin = self._proc.stdin
+            sent = received = 0
+            try:
+                while received < len(oids):
+                    if sent - received <= REQUEST_WINDOW // 2 and sent < len(oids):
+                        batch = oids[sent:received + REQUEST_WINDOW]
+                        try:
+                            stdin.write(b"".join(oid.encode("ascii") + b"\n" for oid in batch))
+                            stdin.flush()
+                        except (BrokenPipeError, ValueError) as e:
+                            raise GitError("git cat-file exited unexpectedly") from e
+                        sent += len(batch)
+                    data = self._read()
+                    received += 1
+                    yield oids[received - 1], data
+            finally:
+                try:
+                    for _ in range(sent - received):
+                        self._read()
+                except GitError:
+                    pass
+
+    def close(self):
+        """Stop the git process."""
+        if self._proc.poll() is None:
+            self._proc.stdin.close()
+            self._proc.wait()
+        self._proc.stdout.close()
+
+    def __enter__(self) -> "CatFile":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def rules_fingerprint(rules: RuleSet) -> str:
+    """Hash of everything about the rules that affects results."""
+    spec = [(r.id, r.anchors, r.pattern, r.extensions) for r in rules.rules]
+    return hashlib.sha1(json.dumps(spec).encode("utf-8")).hexdigest()
+
+
+class BlobScanner:
+    """
+    Scans blobs by object id, remembering results per (oid, extension).
+
+    Args:
+        rules: Compiled rule packs
+        cache_path: Optional JSON file that keeps results between runs;
+            it is discarded when the rules change
+    """
+
+    def __init__(self, rules: RuleSet, cache_path: Optional[str] = None):
+        self.rules = rules
+        self.extensions = scan_extensions(rules)
+        self.cache_path = Path(cache_path) if cache_path else None
+        self._fingerprint = rules_fingerprint(rules)
+        self._results: Dict[str, List[Match]] = {}
+        self.scanned = 0
+        self.reused = 0
+        self._load()
+
+    def _load(self):
+        if self.cache_path is None or not self.cache_path.exists():
+            return
+        try:
+            data = json.loads(self.cache_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if data.get("rules") == self._fingerprint:
+            self._results = {key: [tuple(m) for m in matches] for key, matches in data["blobs"].items()}
+
+    def save(self):
+        """Write the result cache, if a cache path was given."""
+        if self.cache_path is None:
+            return
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.cache_path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(
+            json.dumps({"rules": self._fingerprint, "blobs": self._results}, separators=(",", ":")),
+            encoding="utf-8",
+        )
+        os.replace(tmp, self.cache_path)
+
+    @perf.profiled("scan.ref")
+    def scan_ref(self, repo: Path, ref: str, label: Optional[str] = None) -> List[Finding]:
+        """
+        Scan every matching file of ``ref`` in the repository at ``repo``.
+
+        Args:
+            repo: Repository path
+            ref: Any tree-ish (branch, tag, commit)
+            label: Repository name used in findings (default: the path)
+
+        Raises:
+            GitError: If the ref cannot be listed
+        """
+        blobs = list_tree(repo, ref, self.extensions)
+        todo = sorted({
+            oid for oid, path in blobs if f"{oid}{os.path.splitext(path)[1]}" not in self._results
+        })
+        suffixes: Dict[str, set] = {}
+        for oid, path in blobs:
+            suffixes.setdefault(oid, set()).add(os.path.splitext(path)[1])
+
+        reused = len({oid for oid, _ in blobs}) - len(todo)
+        self.reused += reused
+        perf.cache("scan.blobs", reused, len(todo))
+        if todo:
+            with CatFile(repo) as cat:
+                for oid, data in cat.iter_blobs(todo):
+                    if data is None:
+                        continue  # Not cached: the object may be fetched later
+                    text = data.decode("utf-8", errors="ignore")
+                    for suffix in suffixes[oid]:
+                        self._results[f"{oid}{suffix}"] = self.rules.scan_text(text, suffix)
+                    self.scanned += 1
+
+        name = f"{label or repo}@{ref}"
+        findings = []
+        for oid, path in blobs:
+            for line_num, line, rule_id in self._results.get(f"{oid}{os.path.splitext(path)[1]}", ()):
+                findings.append(Finding(name, path, line_num, line, rule_id))
+        return findings
+
+    def scan_refs(self, repo: Path, refs: Iterable[str], label: Optional[str] = None) -> List[Finding]:
+        """Scan several refs; blobs shared between them are scanned once."""
+        findings = []
+        for ref in refs:
+            findings.extend(self.scan_ref(repo, ref, label))
+        return findings
@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""
+Watch mode for the precision scanner.
+
+Scans the ecosystem repositories once, then follows filesystem changes and
+rescans only the files that were touched. Events come from inotify on Linux
+(through ctypes, no extra dependencies) and from a stat-based poller
+elsewhere. Bursts of events are debounced, and findings are kept in an
+in-memory table so each change reports only what it added or removed.
+
+Usage:
+    python3 tools/scan_euler_precision.py --watch
+    python3 tools/scan_euler_precision.py --watch --rules euler --rules constants
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from rulepack import RuleSet
+from scan_euler_precision import (
+    SKIP_DIRS,
+    Finding,
+    iter_repo_files,
+    scan_extensions,
+    scan_file,
+)
+
+DEFAULT_DEBOUNCE = 0.05
+DEFAULT_POLL_INTERVAL = 1.0
+
+# inotify(7)
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+
+WATCH_MASK = (
+    IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+    | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_ONLYDIR
+)
+_EVENT = struct.Struct("iIII")
+
+
+def _skipped(path: Path) -> bool:
+    return any(part in SKIP_DIRS for part in path.parts)
+
+
+class InotifyWatcher:
+    """
+    Recursive inotify watcher.
+
+    ``poll`` returns changed paths. A directory in the result means
+    "rescan everything below it" (a directory was created or moved in, or
+    the event queue overflowed).
+    """
+
+    def __init__(self, roots: Iterable[Path]):
+        libc_name = ctypes.util.find_library("c") or "libc.so.6"
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.roots = [Path(root) for root in roots]
+        self._dirs: Dict[int, Path] = {}
+        for root in self.roots:
+            self._watch_tree(root)
+
+    @staticmethod
+    def available() -> bool:
+        """Whether inotify can be used on this platform."""
+        return sys.platform.startswith("linux")
+
+    def _watch_tree(self, top: Path):
+        for dirpath, dirnames, _filenames in os.walk(top):
+            dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(dirpath), WATCH_MASK)
+            if wd >= 0:
+                self._dirs[wd] = Path(dirpath)
+
+    def _unwatch_tree(self, top: Path):
+        # The watches follow the moved inodes, so drop them rather than
+        # keep reporting their events under the old path
+        for wd, directory in list(self._dirs.items()):
+            if directory == top or top in directory.parents:
+                self._libc.inotify_rm_watch(self._fd, wd)
+                del self._dirs[wd]
+
+    def poll(self, timeout: Optional[float]) -> Set[Path]:
+        """Wait up to ``timeout`` seconds for changes; return the changed paths."""
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if not ready:
+            return set()
+        changed: Set[Path] = set()
+        while True:
+            try:
+                data = os.read(self._fd, 1 << 16)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, mask, _cookie, length = _EVENT.unpack_from(data, offset)
+                offset += _EVENT.size
+                name = data[offset:offset + length].rstrip(b"\0")
+                offset += length
+
+                if mask & IN_Q_OVERFLOW:
+                    changed.update(self.roots)
+                    continue
+                if mask & IN_IGNORED:
+                    self._dirs.pop(wd, None)
+                    continue
+                directory = self._dirs.get(wd)
+                if directory is None:
+                    continue
+                if mask & IN_DELETE_SELF:
+                    changed.add(directory)
+                    continue
+                path = directory / os.fsdecode(name)
+                if _skipped(path):
+                    continue
+                if mask & IN_ISDIR and mask & IN_MOVED_FROM:
+                    self._unwatch_tree(path)
+                if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                    self._watch_tree(path)
+                changed.add(path)
+        return changed
+
+    def close(self):
+        """Stop watching."""
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+class PollingWatcher:
+    """Portable fallback: compares file (mtime, size) between walks."""
+
+    def __init__(self, roots: Iterable[Path], extensions: List[str], interval: float = DEFAULT_POLL_INTERVAL):
+        self.roots = [Path(root) for root in roots]
+        self.extensions = extensions
+        self.interval = interval
+        self._state = self._snapshot()
+
+    def _snapshot(self) -> Dict[Path, Tuple[int, int]]:
+        state = {}
+        for root in self.roots:
+            for path in iter_repo_files(root, self.extensions):
+                try:
+                    st = path.stat()
+                except OSError:
+                    continue
+                state[path] = (st.st_mtime_ns, st.st_size)
+        return state
+
+    def poll(self, timeout: Optional[float]) -> Set[Path]:
+        """Wait up to ``timeout`` seconds (at most one interval); return changed paths."""
+        time.sleep(self.interval if timeout is None else min(timeout, self.interval))
+        current = self._snapshot()
+        previous, self._state = self._state, current
+        return {p for p in current.keys() | previous.keys() if current.get(p) != previous.get(p)}
+
+    def close(self):
+        """Stop watching."""
+
+
+class FindingsTable:
+    """Live findings, keyed by file."""
+
+    def __init__(self):
+        self._by_file: Dict[Path, List[Finding]] = {}
+
+    def update(self, path: Path, findings: List[Finding]) -> Tuple[List[Finding], List[Finding]]:
+        """Replace a file's findings; return (added, removed)."""
+        old = self._by_file.pop(path, [])
+        if findings:
+            self._by_file[path] = findings
+        old_keys = {_key(f) for f in old}
+        new_keys = {_key(f) for f in findings}
+        return (
+            [f for f in findings if _key(f) not in old_keys],
+            [f for f in old if _key(f) not in new_keys],
+        )
+
+    def files_under(self, directory: Path) -> List[Path]:
+        """Files with findings at or below ``directory``."""
+        return [p for p in self._by_file if p == directory or directory in p.parents]
+
+    def all(self) -> List[Finding]:
+        """All current findings."""
+        return [f for findings in self._by_file.values() for f in findings]
+
+    def __len__(self) -> int:
+        return sum(len(findings) for findings in self._by_file.values())
+
+
+def _key(finding: Finding) -> Tuple[str, int, str, str]:
+    return (finding.file_path, finding.line_num, finding.line, finding.pattern_name)
+
+
+class PrecisionWatcher:
+    """
+    Keeps scan results for a set of repositories current.
+
+    Example:
+        >>> watcher = PrecisionWatcher(["wave-toolkit"], rules)
+        >>> watcher.initial_scan()
+        >>> watcher.run(on_change=print_changes)  # until interrupted
+    """
+
+    def __init__(
+        self,
+        repos: Iterable[str],
+        rules: RuleSet,
+        debounce: float = DEFAULT_DEBOUNCE,
+        use_inotify: Optional[bool] = None,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+    ):
+        """
+        Args:
+            repos: Repository paths relative to the home directory
+            rules: Compiled rule packs
+            debounce: Quiet period (seconds) before rescanning changed files
+            use_inotify: Force inotify on/off (default: use it when available)
+            poll_interval: Interval of the polling fallback
+        """
+        self.rules = rules
+        self.extensions = scan_extensions(rules)
+        self.debounce = debounce
+        self.roots: Dict[Path, str] = {}
+        for repo in repos:
+            base = Path.home() / repo
+            if base.exists():
+                self.roots[base] = repo
+        self.table = FindingsTable()
+        if use_inotify is None:
+            use_inotify = InotifyWatcher.available()
+        self.mode = "inotify" if use_inotify else "polling"
+        self._poll_interval = poll_interval
+        self._watcher = None
+
+    def _repo_for(self, path: Path) -> Optional[Tuple[Path, str]]:
+        for base, repo in self.roots.items():
+            if path == base or base in path.parents:
+                return base, repo
+        return None
+
+    def _scannable(self, path: Path) -> bool:
+        return path.suffix in self.extensions and not _skipped(path)
+
+    def scan_path(self, path: Path) -> Tuple[List[Finding], List[Finding]]:
+        """Rescan one file or directory; return (added, removed) findings."""
+        owner = self._repo_for(path)
+        if owner is None:
+            return [], []
+        base, repo = owner
+        added: List[Finding] = []
+        removed: List[Finding] = []
+
+        if path.is_dir():
+            files = set(iter_repo_files(path, self.extensions))
+            stale = [p for p in self.table.files_under(path) if p not in files]
+        elif path.is_file() and self._scannable(path):
+            files, stale = {path}, []
+        else:
+            # Deleted (file or directory) or not a scanned type
+            files, stale = set(), self.table.files_under(path)
+
+        for file_path in stale:
+            removed.extend(self.table.update(file_path, [])[1])
+        for file_path in files:
+            rel_path = str(file_path.relative_to(base))
+            findings = [
+                Finding(repo, rel_path, line_num, line, rule_id)
+                for line_num, line, rule_id in scan_file(file_path, self.rules)
+            ]
+            new, gone = self.table.update(file_path, findings)
+            added.extend(new)
+            removed.extend(gone)
+        return added, removed
+
+    def initial_scan(self) -> List[Finding]:
+        """Start watching every repository, then scan it."""
+        # Watch first so edits made while the scan runs are still reported
+        if self.mode == "inotify":
+            self._watcher = InotifyWatcher(self.roots)
+        else:
+            self._watcher = PollingWatcher(self.roots, self.extensions, self._poll_interval)
+        for base in self.roots:
+            self.scan_path(base)
+        return self.table.all()
+
+    def run(
+        self,
+        on_change: Callable[[List[Finding], List[Finding]], None],
+        stop: Optional[threading.Event] = None,
+    ):
+        """
+        Process change events until ``stop`` is set (or forever).
+
+        ``on_change(added, removed)`` is called after each debounced batch of
+        changes that altered the findings.
+        """
+        if self._watcher is None:
+            self.initial_scan()
+        pending: Set[Path] = set()
+        try:
+            while stop is None or not stop.is_set():
+                # Block for the first event, then keep collecting until quiet
+                changed = self._watcher.poll(self.debounce if pending else 0.5)
+                if changed:
+                    pending |= changed
+                    continue
+                if not pending:
+                    continue
+                added: List[Finding] = []
+                removed: List[Finding] = []
+                for path in _collapse(pending):
+                    new, gone = self.scan_path(path)
+                    added.extend(new)
+                    removed.extend(gone)
+                pending.clear()
+                if added or removed:
+                    on_change(added, removed)
+        finally:
+            self.close()
+
+    def close(self):
+        """Stop watching."""
+        if self._watcher is not None:
+            self._watcher.close()
+            self._watcher = None
+
+
+def _collapse(paths: Set[Path]) -> List[Path]:
+    """Drop paths already covered by a changed ancestor directory."""
+    dirs = {p for p in paths if p.is_dir()}
+    return sorted(p for p in paths if not any(d in p.parents for d in dirs))
+
+
+def print_changes(added: List[Finding], removed: List[Finding]):
+    """Default change reporter."""
+    stamp = time.strftime("%H:%M:%S")
+    for finding in removed:
+        print(f"[{stamp}] ✅ resolved {finding.repo}/{finding.file_path}:{finding.line_num} [{finding.pattern_name}]")
+    for finding in added:
+        print(f"[{stamp}] ❌ {finding}")
+    sys.stdout.flush()
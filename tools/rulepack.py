@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+r"""
+Rule packs for the precision scanner.
+
+A rule pack is a JSON (or YAML, with PyYAML installed) file listing rules.
+Each rule has literal ``anchors`` - strings that must appear for the rule to
+match, such as ``"2.71"`` - and a ``pattern`` regex that confirms the match
+on the line containing an anchor:
+
+    {
+      "name": "euler",
+      "rules": [
+        {
+          "id": "python_pow",
+          "anchors": ["2.71"],
+          "pattern": "pow\\s*\\(\\s*2\\.71[0-9]*\\s*,",
+          "extensions": [".py"],
+          "message": "Use math.exp(x)"
+        }
+      ]
+    }
+
+All anchors of all loaded rules are compiled into a single Aho-Corasick
+automaton, so a file is scanned once no matter how many rules are loaded;
+regexes only run on lines where one of their anchors was found.
+
+Usage:
+    python3 tools/rulepack.py tools/rules/*.json FILE...
+"""
+
+import json
+import re
+import sys
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import yaml
+except ImportError:  # YAML packs are optional
+    yaml = None
+
+RULES_DIR = Path(__file__).parent / "rules"
+
+
+@dataclass
+class Rule:
+    """A single scanner rule."""
+    id: str
+    anchors: List[str]
+    pattern: str
+    message: str = ""
+    extensions: List[str] = field(default_factory=list)
+    pack: str = ""
+
+    def __post_init__(self):
+        if not self.anchors or not all(self.anchors):
+            raise ValueError(f"Rule {self.id!r} needs at least one non-empty anchor")
+        self.regex = re.compile(self.pattern)
+
+    def applies_to(self, suffix: str) -> bool:
+        """Whether the rule applies to files with this extension."""
+        return not self.extensions or suffix in self.extensions
+
+
+class Automaton:
+    """
+    Aho-Corasick automaton over a set of literal strings.
+
+    Matching is a single left-to-right pass whose cost depends on the text
+    length, not on the number of strings.
+    """
+
+    def __init__(self, words: Iterable[str]):
+        self.words = list(words)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[int, ...]] = [()]
+
+        for index, word in enumerate(self.words):
+            state = 0
+            for ch in word:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                state = nxt
+            self._out[state] += (index,)
+
+        # Breadth-first: failure links point to the longest proper suffix in the trie
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] += self._out[self._fail[nxt]]
+
+        # From the root, jump straight to the next character that can start a word
+        starts = "".join(sorted(self._goto[0]))
+        self._next_start = re.compile(f"[{re.escape(starts)}]").search if starts else None
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int]]:
+        """Yield (start offset, word index) for every occurrence in ``text``."""
+        if self._next_start is None:
+            return
+        goto, fail, out, words = self._goto, self._fail, self._out, self.words
+        next_start = self._next_start
+        state = 0
+        i = 0
+        n = len(text)
+        while i < n:
+            if state == 0:
+                match = next_start(text, i)
+                if match is None:
+                    return
+                i = match.start()
+            ch = text[i]
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for index in out[state]:
+                yield i + 1 - len(words[index]), index
+            i += 1
+
+
+def load_rule_pack(path: Path) -> List[Rule]:
+    """
+    Load the rules from a JSON or YAML rule pack.
+
+    Raises:
+        ValueError: If the pack is malformed
+        RuntimeError: If a YAML pack is given without PyYAML installed
+    """
+    path = Path(path)
+    text = path.read_text(encoding="utf-8")
+    if path.suffix in (".yml", ".yaml"):
+        if yaml is None:
+            raise RuntimeError(f"PyYAML is required to load {path}")
+        data = yaml.safe_load(text)
+    else:
+        data = json.loads(text)
+
+    if not isinstance(data, dict) or not isinstance(data.get("rules"), list):
+        raise ValueError(f"{path}: expected an object with a 'rules' list")
+    pack = data.get("name", path.stem)
+    rules = []
+    for entry in data["rules"]:
+        try:
+            rules.append(Rule(
+                id=entry["id"],
+                anchors=list(entry["anchors"]),
+                pattern=entry["pattern"],
+                message=entry.get("message", ""),
+                extensions=list(entry.get("extensions", [])),
+                pack=pack,
+            ))
+        except (KeyError, TypeError, re.error) as e:
+            raise ValueError(f"{path}: invalid rule {entry!r}: {e}") from e
+    return rules
+
+
+class RuleSet:
+    """
+    Loaded rules compiled into one anchor automaton.
+
+    Example:
+        >>> rules = RuleSet.from_packs(["tools/rules/euler.json"])
+        >>> rules.scan_text("x = pow(2.718, t)\\n", ".py")
+        [(1, 'x = pow(2.718, t)\\n', 'python_pow')]
+    """
+
+    def __init__(self, rules: Iterable[Rule]):
+        self.rules: List[Rule] = []
+        seen = set()
+        for rule in rules:
+            if rule.id in seen:
+                raise ValueError(f"Duplicate rule id {rule.id!r}")
+            seen.add(rule.id)
+            self.rules.append(rule)
+
+        # Each distinct anchor is matched once and fans out to its rules
+        anchor_rules: Dict[str, List[int]] = {}
+        for index, rule in enumerate(self.rules):
+            for anchor in rule.anchors:
+                anchor_rules.setdefault(anchor, []).append(index)
+        self._automaton = Automaton(anchor_rules)
+        self._anchor_rules = [tuple(indices) for indices in anchor_rules.values()]
+
+    @classmethod
+    def from_packs(cls, paths: Iterable[Path]) -> "RuleSet":
+        """Load and compile one or more rule packs."""
+        return cls(rule for path in paths for rule in load_rule_pack(path))
+
+    @property
+    def extensions(self) -> List[str]:
+        """Extensions named by any rule (rules without a list apply to all)."""
+        return sorted({ext for rule in self.rules for ext in rule.extensions})
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def scan_text(self, text: str, suffix: str = "") -> List[Tuple[int, str, str]]:
+        """
+        Scan text for rule matches.
+
+        Args:
+            text: File contents
+            suffix: File extension, for rules limited to some extensions
+
+        Returns:
+            List of (line_number, line_content, rule_id) tuples, in line order
+        """
+        # Candidate rules per line start, from anchor hits
+        candidates: Dict[int, set] = {}
+        for start, anchor in self._automaton.iter_matches(text):
+            line_start = text.rfind("\n", 0, start) + 1
+            candidates.setdefault(line_start, set()).update(self._anchor_rules[anchor])
+
+        findings = []
+        line_num = 1
+        counted = 0
+        for line_start in sorted(candidates):
+            line_num += text.count("\n", counted, line_start)
+            counted = line_start
+            line_end = text.find("\n", line_start)
+            line = text[line_start:] if line_end < 0 else text[line_start:line_end + 1]
+            for index in sorted(candidates[line_start]):
+                rule = self.rules[index]
+                if rule.applies_to(suffix) and rule.regex.search(line):
+                    findings.append((line_num, line, rule.id))
+        return findings
+
+    def scan_file(self, file_path: Path) -> List[Tuple[int, str, str]]:
+        """Scan a file; see ``scan_text``."""
+        with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
+            return self.scan_text(f.read(), Path(file_path).suffix)
+
+
+def default_rule_packs() -> List[Path]:
+    """Rule packs shipped in tools/rules."""
+    return sorted(p for p in RULES_DIR.iterdir() if p.suffix in (".json", ".yml", ".yaml"))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Scan files with the given rule packs (packs are the .json/.yml arguments)."""
+    args = sys.argv[1:] if argv is None else argv
+    packs = [Path(a) for a in args if Path(a).suffix in (".json", ".yml", ".yaml")]
+    files = [Path(a) for a in args if Path(a).suffix not in (".json", ".yml", ".yaml")]
+    rules = RuleSet.from_packs(packs or default_rule_packs())
+    found = 0
+    for file_path in files:
+        for line_num, line, rule_id in rules.scan_file(file_path):
+            print(f"{file_path}:{line_num} [{rule_id}]\n    {line.strip()}")
+            found += 1
+    return 1 if found else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,18 +5,31 @@ Ecosystem Euler's Number Precision Scanner
 Scans SpiralSafe ecosystem repositories for hardcoded Euler's number
 approximations (e.g., 2.718, 2.71828) that should use math.exp() or math.e.
 
+Rules come from loadable rule packs (see tools/rulepack.py); the default
+is the built-in ``euler`` pack, and ``--rules`` adds others, such as the
+``constants`` pack for pi, sqrt(2), ln(2), the golden ratio and physical
+constants.
+
 Usage:
     python3 tools/scan_euler_precision.py
     python3 tools/scan_euler_precision.py --verbose
+    python3 tools/scan_euler_precision.py --rules euler --rules constants
+    python3 tools/scan_euler_precision.py --rules my_rules.yml
+    python3 tools/scan_euler_precision.py --watch
+    python3 tools/scan_euler_precision.py --ref v1.0 --ref main
 """
 
-import os
-import re
-import subprocess
+import argparse
 import sys
 from pathlib import Path
 from typing import List, Tuple, Dict
 
+from rulepack import RULES_DIR, RuleSet
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from wave_toolkit import perf
+
 # Repositories to scan (relative to user's home directory)
 REPOS = [
     "SpiralSafe-FromGitHub",
@@ -26,17 +39,15 @@ REPOS = [
     "wave-toolkit",
 ]
 
-# Patterns to detect hardcoded Euler's number
-PATTERNS = {
-    'python_pow': r'pow\s*\(\s*2\.71[0-9]*\s*,',
-    'python_exp': r'(?<![a-zA-Z_])2\.71[0-9]*\s*\*\*',
-    'js_java_pow': r'Math\.pow\s*\(\s*2\.71[0-9]*',
-    'direct_const': r'(?<![a-zA-Z_])e\s*=\s*2\.71[0-9]*',
-}
+# Rule packs used when none are given (names refer to tools/rules/<name>.json)
+DEFAULT_RULE_PACKS = ['euler']
 
 # File extensions to scan
 EXTENSIONS = ['.py', '.js', '.java', '.ts', '.jsx', '.tsx', '.c', '.cpp', '.go', '.rs']
 
+# Directories never scanned
+SKIP_DIRS = ['.git', 'node_modules', 'target', 'build', '__pycache__']
+
 
 class Finding:
     """Represents a potential precision issue."""
@@ -52,34 +63,64 @@ class Finding:
         return f"{self.repo}/{self.file_path}:{self.line_num} [{self.pattern_name}]\n    {self.line}"
 
 
-def scan_file(file_path: Path, patterns: Dict[str, str]) -> List[Tuple[int, str, str]]:
+def resolve_rule_pack(name: str) -> Path:
+    """Resolve a rule pack given as a path or as a name in tools/rules."""
+    path = Path(name)
+    if path.exists():
+        return path
+    for suffix in ('.json', '.yml', '.yaml'):
+        candidate = RULES_DIR / f"{name}{suffix}"
+        if candidate.exists():
+            return candidate
+    raise FileNotFoundError(f"Rule pack not found: {name}")
+
+
+def load_rules(names: List[str]) -> RuleSet:
+    """Load and compile the named rule packs into one RuleSet."""
+    return RuleSet.from_packs(resolve_rule_pack(name) for name in names)
+
+
+def scan_extensions(rules: RuleSet) -> List[str]:
+    """File extensions to scan: EXTENSIONS plus any named by the rules."""
+    return sorted(set(EXTENSIONS) | set(rules.extensions))
+
+
+def iter_repo_files(base: Path, extensions: List[str]):
+    """Yield scannable files under base, skipping SKIP_DIRS."""
+    for ext in extensions:
+        for file_path in base.rglob(f"*{ext}"):
+            # Skip common directories
+            if any(skip in file_path.parts for skip in SKIP_DIRS):
+                continue
+            yield file_path
+
+
+def scan_file(file_path: Path, rules: RuleSet) -> List[Tuple[int, str, str]]:
     """
-    Scan a single file for hardcoded Euler approximations.
+    Scan a single file for hardcoded constants.
     
     Returns:
-        List of (line_number, line_content, pattern_name) tuples
+        List of (line_number, line_content, rule_id) tuples
     """
-    findings = []
     try:
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            for line_num, line in enumerate(f, 1):
-                for pattern_name, pattern in patterns.items():
-                    if re.search(pattern, line):
-                        findings.append((line_num, line, pattern_name))
+        if perf.enabled():
+            perf.count("scan.files")
+            perf.count("scan.bytes", file_path.stat().st_size)
+        return rules.scan_file(file_path)
     except Exception as e:
         if '--verbose' in sys.argv:
             print(f"  Warning: Could not scan {file_path}: {e}", file=sys.stderr)
-    
-    return findings
+        return []
 
 
-def scan_repo(repo_path: str, patterns: Dict[str, str], verbose: bool = False) -> List[Finding]:
+@perf.profiled("scan.repo")
+def scan_repo(repo_path: str, rules: RuleSet, verbose: bool = False) -> List[Finding]:
     """
-    Recursively scan a repository for hardcoded Euler approximations.
+    Recursively scan a repository for hardcoded constants.
     
     Args:
         repo_path: Path to repository relative to home directory
-        patterns: Dictionary of pattern names to regex patterns
+        rules: Compiled rule packs
         verbose: Print progress information
     
     Returns:
@@ -97,18 +138,13 @@ def scan_repo(repo_path: str, patterns: Dict[str, str], verbose: bool = False) -
     if verbose:
         print(f"  Scanning {repo_path}...")
     
-    for ext in EXTENSIONS:
-        for file_path in base.rglob(f"*{ext}"):
-            # Skip common directories
-            if any(skip in file_path.parts for skip in ['.git', 'node_modules', 'target', 'build', '__pycache__']):
-                continue
-            
-            file_count += 1
-            file_findings = scan_file(file_path, patterns)
-            
-            for line_num, line, pattern_name in file_findings:
-                rel_path = file_path.relative_to(base)
-                findings.append(Finding(repo_path, str(rel_path), line_num, line, pattern_name))
+    for file_path in iter_repo_files(base, scan_extensions(rules)):
+        file_count += 1
+        file_findings = scan_file(file_path, rules)
+        
+        for line_num, line, pattern_name in file_findings:
+            rel_path = file_path.relative_to(base)
+            findings.append(Finding(repo_path, str(rel_path), line_num, line, pattern_name))
     
     if verbose:
         print(f"    Scanned {file_count} files, found {len(findings)} issues")
@@ -161,9 +197,58 @@ def print_report(all_findings: List[Finding], verbose: bool = False):
     print("5. Refer to: wave-toolkit/examples/euler_number_usage.py")
 
 
+def scan_refs(repos: List[str], refs: List[str], rules: RuleSet, verbose: bool = False) -> List[Finding]:
+    """Scan git refs of each repository, reading blobs straight from git (see git_scan.py)."""
+    from git_scan import DEFAULT_CACHE_PATH, BlobScanner, GitError
+    
+    scanner = BlobScanner(rules, DEFAULT_CACHE_PATH)
+    findings = []
+    for repo_path in repos:
+        base = Path.home() / repo_path
+        if not base.exists():
+            if verbose:
+                print(f"  ⚠️  Repository not found: {repo_path}")
+            continue
+        for ref in refs:
+            try:
+                findings.extend(scanner.scan_ref(base, ref, repo_path))
+            except GitError as e:
+                if verbose:
+                    print(f"  ⚠️  {repo_path}@{ref}: {e}")
+    scanner.save()
+    if verbose:
+        print(f"    Scanned {scanner.scanned} blobs, reused {scanner.reused} already-scanned blobs")
+    return findings
+
+
+def watch(rules: RuleSet, debounce: float, verbose: bool = False):
+    """Scan once, then report findings as files change until interrupted."""
+    from precision_watch import PrecisionWatcher, print_changes
+    
+    watcher = PrecisionWatcher(REPOS, rules, debounce=debounce)
+    print_report(watcher.initial_scan(), verbose)
+    print(f"\n👀 Watching {len(watcher.roots)} repositories ({watcher.mode}); Ctrl+C to stop")
+    try:
+        watcher.run(on_change=print_changes)
+    except KeyboardInterrupt:
+        print(f"\nStopped with {len(watcher.table)} open issues")
+
+
 def main():
     """Main entry point."""
-    verbose = '--verbose' in sys.argv or '-v' in sys.argv
+    parser = argparse.ArgumentParser(description="Scan ecosystem repositories for hardcoded constants")
+    parser.add_argument('-v', '--verbose', action='store_true', help="Print progress information")
+    parser.add_argument('--rules', action='append', metavar='PACK',
+                        help="Rule pack name (in tools/rules) or path; repeatable (default: euler)")
+    parser.add_argument('--watch', action='store_true',
+                        help="Keep running and rescan files as they change (see precision_watch.py)")
+    parser.add_argument('--debounce', type=float, default=0.05, metavar='SECONDS',
+                        help="Quiet period before rescanning changed files in --watch mode")
+    parser.add_argument('--ref', action='append', metavar='REF',
+                        help="Scan a git ref instead of the working tree, without checkout; repeatable")
+    args = parser.parse_args()
+    verbose = args.verbose
+    rules = load_rules(args.rules or DEFAULT_RULE_PACKS)
     
     print("🌊 Wave Toolkit - Ecosystem Precision Scanner")
     print("Scanning for hardcoded Euler's number approximations...")
@@ -171,12 +256,19 @@ def main():
     if verbose:
         print(f"\nRepositories to scan: {', '.join(REPOS)}")
         print(f"File types: {', '.join(EXTENSIONS)}")
-        print(f"Patterns: {len(PATTERNS)}\n")
+        print(f"Rules: {len(rules)} from {', '.join(args.rules or DEFAULT_RULE_PACKS)}\n")
+    
+    if args.watch:
+        watch(rules, args.debounce, verbose)
+        return
     
     all_findings = []
-    for repo in REPOS:
-        findings = scan_repo(repo, PATTERNS, verbose)
-        all_findings.extend(findings)
+    if args.ref:
+        all_findings = scan_refs(REPOS, args.ref, rules, verbose)
+    else:
+        for repo in REPOS:
+            findings = scan_repo(repo, rules, verbose)
+            all_findings.extend(findings)
     
     print_report(all_findings, verbose)
     
@@ -0,0 +1,89 @@
+"""
+Wave Toolkit - Python components.
+
+Importable counterparts of the tooling in project-book.ipynb.
+
+Importing the package has no side effects and loads no submodules; the
+names below are resolved on first access (PEP 562), so
+``from wave_toolkit import get_wave_context`` only imports
+``wave_toolkit.context`` and what it needs.
+"""
+
+import importlib
+from typing import Any, Dict, List
+
+__version__ = "1.0.0"
+
+# Public name -> submodule that defines it
+_LAZY_NAMES: Dict[str, str] = {
+    # context
+    "WaveContext": "context",
+    "MachineContext": "context",
+    "UserContext": "context",
+    "ShellContext": "context",
+    "SessionContext": "context",
+    "ToolsContext": "context",
+    "get_wave_context": "context",
+    # prompt
+    "PromptRenderer": "prompt",
+    "generate_system_prompt": "prompt",
+    "render_system_prompts": "prompt",
+    # session
+    "WaveSession": "session",
+    "create_wave_session": "session",
+    "SessionIndex": "session_index",
+    "generate_session_summary": "summary",
+    "write_session_summary": "summary",
+    # ecosystem and frameworks
+    "EcosystemRepo": "ecosystem",
+    "RepoDiscovery": "ecosystem",
+    "discover_local_repos": "ecosystem",
+    "FrameworkAnalysis": "framework",
+    "FrameworkCache": "framework",
+    "analyze_framework": "framework",
+    "generate_ai_agents_template": "templates",
+    "generate_ecosystem_badge_header": "templates",
+    "generate_ecosystem_templates": "templates",
+    # logs
+    "LogSource": "logs",
+    "discover_log_sources": "logs",
+    "LogIngestor": "ingest",
+    "PerformanceLog": "perflog",
+    "load_performance_log": "perflog",
+    # storage
+    "SnapshotStore": "snapshots",
+    "SnapshotReader": "snapshots",
+    "HandoffStore": "handoffs",
+    "freeze": "compact",
+    "thaw": "compact",
+    # traces
+    "import_traces": "traces",
+    "iter_traces": "traces",
+    "summarize_traces": "trace_analytics",
+    "diff_traces": "trace_diff",
+    "dedupe_traces": "trace_diff",
+}
+
+_SUBMODULES = frozenset({
+    "compact", "context", "ecosystem", "framework", "gitindex", "handoffs",
+    "ingest", "jsonutil", "logs", "perf", "perflog", "prompt", "session",
+    "session_index", "snapshots", "summary", "templates", "trace_analytics", "trace_diff", "traces",
+})
+
+__all__: List[str] = sorted(_LAZY_NAMES)
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_NAMES.get(name)
+    if module_name is not None:
+        value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    elif name in _SUBMODULES:
+        value = importlib.import_module(f".{name}", __name__)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value  # Later lookups skip __getattr__
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY_NAMES) | _SUBMODULES)
@@ -0,0 +1,7 @@
+"""Allow ``python -m wave_toolkit``."""
+
+import sys
+
+from .cli import main
+
+sys.exit(main())
@@ -0,0 +1,363 @@
+"""
+Transparent decompression for trace files.
+
+``open_text`` sniffs the first bytes of a file and returns a UTF-8 text
+stream over its decompressed content, so callers never decompress to disk.
+gzip, bzip2 and xz use the standard library; zstd needs the optional
+``zstandard`` package.
+
+Archives made of independently compressed pieces are decompressed in
+parallel: zstd files with several frames (pzstd, the seekable format, or
+concatenated ``zstd`` outputs - multithreaded ``zstd -T`` still writes a
+single frame) and BGZF gzip files (bgzip). Frame boundaries are found
+from headers alone - zstd block headers carry their sizes and BGZF blocks
+record theirs in a gzip extra field - then batches of frames are inflated
+on a thread pool (zlib and zstd release the GIL) and handed to the reader
+in order. Batches are sized by decompressed bytes, which zstd frame
+headers and BGZF trailers record, and the decompressed bytes in flight
+are capped. A zstd frame too large for one batch, or whose header omits
+its size, is streamed in chunks once the reader reaches it. Other gzip
+files, including plain multi-member ones whose boundaries are only known
+after inflating, stream through a single decompressor.
+"""
+
+import bz2
+import gzip
+import io
+import lzma
+import mmap
+import os
+import struct
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - depends on the environment
+    zstandard = None
+
+GZIP_MAGIC = b"\x1f\x8b"
+BZIP2_MAGIC = b"BZh"
+XZ_MAGIC = b"\xfd7zXZ\x00"
+ZSTD_MAGIC = 0xFD2FB528
+ZSTD_SKIPPABLE_MASK = 0xFFFFFFF0
+ZSTD_SKIPPABLE_MAGIC = 0x184D2A50
+
+# Decompressor errors that mean the archive is damaged
+DECOMPRESS_ERRORS = (zlib.error,) + ((zstandard.ZstdError,) if zstandard is not None else ())
+
+# Decompressed bytes per batch handed to one worker
+BATCH_BYTES = 1 << 20
+
+# Decompressed bytes held by batches in flight (queued, running or unread)
+IN_FLIGHT_BYTES = 1 << 25
+
+# Chunk size when streaming a single large zstd frame
+STREAM_CHUNK_BYTES = 1 << 18
+
+Frame = Tuple[int, int]  # (start, end) byte offsets
+
+
+def detect_compression(path: str) -> Optional[str]:
+    """Return "gzip", "bzip2", "xz" or "zstd" from the magic bytes, or None for plain files."""
+    with open(path, "rb") as f:
+        head = f.read(6)
+    if head.startswith(GZIP_MAGIC):
+        return "gzip"
+    if head.startswith(BZIP2_MAGIC):
+        return "bzip2"
+    if head.startswith(XZ_MAGIC):
+        return "xz"
+    if len(head) >= 4:
+        magic = struct.unpack_from("<I", head)[0]
+        if magic == ZSTD_MAGIC or magic & ZSTD_SKIPPABLE_MASK == ZSTD_SKIPPABLE_MAGIC:
+            return "zstd"
+    return None
+
+
+def zstd_frames(data) -> List[Frame]:
+    """
+    Split a zstd file into its frames by walking frame and block headers.
+
+    Skippable frames (including a seekable-format seek table) are dropped.
+
+    Raises:
+        ValueError: If a header is invalid or a frame is truncated
+    """
+    frames = []
+    pos, size = 0, len(data)
+    while pos < size:
+        if pos + 8 > size:
+            raise ValueError(f"Truncated zstd frame at offset {pos}")
+        magic = struct.unpack_from("<I", data, pos)[0]
+        if magic & ZSTD_SKIPPABLE_MASK == ZSTD_SKIPPABLE_MAGIC:
+            pos += 8 + struct.unpack_from("<I", data, pos + 4)[0]
+            continue
+        if magic != ZSTD_MAGIC:
+            raise ValueError(f"Invalid zstd frame magic at offset {pos}")
+        start = pos
+        descriptor = data[pos + 4]
+        fcs_flag = descriptor >> 6
+        single_segment = descriptor >> 5 & 1
+        checksum = descriptor >> 2 & 1
+        pos += 5
+        pos += 0 if single_segment else 1  # Window descriptor
+        pos += (0, 1, 2, 4)[descriptor & 3]  # Dictionary id
+        pos += (1 if single_segment else 0, 2, 4, 8)[fcs_flag]  # Frame content size
+        while True:
+            if pos + 3 > size:
+                raise ValueError(f"Truncated zstd frame at offset {start}")
+            header = data[pos] | data[pos + 1] << 8 | data[pos + 2] << 16
+            last, block_type, block_size = header & 1, header >> 1 & 3, header >> 3
+            if block_type == 3:
+                raise ValueError(f"Reserved zstd block type at offset {pos}")
+            pos += 3 + (1 if block_type == 1 else block_size)  # RLE blocks store one byte
+            if last:
+                break
+        pos += 4 if checksum else 0
+        if pos > size:
+            raise ValueError(f"Truncated zstd frame at offset {start}")
+        frames.append((start, pos))
+    return frames
+
+
+def bgzf_blocks(data) -> Optional[List[Frame]]:
+    """Split a BGZF file into its gzip members, or None if it is not BGZF."""
+    blocks = []
+    pos, size = 0, len(data)
+    while pos < size:
+        # Fixed header: magic, CM=8, FLG with FEXTRA, then XLEN at offset 10
+        if pos + 12 > size or data[pos:pos + 3] != b"\x1f\x8b\x08" or not data[pos + 3] & 4:
+            return None
+        xlen = struct.unpack_from("<H", data, pos + 10)[0]
+        extra, extra_end = pos + 12, pos + 12 + xlen
+        block_size = None
+        while extra + 4 <= extra_end:
+            tag, length = data[extra:extra + 2], struct.unpack_from("<H", data, extra + 2)[0]
+            if tag == b"BC" and length == 2:
+                block_size = struct.unpack_from("<H", data, extra + 4)[0] + 1
+                break
+            extra += 4 + length
+        if block_size is None or pos + block_size > size:
+            return None
+        blocks.append((pos, pos + block_size))
+        pos += block_size
+    return blocks
+
+
+def zstd_content_size(data, frame: Frame) -> Optional[int]:
+    """Decompressed size recorded in a zstd frame header, or None if absent."""
+    start = frame[0]
+    size = zstandard.frame_content_size(data[start:min(start + 18, frame[1])])
+    return size if size >= 0 else None
+
+
+def bgzf_content_size(data, frame: Frame) -> int:
+    """Decompressed size of a BGZF block, from its gzip ISIZE trailer."""
+    return struct.unpack_from("<I", data, frame[1] - 4)[0]
+
+
+# A unit of work: (frames, decompressed bytes, streamed). Streamed units hold
+# one zstd frame that is decompressed in chunks instead of in one piece
+Batch = Tuple[List[Frame], int, bool]
+
+
+def _batches(frames: List[Frame], sizes: List[Optional[int]], streamable: bool) -> Iterator[Batch]:
+    batch: List[Frame] = []
+    batch_bytes = 0
+    for frame, size in zip(frames, sizes):
+        if streamable and (size is None or size > BATCH_BYTES):
+            if batch:
+                yield batch, batch_bytes, False
+                batch, batch_bytes = [], 0
+            yield [frame], STREAM_CHUNK_BYTES, True
+            continue
+        batch.append(frame)
+        batch_bytes += size
+        if batch_bytes >= BATCH_BYTES:
+            yield batch, batch_bytes, False
+            batch, batch_bytes = [], 0
+    if batch:
+        yield batch, batch_bytes, False
+
+
+def parallel_map(
+    func: Callable,
+    items: Iterable,
+    workers: int,
+    weight: Optional[Callable[[Any], int]] = None,
+    budget: Optional[int] = None,
+) -> Iterator:
+    """
+    ``map`` on a thread pool, yielding results in order.
+
+    At most 2 * workers items are in flight; with ``weight`` and ``budget``,
+    also at most ``budget`` total weight (but always at least one item).
+    """
+    if workers <= 1:
+        yield from map(func, items)
+        return
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending: deque = deque()
+        in_flight = 0
+        for item in items:
+            cost = weight(item) if weight is not None else 0
+            while pending and (
+                len(pending) >= 2 * workers or budget is not None and in_flight + cost > budget
+            ):
+                future, done_cost = pending.popleft()
+                in_flight -= done_cost
+                yield future.result()
+            pending.append((pool.submit(func, item), cost))
+            in_flight += cost
+        while pending:
+            yield pending.popleft()[0].result()
+
+
+class _ChunkStream(io.RawIOBase):
+    """Readable raw stream over an iterator of byte chunks."""
+
+    def __init__(self, chunks: Iterator[bytes], on_close: Callable[[], None]):
+        self._chunks = chunks
+        self._on_close = on_close
+        self._buf = memoryview(b"")
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, b) -> int:
+        while self._pos >= len(self._buf):
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return 0
+            self._buf, self._pos = memoryview(chunk), 0  # Chunks may be empty (BGZF EOF block)
+        n = min(len(b), len(self._buf) - self._pos)
+        b[:n] = self._buf[self._pos:self._pos + n]
+        self._pos += n
+        return n
+
+    def close(self):
+        if not self.closed:
+            self._chunks.close()
+            self._on_close()
+        super().close()
+
+
+def _zstd_batch(data, batch: List[Frame]) -> bytes:
+    dctx = zstandard.ZstdDecompressor()
+    return b"".join(dctx.decompressobj().decompress(data[start:end]) for start, end in batch)
+
+
+class _Slice:
+    """File-like view of ``length`` bytes of an open file from its current position."""
+
+    def __init__(self, f, length: int):
+        self._f = f
+        self._remaining = length
+
+    def read(self, size: int = -1) -> bytes:
+        size = self._remaining if size < 0 else min(size, self._remaining)
+        data = self._f.read(size)
+        self._remaining -= len(data)
+        return data
+
+
+def _zstd_stream(path: str, frame: Frame) -> Iterator[bytes]:
+    """Decompress one zstd frame in STREAM_CHUNK_BYTES pieces."""
+    with open(path, "rb") as f:
+        f.seek(frame[0])
+        # Bound the source: the reader would otherwise carry on into the next frame
+        reader = zstandard.ZstdDecompressor().stream_reader(_Slice(f, frame[1] - frame[0]))
+        while True:
+            chunk = reader.read(STREAM_CHUNK_BYTES)
+            if not chunk:
+                return
+            yield chunk
+
+
+def _gzip_batch(data, batch: List[Frame]) -> bytes:
+    return b"".join(zlib.decompress(data[start:end], wbits=31) for start, end in batch)
+
+
+def _parallel_chunks(path: str, data, kind: str, frames: List[Frame], workers: int) -> Iterator[bytes]:
+    if kind == "zstd":
+        sizes = [zstd_content_size(data, frame) for frame in frames]
+    else:
+        sizes = [bgzf_content_size(data, frame) for frame in frames]  # At most 64 KiB each
+
+    def run(batch: Batch):
+        batch_frames, _size, streamed = batch
+        if streamed:
+            return _zstd_stream(path, batch_frames[0])  # Runs lazily, as the reader consumes it
+        return _zstd_batch(data, batch_frames) if kind == "zstd" else _gzip_batch(data, batch_frames)
+
+    batches = _batches(frames, sizes, streamable=kind == "zstd")
+    try:
+        for result in parallel_map(run, batches, workers, weight=lambda batch: batch[1], budget=IN_FLIGHT_BYTES):
+            if isinstance(result, bytes):
+                yield result
+            else:
+                yield from result
+    except DECOMPRESS_ERRORS as e:
+        raise ValueError(f"Corrupt compressed trace file {path}: {e}") from e
+
+
+def _open_framed(path: str, kind: str, workers: int) -> Optional[TextIO]:
+    """Parallel reader for multi-frame zstd and BGZF files, or None if the file has one frame."""
+    f = open(path, "rb")
+    try:
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except ValueError:  # Empty file
+        f.close()
+        return None
+
+    def close():
+        data.close()
+        f.close()
+
+    try:
+        frames = zstd_frames(data) if kind == "zstd" else bgzf_blocks(data)
+    except ValueError as e:
+        close()
+        raise ValueError(f"Corrupt compressed trace file {path}: {e}") from e
+    if not frames or len(frames) < 2:
+        close()
+        return None
+
+    raw = _ChunkStream(_parallel_chunks(path, data, kind, frames, workers), close)
+    return io.TextIOWrapper(io.BufferedReader(raw, buffer_size=1 << 16), encoding="utf-8")
+
+
+def open_text(path: str, workers: Optional[int] = None) -> TextIO:
+    """
+    Open a possibly compressed file as UTF-8 text.
+
+    Args:
+        path: File path; compression is detected from content, not the suffix
+        workers: Decompression threads for multi-frame archives (default: CPU count)
+
+    Raises:
+        ValueError: For zstd files when ``zstandard`` is not installed, or a
+            damaged multi-frame archive
+    """
+    kind = detect_compression(path)
+    if kind is None:
+        return open(path, "r", encoding="utf-8")
+    workers = workers or os.cpu_count() or 1
+    if kind == "zstd" and zstandard is None:
+        raise ValueError(f"{path} is zstd-compressed; install the 'zstandard' package to read it")
+    if kind in ("zstd", "gzip"):
+        stream = _open_framed(path, kind, workers)
+        if stream is not None:
+            return stream
+    if kind == "gzip":
+        return gzip.open(path, "rt", encoding="utf-8")
+    if kind == "bzip2":
+        return bz2.open(path, "rt", encoding="utf-8")
+    if kind == "xz":
+        return lzma.open(path, "rt", encoding="utf-8")
+    reader = zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True, read_across_frames=True)
+    return io.TextIOWrapper(reader, encoding="utf-8")
@@ -0,0 +1,216 @@
+"""
+Incremental JSON reading helpers.
+
+The standard library only parses whole documents. These helpers walk a
+top-level JSON array or object from a text stream chunk by chunk, decoding
+one value at a time, so arbitrarily large files are read in constant memory
+(bounded by the size of the largest single value).
+"""
+
+import json
+import re
+from typing import Any, Iterable, Iterator, TextIO, Tuple
+
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_LINE_WHITESPACE = re.compile(r"[ \t\r]*")
+_NUMBER_TAIL = ".eE+-"
+
+
+class JSONStreamReader:
+    """Pull-style reader that decodes one JSON value at a time from a stream."""
+
+    def __init__(self, fp: TextIO, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self._fp = fp
+        self._chunk_size = chunk_size
+        self._decoder = json.JSONDecoder()
+        self._buf = ""
+        self._pos = 0
+        self._offset = 0  # Absolute character offset of self._buf[0]
+        self._eof = False
+
+    def _fill(self, size: int) -> bool:
+        """Read more data into the buffer. Returns False at end of input."""
+        if self._eof:
+            return False
+        if self._pos:
+            # Drop consumed text so the buffer never grows past one value
+            self._offset += self._pos
+            self._buf = self._buf[self._pos:]
+            self._pos = 0
+        data = self._fp.read(size)
+        if not data:
+            self._eof = True
+            return False
+        self._buf += data
+        return True
+
+    def _skip_ws(self) -> None:
+        while True:
+            self._pos = _WHITESPACE.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf) or not self._fill(self._chunk_size):
+                return
+
+    def _error(self, msg: str) -> json.JSONDecodeError:
+        return json.JSONDecodeError(msg, self._buf, self._pos)
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character ('' at end of input)."""
+        self._skip_ws()
+        return self._buf[self._pos] if self._pos < len(self._buf) else ""
+
+    def expect(self, char: str) -> None:
+        """Consume ``char`` or raise JSONDecodeError."""
+        if self.peek() != char:
+            raise self._error(
+                f"Expected {char!r} at offset {self._offset + self._pos}"
+            )
+        self._pos += 1
+
+    def value(self) -> Any:
+        """Decode and return the next complete JSON value."""
+        buf = self._buf
+        pos = _WHITESPACE.match(buf, self._pos).end()
+        if pos < len(buf):
+            # Fast path: the value is entirely inside the buffer
+            try:
+                obj, end = self._decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                pass
+            else:
+                if end < len(buf) and not (
+                    type(obj) in (int, float) and buf[end] in _NUMBER_TAIL
+                ):
+                    self._pos = end
+                    return obj
+        self._pos = pos
+        return self._value_slow()
+
+    def _value_slow(self) -> Any:
+        self._skip_ws()
+        size = self._chunk_size
+        while True:
+            try:
+                obj, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                if self._fill(size):
+                    size *= 2  # Large values: grow reads to stay linear
+                    continue
+                raise
+            # A value ending at the buffer edge may be a truncated number
+            # ("12" of "123", "12" of "12.5"); confirm with more input.
+            if (end == len(self._buf) or (
+                type(obj) in (int, float) and self._buf[end] in _NUMBER_TAIL
+            )) and self._fill(size):
+                continue
+            self._pos = end
+            return obj
+
+    def items(self) -> Iterator[Any]:
+        """Yield the elements of an array whose ``[`` was just consumed."""
+        if self.peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield self.value()
+            buf = self._buf
+            pos = _WHITESPACE.match(buf, self._pos).end()
+            if pos < len(buf):
+                char = buf[pos]
+                self._pos = pos
+            else:
+                self._pos = pos
+                char = self.peek()
+            if char == ",":
+                self._pos += 1
+            elif char == "]":
+                self._pos += 1
+                return
+            else:
+                raise self._error(
+                    f"Expected ',' or ']' at offset {self._offset + self._pos}"
+                )
+
+    def at_end(self) -> bool:
+        """True if only whitespace remains."""
+        return self.peek() == ""
+
+
+def iter_array(fp: TextIO, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Any]:
+    """
+    Yield the elements of a top-level JSON array one at a time.
+
+    Args:
+        fp: Text stream positioned at the start of the document
+        chunk_size: Characters read per refill
+
+    Raises:
+        json.JSONDecodeError: If the stream is not a well-formed array
+    """
+    reader = JSONStreamReader(fp, chunk_size)
+    reader.expect("[")
+    yield from reader.items()
+
+
+def iter_object(
+    fp: TextIO,
+    stream_keys: Iterable[str] = (),
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[Tuple[str, str, Any]]:
+    """
+    Walk a top-level JSON object as a sequence of events.
+
+    Yields ``("value", key, value)`` for each member. Members whose key is in
+    ``stream_keys`` and whose value is an array are instead yielded element by
+    element as ``("item", key, element)``, so only one element is in memory.
+
+    Raises:
+        json.JSONDecodeError: If the stream is not a well-formed object
+    """
+    stream_keys = frozenset(stream_keys)
+    reader = JSONStreamReader(fp, chunk_size)
+    reader.expect("{")
+    if reader.peek() == "}":
+        reader.expect("}")
+        return
+    while True:
+        key = reader.value()
+        if not isinstance(key, str):
+            raise reader._error(f"Object keys must be strings, got {type(key).__name__}")
+        reader.expect(":")
+        if key in stream_keys and reader.peek() == "[":
+            reader.expect("[")
+            for item in reader.items():
+                yield ("item", key, item)
+        else:
+            yield ("value", key, reader.value())
+        if reader.peek() == ",":
+            reader.expect(",")
+            continue
+        reader.expect("}")
+        return
+
+
+def iter_json_lines(text: str) -> Iterator[Any]:
+    """
+    Decode a JSON Lines string in place: one value per line, blank lines
+    ignored. Values spanning lines or sharing a line are rejected.
+
+    Raises:
+        json.JSONDecodeError: If a line is not exactly one JSON value
+    """
+    decode = json.JSONDecoder().raw_decode
+    end = len(text)
+    pos = _WHITESPACE.match(text, 0).end()
+    while pos < end:
+        line_end = text.find("\n", pos)
+        line_end = end if line_end < 0 else line_end
+        value, value_end = decode(text, pos)
+        if value_end > line_end:
+            raise json.JSONDecodeError("Value spans several lines", text, pos)
+        rest = _LINE_WHITESPACE.match(text, value_end).end()
+        if rest < line_end:
+            raise json.JSONDecodeError("Extra data on line", text, rest)
+        yield value
+        pos = _WHITESPACE.match(text, line_end).end()
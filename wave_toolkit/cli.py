@@ -0,0 +1,178 @@
+"""
+``wave`` command line interface.
+
+Each command imports only the submodules it needs, so ``wave context
+--json`` does not pay for NumPy, SQLite or the rest of the toolkit.
+
+Usage:
+    wave context [--json] [--compact]
+    wave prompt
+    wave analyze PATH [--source walk|git] [--json]
+    wave traces FILE [--json] [--head N | --sample N [--seed S] [--seek]]
+    wave diff OLD NEW [--json]
+    wave dedupe FILE
+"""
+
+import argparse
+import json
+import sys
+from typing import List, Optional
+
+
+def _cmd_context(args: argparse.Namespace) -> int:
+    from .context import get_wave_context
+
+    ctx = get_wave_context()
+    if args.json:
+        print(ctx.to_json(compact=args.compact))
+        return 0
+    print("📍 Wave Context")
+    print(f"  Machine: {ctx.machine.name} ({ctx.machine.arch})")
+    print(f"  OS: {ctx.machine.os}")
+    print(f"  User: {ctx.user.name}")
+    print(f"  CWD: {ctx.session.cwd}")
+    if ctx.session.is_git_repo:
+        print(f"  Git Branch: {ctx.session.git_branch}")
+    tools = [name for name, available in ctx.tools.to_dict().items() if available]
+    print(f"  Tools: {', '.join(tools) or 'none'}")
+    return 0
+
+
+def _cmd_prompt(args: argparse.Namespace) -> int:
+    from .context import get_wave_context
+    from .prompt import generate_system_prompt
+
+    print(generate_system_prompt(get_wave_context()))
+    return 0
+
+
+def _cmd_analyze(args: argparse.Namespace) -> int:
+    from .framework import analyze_framework
+
+    analysis = analyze_framework(args.path, source=args.source)
+    if analysis is None:
+        print(f"Path not found: {args.path}", file=sys.stderr)
+        return 1
+    if args.json:
+        from dataclasses import asdict
+
+        from .jsonutil import dumps
+
+        print(dumps(asdict(analysis)))
+        return 0
+    print(f"📊 {analysis.name}: {analysis.file_count} files")
+    for lang, count in sorted(analysis.languages.items(), key=lambda item: -item[1])[:10]:
+        print(f"  {lang}: {count}")
+    return 0
+
+
+def _cmd_traces(args: argparse.Namespace) -> int:
+    from .traces import import_traces
+
+    try:
+        traces = import_traces(args.file, head=args.head, sample=args.sample, seed=args.seed, seek=args.seek)
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    if args.json:
+        from .jsonutil import dumps
+
+        print(dumps(traces))
+        return 0
+    states = {}
+    for trace in traces:
+        states[str(trace["state"])] = states.get(str(trace["state"]), 0) + 1
+    sampled = " (sample)" if args.head is not None or args.sample is not None else ""
+    print(f"✅ {len(traces)} traces{sampled}")
+    for state, count in sorted(states.items()):
+        print(f"  {state}: {count}")
+    return 0
+
+
+def _cmd_diff(args: argparse.Namespace) -> int:
+    from .trace_diff import diff_traces
+
+    counts = {"added": 0, "removed": 0, "changed": 0}
+    marks = {"added": "+", "removed": "-", "changed": "~"}
+    try:
+        for change in diff_traces(args.old, args.new, skip_invalid=args.skip_invalid):
+            counts[change.kind] += 1
+            if args.json:
+                print(json.dumps(change.to_dict()))
+            else:
+                print(f"{marks[change.kind]} {change.trace_id}")
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    if not args.json:
+        print(f"{counts['added']} added, {counts['removed']} removed, {counts['changed']} changed", file=sys.stderr)
+    return 0
+
+
+def _cmd_dedupe(args: argparse.Namespace) -> int:
+    from .trace_diff import dedupe_traces
+
+    try:
+        for trace in dedupe_traces(args.file, skip_invalid=args.skip_invalid):
+            print(json.dumps(trace, ensure_ascii=False, separators=(",", ":")))
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Argument parser for the ``wave`` command."""
+    from . import __version__
+
+    parser = argparse.ArgumentParser(prog="wave", description="Wave Toolkit command line")
+    parser.add_argument("--version", action="version", version=f"%(prog)s {__version__}")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    context = commands.add_parser("context", help="Capture the current Wave context")
+    context.add_argument("--json", action="store_true", help="Print the context as JSON")
+    context.add_argument("--compact", action="store_true", help="With --json, omit whitespace")
+    context.set_defaults(func=_cmd_context)
+
+    prompt = commands.add_parser("prompt", help="Print the system prompt for the current context")
+    prompt.set_defaults(func=_cmd_prompt)
+
+    analyze = commands.add_parser("analyze", help="Analyze a repository's structure")
+    analyze.add_argument("path", help="Repository path")
+    analyze.add_argument("--source", choices=("walk", "git"), default="walk",
+                         help="Scan the working tree or the git index")
+    analyze.add_argument("--json", action="store_true", help="Print the analysis as JSON")
+    analyze.set_defaults(func=_cmd_analyze)
+
+    traces = commands.add_parser("traces", help="Validate and summarize a trace file")
+    traces.add_argument("file", help="Trace JSON file")
+    traces.add_argument("--json", action="store_true", help="Print the validated traces as JSON")
+    traces.add_argument("--head", type=int, help="Only read the first N traces")
+    traces.add_argument("--sample", type=int, help="Read a uniform random sample of N traces")
+    traces.add_argument("--seed", type=int, help="Random seed for --sample")
+    traces.add_argument("--seek", action="store_true",
+                        help="With --sample, seek to random offsets of a JSON Lines file instead of reading it all")
+    traces.set_defaults(func=_cmd_traces)
+
+    diff = commands.add_parser("diff", help="List traces added, removed or changed between two trace files")
+    diff.add_argument("old", help="Old trace file")
+    diff.add_argument("new", help="New trace file")
+    diff.add_argument("--json", action="store_true", help="Print one JSON object per change")
+    diff.add_argument("--skip-invalid", action="store_true", help="Ignore invalid records")
+    diff.set_defaults(func=_cmd_diff)
+
+    dedupe = commands.add_parser("dedupe", help="Print a trace file as JSON Lines without repeated trace_ids")
+    dedupe.add_argument("file", help="Trace file")
+    dedupe.add_argument("--skip-invalid", action="store_true", help="Ignore invalid records")
+    dedupe.set_defaults(func=_cmd_dedupe)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Entry point of the ``wave`` console script."""
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,308 @@
+"""
+Compact, immutable model variants for bulk in-memory analytics.
+
+The regular models (``WaveContext`` and its parts, ``EcosystemRepo``,
+``LogSource``, ``FrameworkAnalysis``) are slotted, mutable dataclasses.
+This module adds frozen, hashable counterparts and an ``Interner`` that
+keeps one canonical instance per distinct value, so a machine, user or
+tool set that appears in many snapshots is stored once and shared.
+
+Example:
+    >>> interner = Interner()
+    >>> snapshots = [freeze(ctx, interner) for ctx in contexts]
+    >>> snapshots[0].machine is snapshots[1].machine  # same machine
+    True
+"""
+
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Optional, Tuple, TypeVar
+
+from .context import (
+    MachineContext,
+    SessionContext,
+    ShellContext,
+    ToolsContext,
+    UserContext,
+    WaveContext,
+)
+from .ecosystem import EcosystemRepo
+from .framework import FrameworkAnalysis
+from .logs import LogSource
+
+T = TypeVar("T", bound=Hashable)
+
+# Canonical instances kept by the shared default pool
+DEFAULT_POOL_SIZE = 4096
+
+
+class Interner:
+    """
+    Pool of canonical instances for hashable values.
+
+    Equal values passed to ``intern`` come back as the same object. The
+    pool holds strong references; with ``maxsize`` set, the least recently
+    used instances are dropped beyond that many, otherwise call ``clear``
+    to release them.
+    """
+
+    def __init__(self, maxsize: Optional[int] = None):
+        self.maxsize = maxsize
+        self._pool: "OrderedDict[Any, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+
+    def intern(self, value: T) -> T:
+        """Return the canonical instance equal to ``value``."""
+        with self._lock:
+            canonical = self._pool.setdefault(value, value)
+            if canonical is not value:
+                self.hits += 1
+            if self.maxsize is not None:
+                self._pool.move_to_end(value)
+                if len(self._pool) > self.maxsize:
+                    self._pool.popitem(last=False)
+            return canonical
+
+    def __len__(self) -> int:
+        return len(self._pool)
+
+    def clear(self):
+        """Drop all canonical instances."""
+        with self._lock:
+            self._pool.clear()
+            self.hits = 0
+
+
+# Shared pool used when no interner is given; bounded so it cannot grow forever
+default_interner = Interner(maxsize=DEFAULT_POOL_SIZE)
+
+
+def _str(value: Any) -> Any:
+    return sys.intern(value) if type(value) is str else value
+
+
+@dataclass(frozen=True, slots=True)
+class FrozenMachineContext:
+    """Immutable MachineContext."""
+    name: str
+    arch: str
+    os: str
+    cores: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"name": self.name, "arch": self.arch, "os": self.os, "cores": self.cores}
+
+
+@dataclass(frozen=True, slots=True)
+class FrozenUserContext:
+    """Immutable UserContext."""
+    name: str
+    home: str
+    domain: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"name": self.name, "home": self.home, "domain": self.domain}
+
+
+@dataclass(frozen=True, slots=True)
+class FrozenShellContext:
+    """Immutable ShellContext."""
+    name: str
+    version: str
+    environment: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"name": self.name, "version": self.version, "environment": self.environment}
+
+
+@dataclass(frozen=True, slots=True)
+class FrozenSessionContext:
+    """Immutable SessionContext."""
+    cwd: str
+    is_git_repo: bool
+    git_branch: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"cwd": self.cwd, "is_git_repo": self.is_git_repo, "git_branch": self.git_branch}
+
+
+@dataclass(frozen=True, slots=True)
+class FrozenToolsContext:
+    """Immutable ToolsContext."""
+    git: bool
+    node: bool
+    python: bool
+    docker: bool
+    claude: bool
+    jupyter: bool
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "git": self.git,
+            "node": self.node,
+            "python": self.python,
+            "docker": self.docker,
+            "claude": self.claude,
+            "jupyter": self.jupyter,
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class FrozenWaveContext:
+    """Immutable WaveContext whose parts are shared through an Interner."""
+    timestamp: str
+    machine: FrozenMachineContext
+    user: FrozenUserContext
+    shell: FrozenShellContext
+    session: FrozenSessionContext
+    tools: FrozenToolsContext
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "timestamp": self.timestamp,
+            "machine": self.machine.to_dict(),
+            "user": self.user.to_dict(),
+            "shell": self.shell.to_dict(),
+            "session": self.session.to_dict(),
+            "tools": self.tools.to_dict(),
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class FrozenEcosystemRepo:
+    """Immutable EcosystemRepo."""
+    name: str
+    github_url: str
+    purpose: str
+    version: str
+    local_path: Optional[str] = None
+    is_available: bool = False
+
+
+@dataclass(frozen=True, slots=True)
+class FrozenLogSource:
+    """Immutable LogSource."""
+    path: str
+    source: str
+    repo: str
+    kind: str
+    exists: bool = False
+
+
+@dataclass(frozen=True, slots=True)
+class FrozenFrameworkAnalysis:
+    """Immutable FrameworkAnalysis; mappings are stored as tuples of pairs."""
+    path: str
+    name: str
+    file_count: int
+    languages: Tuple[Tuple[str, int], ...]
+    structure: Tuple[Tuple[str, Tuple[str, ...]], ...]
+    has_tests: bool
+    has_docs: bool
+    has_ai_agents_config: bool
+
+
+def freeze_context(ctx: WaveContext, interner: Optional[Interner] = None) -> FrozenWaveContext:
+    """Convert a WaveContext, sharing identical parts through ``interner``."""
+    return FrozenWaveContext(
+        timestamp=ctx.timestamp,
+        machine=freeze(ctx.machine, interner),
+        user=freeze(ctx.user, interner),
+        shell=freeze(ctx.shell, interner),
+        session=freeze(ctx.session, interner),
+        tools=freeze(ctx.tools, interner),
+    )
+
+
+def freeze(obj: Any, interner: Optional[Interner] = None) -> Any:
+    """
+    Convert a model instance to its frozen, interned counterpart.
+
+    Args:
+        obj: WaveContext, one of its parts, EcosystemRepo, LogSource or
+            FrameworkAnalysis
+        interner: Pool to share identical values through (default: a
+            module-level pool)
+
+    Raises:
+        TypeError: If obj is not a supported model
+    """
+    if isinstance(obj, WaveContext):
+        return freeze_context(obj, interner)
+    pool = (interner if interner is not None else default_interner).intern
+    if isinstance(obj, MachineContext):
+        return pool(FrozenMachineContext(_str(obj.name), _str(obj.arch), _str(obj.os), obj.cores))
+    if isinstance(obj, UserContext):
+        return pool(FrozenUserContext(_str(obj.name), _str(obj.home), _str(obj.domain)))
+    if isinstance(obj, ShellContext):
+        return pool(FrozenShellContext(_str(obj.name), _str(obj.version), _str(obj.environment)))
+    if isinstance(obj, SessionContext):
+        return pool(FrozenSessionContext(_str(obj.cwd), obj.is_git_repo, _str(obj.git_branch)))
+    if isinstance(obj, ToolsContext):
+        return pool(FrozenToolsContext(obj.git, obj.node, obj.python, obj.docker, obj.claude, obj.jupyter))
+    if isinstance(obj, EcosystemRepo):
+        return pool(FrozenEcosystemRepo(
+            _str(obj.name), _str(obj.github_url), _str(obj.purpose), _str(obj.version),
+            _str(obj.local_path), obj.is_available,
+        ))
+    if isinstance(obj, LogSource):
+        return pool(FrozenLogSource(_str(obj.path), _str(obj.source), _str(obj.repo), _str(obj.kind), obj.exists))
+    if isinstance(obj, FrameworkAnalysis):
+        return pool(FrozenFrameworkAnalysis(
+            path=_str(obj.path),
+            name=_str(obj.name),
+            file_count=obj.file_count,
+            languages=tuple((_str(lang), count) for lang, count in obj.languages.items()),
+            structure=tuple((_str(d), tuple(files)) for d, files in obj.structure.items()),
+            has_tests=obj.has_tests,
+            has_docs=obj.has_docs,
+            has_ai_agents_config=obj.has_ai_agents_config,
+        ))
+    raise TypeError(f"Cannot freeze {type(obj).__name__}")
+
+
+def thaw(obj: Any) -> Any:
+    """
+    Convert a frozen model back to a regular (mutable) instance.
+
+    Raises:
+        TypeError: If obj is not a frozen model
+    """
+    if isinstance(obj, FrozenWaveContext):
+        return WaveContext(
+            timestamp=obj.timestamp,
+            machine=thaw(obj.machine),
+            user=thaw(obj.user),
+            shell=thaw(obj.shell),
+            session=thaw(obj.session),
+            tools=thaw(obj.tools),
+        )
+    if isinstance(obj, FrozenFrameworkAnalysis):
+        return FrameworkAnalysis(
+            path=obj.path,
+            name=obj.name,
+            file_count=obj.file_count,
+            languages=dict(obj.languages),
+            structure={d: list(files) for d, files in obj.structure},
+            has_tests=obj.has_tests,
+            has_docs=obj.has_docs,
+            has_ai_agents_config=obj.has_ai_agents_config,
+        )
+    target = _THAWED.get(type(obj))
+    if target is None:
+        raise TypeError(f"Cannot thaw {type(obj).__name__}")
+    return target(*(getattr(obj, name) for name in obj.__slots__))
+
+
+_THAWED = {
+    FrozenMachineContext: MachineContext,
+    FrozenUserContext: UserContext,
+    FrozenShellContext: ShellContext,
+    FrozenSessionContext: SessionContext,
+    FrozenToolsContext: ToolsContext,
+    FrozenEcosystemRepo: EcosystemRepo,
+    FrozenLogSource: LogSource,
+}
@@ -0,0 +1,192 @@
+"""
+Wave context capture.
+
+The environment context model and ``get_wave_context`` from
+project-book.ipynb - the Python equivalent of ``Get-WaveContext.ps1``.
+``to_dict`` is written out by hand instead of using ``dataclasses.asdict``
+(which deep-copies recursively through reflection), and ``to_json`` has a
+compact mode and uses orjson when it is installed.
+"""
+
+import os
+import platform
+import shutil
+import subprocess
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from . import perf
+from .jsonutil import dumps
+
+
+@dataclass(slots=True)
+class MachineContext:
+    """Machine identity information."""
+    name: str
+    arch: str
+    os: str
+    cores: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"name": self.name, "arch": self.arch, "os": self.os, "cores": self.cores}
+
+
+@dataclass(slots=True)
+class UserContext:
+    """User context information."""
+    name: str
+    home: str
+    domain: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"name": self.name, "home": self.home, "domain": self.domain}
+
+
+@dataclass(slots=True)
+class ShellContext:
+    """Shell environment information."""
+    name: str
+    version: str
+    environment: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"name": self.name, "version": self.version, "environment": self.environment}
+
+
+@dataclass(slots=True)
+class SessionContext:
+    """Current working session context."""
+    cwd: str
+    is_git_repo: bool
+    git_branch: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"cwd": self.cwd, "is_git_repo": self.is_git_repo, "git_branch": self.git_branch}
+
+
+@dataclass(slots=True)
+class ToolsContext:
+    """Available tools detection."""
+    git: bool
+    node: bool
+    python: bool
+    docker: bool
+    claude: bool
+    jupyter: bool
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "git": self.git,
+            "node": self.node,
+            "python": self.python,
+            "docker": self.docker,
+            "claude": self.claude,
+            "jupyter": self.jupyter,
+        }
+
+
+@dataclass(slots=True)
+class WaveContext:
+    """Complete Wave environment context."""
+    timestamp: str
+    machine: MachineContext
+    user: UserContext
+    shell: ShellContext
+    session: SessionContext
+    tools: ToolsContext
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for JSON serialization."""
+        return {
+            "timestamp": self.timestamp,
+            "machine": self.machine.to_dict(),
+            "user": self.user.to_dict(),
+            "shell": self.shell.to_dict(),
+            "session": self.session.to_dict(),
+            "tools": self.tools.to_dict(),
+        }
+
+    def to_json(self, indent: int = 2, compact: bool = False) -> str:
+        """Convert to JSON string (``compact`` drops all whitespace)."""
+        return dumps(self.to_dict(), indent=indent, compact=compact)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "WaveContext":
+        """Rebuild a context from ``to_dict`` output."""
+        return cls(
+            timestamp=data["timestamp"],
+            machine=MachineContext(**data["machine"]),
+            user=UserContext(**data["user"]),
+            shell=ShellContext(**data["shell"]),
+            session=SessionContext(**data["session"]),
+            tools=ToolsContext(**data["tools"]),
+        )
+
+
+def check_command_exists(cmd: str) -> bool:
+    """Check if a command exists in the system PATH."""
+    return shutil.which(cmd) is not None
+
+
+@perf.profiled("context.get_git_branch")
+def get_git_branch() -> Optional[str]:
+    """Get current git branch if in a git repository."""
+    try:
+        result = subprocess.run(
+            ["git", "branch", "--show-current"],
+            capture_output=True,
+            text=True,
+            timeout=5
+        )
+        if result.returncode == 0:
+            return result.stdout.strip() or None
+    except (subprocess.TimeoutExpired, FileNotFoundError, subprocess.SubprocessError):
+        pass
+    return None
+
+
+def is_git_repo(path: str = ".") -> bool:
+    """Check if the given path is inside a git repository."""
+    return Path(path, ".git").exists() or Path(path).joinpath(".git").exists()
+
+
+@perf.profiled("context.get_wave_context")
+def get_wave_context() -> WaveContext:
+    """Capture the current Wave environment context."""
+    cwd = os.getcwd()
+    is_repo = is_git_repo(cwd)
+
+    return WaveContext(
+        timestamp=datetime.now().isoformat(),
+        machine=MachineContext(
+            name=platform.node(),
+            arch=platform.machine(),
+            os=f"{platform.system()} {platform.release()}",
+            cores=os.cpu_count() or 1
+        ),
+        user=UserContext(
+            name=os.getenv("USER") or os.getenv("USERNAME") or "unknown",
+            home=str(Path.home()),
+            domain=os.getenv("USERDOMAIN")
+        ),
+        shell=ShellContext(
+            name="Python/Jupyter",
+            version=platform.python_version(),
+            environment="notebook"
+        ),
+        session=SessionContext(
+            cwd=cwd,
+            is_git_repo=is_repo,
+            git_branch=get_git_branch() if is_repo else None
+        ),
+        tools=ToolsContext(
+            git=check_command_exists("git"),
+            node=check_command_exists("node"),
+            python=check_command_exists("python") or check_command_exists("python3"),
+            docker=check_command_exists("docker"),
+            claude=check_command_exists("claude"),
+            jupyter=check_command_exists("jupyter")
+        )
+    )
@@ -0,0 +1,268 @@
+"""
+Ecosystem repository discovery.
+
+Defines the SpiralSafe ecosystem repositories and finds local checkouts, as
+in project-book.ipynb. ``RepoDiscovery`` adds concurrent probing of search
+paths, a persistent cache of each repository's last known location (only
+that path is re-validated on later calls) and an optional bounded-depth
+search for checkouts nested below the search paths.
+"""
+
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+DEFAULT_LOCATION_CACHE = ".claude/cache/ecosystem_repos.json"
+
+# Directory names never descended into by the bounded-depth search
+_SEARCH_SKIP_DIRS = frozenset({"node_modules", "__pycache__", "venv", "AppData", "Library"})
+
+
+@dataclass(slots=True)
+class EcosystemRepo:
+    """Represents a SpiralSafe ecosystem repository."""
+    name: str
+    github_url: str
+    purpose: str
+    version: str
+    local_path: Optional[str] = None
+    is_available: bool = False
+
+
+# Define the SpiralSafe ecosystem
+ECOSYSTEM_REPOS = [
+    EcosystemRepo(
+        name="SpiralSafe",
+        github_url="https://github.com/toolate28/SpiralSafe",
+        purpose="Documentation hub, coherence engine core",
+        version="v2.1.0"
+    ),
+    EcosystemRepo(
+        name="wave-toolkit",
+        github_url="https://github.com/toolate28/wave-toolkit",
+        purpose="Coherence detection tools",
+        version="v1.0.0"
+    ),
+    EcosystemRepo(
+        name="ClaudeNPC-Server-Suite",
+        github_url="https://github.com/toolate28/ClaudeNPC-Server-Suite",
+        purpose="AI NPCs for Minecraft (HOPE NPCs)",
+        version="v2.1.0"
+    ),
+    EcosystemRepo(
+        name="kenl",
+        github_url="https://github.com/toolate28/kenl",
+        purpose="Infrastructure-aware AI orchestration",
+        version="v1.0.0"
+    ),
+    EcosystemRepo(
+        name="quantum-redstone",
+        github_url="https://github.com/toolate28/quantum-redstone",
+        purpose="Quantum computing education via Redstone",
+        version="Available"
+    )
+]
+
+
+def default_search_paths() -> List[str]:
+    """Default locations searched for local checkouts."""
+    home = Path.home()
+    return [
+        str(home),
+        str(home / "repos"),
+        str(home / "projects"),
+        str(Path.cwd()),
+        str(Path.cwd().parent)
+    ]
+
+
+def is_repo_checkout(path: str) -> bool:
+    """Check if a path is a git checkout (has a .git directory or file)."""
+    return os.path.exists(os.path.join(path, ".git"))
+
+
+def _copy(repo: EcosystemRepo, local_path: Optional[str] = None) -> EcosystemRepo:
+    return replace(repo, local_path=local_path, is_available=local_path is not None)
+
+
+def _probe_all(
+    names: Sequence[str],
+    search_paths: Sequence[str],
+    pool: ThreadPoolExecutor,
+) -> Dict[str, str]:
+    """Probe every (search path, repo) pair concurrently; first path wins."""
+    futures = {
+        (name, search_path): pool.submit(is_repo_checkout, os.path.join(search_path, name))
+        for name in names
+        for search_path in search_paths
+    }
+    found: Dict[str, str] = {}
+    for name in names:
+        for search_path in search_paths:
+            if futures[(name, search_path)].result():
+                found[name] = str(Path(search_path) / name)
+                break
+    return found
+
+
+def _search_tree(root: str, names: frozenset, max_depth: int) -> Dict[str, str]:
+    """Breadth-first search below ``root`` for checkouts named in ``names``."""
+    found: Dict[str, str] = {}
+    level = [root]
+    for _ in range(max_depth):
+        next_level = []
+        for directory in level:
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        name = entry.name
+                        if name.startswith(".") or name in _SEARCH_SKIP_DIRS:
+                            continue
+                        if not entry.is_dir(follow_symlinks=False):
+                            continue
+                        if name in names and name not in found and is_repo_checkout(entry.path):
+                            found[name] = entry.path
+                        else:
+                            next_level.append(entry.path)
+            except OSError:
+                continue
+        if len(found) == len(names) or not next_level:
+            break
+        level = next_level
+    return found
+
+
+def discover_local_repos(search_paths: Optional[List[str]] = None) -> List[EcosystemRepo]:
+    """
+    Discover locally available ecosystem repositories.
+
+    Args:
+        search_paths: List of paths to search for repos
+
+    Returns:
+        Updated list of EcosystemRepo objects with local paths
+    """
+    if search_paths is None:
+        search_paths = default_search_paths()
+
+    with ThreadPoolExecutor() as pool:
+        found = _probe_all([repo.name for repo in ECOSYSTEM_REPOS], search_paths, pool)
+    return [_copy(repo, found.get(repo.name)) for repo in ECOSYSTEM_REPOS]
+
+
+class RepoDiscovery:
+    """
+    Cached, concurrent discovery service for ecosystem repositories.
+
+    The last known location of each repository is kept in a small JSON cache
+    file. On later calls only that path is re-validated; repositories that
+    moved or were never found are probed across all search paths at once.
+    Misses are remembered for ``miss_ttl`` seconds so absent repositories
+    don't cost a full probe on every call.
+
+    Example:
+        >>> discovery = RepoDiscovery(max_depth=2)
+        >>> available = [r for r in discovery.discover() if r.is_available]
+    """
+
+    def __init__(
+        self,
+        search_paths: Optional[List[str]] = None,
+        cache_path: Optional[str] = DEFAULT_LOCATION_CACHE,
+        max_depth: int = 0,
+        miss_ttl: float = 300.0,
+        workers: Optional[int] = None,
+    ):
+        """
+        Args:
+            search_paths: Paths to search (default: default_search_paths())
+            cache_path: Location cache file, or None to keep it in memory only
+            max_depth: Also search this many directory levels below each
+                search path for repos not found directly (0 disables)
+            miss_ttl: Seconds before a repo that wasn't found is probed again
+            workers: Thread pool size for probing
+        """
+        self.search_paths = search_paths if search_paths is not None else default_search_paths()
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.max_depth = max_depth
+        self.miss_ttl = miss_ttl
+        self.workers = workers
+        self._cache: Optional[Dict[str, dict]] = None
+
+    def _load_cache(self) -> Dict[str, dict]:
+        if self._cache is None:
+            self._cache = {}
+            if self.cache_path is not None:
+                try:
+                    with open(self.cache_path, "r", encoding="utf-8") as f:
+                        data = json.load(f)
+                    if isinstance(data, dict):
+                        self._cache = {k: v for k, v in data.items() if isinstance(v, dict)}
+                except (OSError, ValueError):
+                    pass
+        return self._cache
+
+    def _save_cache(self):
+        if self.cache_path is None:
+            return
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.cache_path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._cache, f, indent=2)
+        os.replace(tmp, self.cache_path)
+
+    def invalidate(self):
+        """Forget all cached locations and misses."""
+        self._cache = {}
+        self._save_cache()
+
+    def discover(self, repos: Optional[List[EcosystemRepo]] = None) -> List[EcosystemRepo]:
+        """
+        Discover local checkouts of ecosystem repositories.
+
+        Args:
+            repos: Repositories to look for (default: ECOSYSTEM_REPOS)
+
+        Returns:
+            Copies of the repos with local_path/is_available filled in
+        """
+        if repos is None:
+            repos = ECOSYSTEM_REPOS
+        cache = self._load_cache()
+        now = time.time()
+        located: Dict[str, Optional[str]] = {}
+        to_probe: List[str] = []
+
+        for repo in repos:
+            entry = cache.get(repo.name, {})
+            path = entry.get("path")
+            if path and is_repo_checkout(path):
+                located[repo.name] = path
+            elif not path and now - entry.get("missed_at", 0) < self.miss_ttl:
+                located[repo.name] = None
+            else:
+                to_probe.append(repo.name)
+
+        if to_probe:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                found = _probe_all(to_probe, self.search_paths, pool)
+                missing = frozenset(name for name in to_probe if name not in found)
+                if missing and self.max_depth > 0:
+                    searches = [
+                        pool.submit(_search_tree, search_path, missing, self.max_depth)
+                        for search_path in self.search_paths
+                    ]
+                    for search in searches:
+                        for name, path in search.result().items():
+                            found.setdefault(name, path)
+            for name in to_probe:
+                path = found.get(name)
+                located[name] = path
+                cache[name] = {"path": path} if path else {"missed_at": now}
+            self._save_cache()
+
+        return [_copy(repo, located.get(repo.name)) for repo in repos]
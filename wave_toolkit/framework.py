@@ -0,0 +1,465 @@
+"""
+Framework analysis tools.
+
+Analyzes a repository's file structure, as in project-book.ipynb. The walk
+is built on ``os.scandir``: ignored directories (hidden, ``node_modules``,
+``__pycache__``) are pruned before descending, file types come from the
+cached ``DirEntry`` information instead of a ``stat`` per entry, and in
+large trees whole subtrees are fanned out to a thread pool.
+
+An optional ``FrameworkCache`` persists each directory's scan keyed by a
+fingerprint from a single ``stat``. Re-analysis then only lists directories
+whose fingerprint changed and merges the cached partial results for the rest.
+
+With ``source="git"`` files are enumerated from the git index instead of the
+working tree, optionally adding untracked files that ``.gitignore`` allows.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from . import perf
+from .gitindex import iter_untracked, read_git_index
+
+# Language extensions mapping
+LANG_EXTENSIONS = {
+    ".py": "Python",
+    ".ps1": "PowerShell",
+    ".psm1": "PowerShell",
+    ".js": "JavaScript",
+    ".ts": "TypeScript",
+    ".json": "JSON",
+    ".md": "Markdown",
+    ".yaml": "YAML",
+    ".yml": "YAML",
+    ".sh": "Shell"
+}
+
+# Directory names never descended into (in addition to hidden ones)
+IGNORED_DIRS = frozenset({"node_modules", "__pycache__"})
+
+# Sample file names kept per top-level directory
+STRUCTURE_SAMPLE_SIZE = 5
+
+DEFAULT_CACHE_DIR = ".claude/cache/framework"
+
+# Directories modified this recently may change again within the same mtime
+# tick, so their scans are not trusted on the next run (cf. git's "racy" index)
+RACY_WINDOW_NS = 2_000_000_000
+
+# Trees with fewer directories than this are walked without the thread pool
+PARALLEL_MIN_DIRS = 256
+
+# Subtrees left after the serial start are dealt round-robin into this many tasks
+PARALLEL_TASKS = 64
+
+# File enumeration sources for analyze_framework
+ANALYSIS_SOURCES = ("walk", "git")
+
+# (st_mtime_ns, st_nlink) of a directory
+Fingerprint = Tuple[int, int]
+
+
+@dataclass(slots=True)
+class FrameworkAnalysis:
+    """Analysis results for a framework/repository."""
+    path: str
+    name: str
+    file_count: int
+    languages: Dict[str, int]
+    structure: Dict[str, List[str]]
+    has_tests: bool
+    has_docs: bool
+    has_ai_agents_config: bool
+
+
+@dataclass
+class DirectoryScan:
+    """Files and subdirectories found directly inside one directory."""
+    file_count: int = 0
+    languages: Dict[str, int] = field(default_factory=dict)
+    samples: List[str] = field(default_factory=list)
+    subdirs: List[str] = field(default_factory=list)
+
+
+def is_ignored(name: str) -> bool:
+    """Check whether a file or directory name is skipped by the analysis."""
+    return name.startswith(".") or name in IGNORED_DIRS
+
+
+def scan_directory(path: str) -> DirectoryScan:
+    """
+    Scan a single directory level.
+
+    Unreadable directories are treated as empty, like ``Path.rglob``.
+
+    Args:
+        path: Directory to scan
+
+    Returns:
+        DirectoryScan with sorted sample names and subdirectory names
+    """
+    scan = DirectoryScan()
+    files: List[str] = []
+    subdirs = scan.subdirs
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                name = entry.name
+                # is_ignored, inlined: this loop runs once per file in the tree
+                if name[0] == "." or name in IGNORED_DIRS:
+                    continue
+                try:
+                    if entry.is_file():
+                        files.append(name)
+                    elif entry.is_dir(follow_symlinks=False):
+                        subdirs.append(name)
+                except OSError:
+                    continue
+    except (PermissionError, FileNotFoundError, NotADirectoryError):
+        return scan
+
+    languages = scan.languages
+    for name in files:
+        # Same suffix as os.path.splitext: names here never start with "."
+        dot = name.rfind(".")
+        lang = LANG_EXTENSIONS.get(name[dot:].lower()) if dot > 0 else None
+        if lang:
+            languages[lang] = languages.get(lang, 0) + 1
+    scan.file_count = len(files)
+    scan.samples = sorted(files)[:STRUCTURE_SAMPLE_SIZE]
+    scan.subdirs.sort()
+    return scan
+
+
+def directory_fingerprint(path: str) -> Optional[Fingerprint]:
+    """
+    Fingerprint a directory with one ``stat``.
+
+    The mtime changes whenever an entry is added, removed or renamed, and
+    directories changed within ``RACY_WINDOW_NS`` of a scan are rescanned
+    anyway. The link count stands in for an entry count: counting entries
+    means listing the directory, about three times the cost of the ``stat``
+    and most of what the cache saves. On POSIX filesystems it is 2 plus the
+    number of subdirectories, so a subdirectory added or removed under a
+    restored mtime (``cp -p``, ``tar -x``, ``touch -r``) still shows up. A file
+    added under a restored mtime goes unnoticed until the directory changes again.
+
+    Returns:
+        (mtime_ns, nlink) tuple, or None if the directory can't be stat'ed
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_nlink)
+
+
+class FrameworkCache:
+    """
+    Persistent per-directory scan cache for analyze_framework.
+
+    Each analyzed repository gets one JSON file under ``cache_dir`` mapping
+    relative directory paths to their fingerprint and DirectoryScan. Loaded
+    trees are also kept in memory, so repeated analysis from one process
+    (e.g. a dashboard timer) costs one ``stat`` per directory.
+
+    One instance may be shared by analyses running on several threads;
+    the trees, counters and cache files are updated under a lock.
+    """
+
+    VERSION = 1
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR):
+        self.cache_dir = Path(cache_dir)
+        self._trees: Dict[str, Dict[str, Tuple[Fingerprint, DirectoryScan]]] = {}
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _cache_file(self, root: str) -> Path:
+        digest = hashlib.sha1(root.encode("utf-8")).hexdigest()[:16]
+        return self.cache_dir / f"{Path(root).name}-{digest}.json"
+
+    def load(self, root: str) -> Dict[str, Tuple[Fingerprint, DirectoryScan]]:
+        """Return cached entries for a repository root (empty if none)."""
+        with self._lock:
+            if root in self._trees:
+                return self._trees[root]
+            entries: Dict[str, Tuple[Fingerprint, DirectoryScan]] = {}
+            try:
+                with open(self._cache_file(root), "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("version") == self.VERSION and data.get("root") == root:
+                    for rel, (mtime_ns, nlink, count, languages, samples, subdirs) in data["dirs"].items():
+                        entries[rel] = ((mtime_ns, nlink), DirectoryScan(count, languages, samples, subdirs))
+            except (OSError, ValueError, KeyError, TypeError):
+                entries = {}
+            self._trees[root] = entries
+            return entries
+
+    def store(self, root: str, entries: Dict[str, Tuple[Fingerprint, DirectoryScan]]):
+        """Replace the cached entries for a repository root and persist them."""
+        data = {
+            "version": self.VERSION,
+            "root": root,
+            "dirs": {
+                rel: [fp[0], fp[1], scan.file_count, scan.languages, scan.samples, scan.subdirs]
+                for rel, (fp, scan) in entries.items()
+            },
+        }
+        target = self._cache_file(root)
+        tmp = target.with_suffix(f".{os.getpid()}.tmp")
+        with self._lock:
+            self._trees[root] = entries
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(tmp, target)
+
+    def record(self, hits: int, misses: int):
+        """Add one analysis' directory hits and misses to the counters."""
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+
+
+def _visit(
+    path: str,
+    cached: Optional[Tuple[Fingerprint, DirectoryScan]],
+) -> Tuple[DirectoryScan, Optional[Fingerprint], bool]:
+    """Scan one directory unless its cached fingerprint still matches."""
+    fingerprint = directory_fingerprint(path)
+    if fingerprint is not None and cached is not None and cached[0] == fingerprint:
+        return cached[1], fingerprint, True
+    if fingerprint is not None and fingerprint[0] > time.time_ns() - RACY_WINDOW_NS:
+        fingerprint = None
+    return scan_directory(path), fingerprint, False
+
+
+def _walk_serial(
+    root: str,
+    tops: Iterable[str],
+    cached: Optional[Dict[str, Tuple[Fingerprint, DirectoryScan]]],
+    limit: Optional[int] = None,
+) -> Tuple[List[Tuple[str, DirectoryScan, Optional[Fingerprint], bool]], List[str]]:
+    """
+    Walk the subtrees at ``tops`` breadth-first in the calling thread.
+
+    Without a cache (``cached`` is None) directories are listed without
+    fingerprinting them. Stops after ``limit`` directories, if given.
+
+    Returns:
+        Tuple of ((rel, scan, fingerprint, hit) per directory visited,
+        relative paths of the directories left unvisited)
+    """
+    visited = []
+    queue = deque(tops)
+    while queue and (limit is None or len(visited) < limit):
+        rel = queue.popleft()
+        path = os.path.join(root, rel) if rel else root
+        if cached is None:
+            scan, fingerprint, hit = scan_directory(path), None, False
+        else:
+            scan, fingerprint, hit = _visit(path, cached.get(rel))
+        visited.append((rel, scan, fingerprint, hit))
+        queue.extend(f"{rel}/{name}" if rel else name for name in scan.subdirs)
+    return visited, list(queue)
+
+
+def walk_tree(
+    root: str,
+    workers: Optional[int] = None,
+    cache: Optional[FrameworkCache] = None,
+) -> Dict[str, DirectoryScan]:
+    """
+    Scan every non-ignored directory under ``root``.
+
+    The top of the tree is walked serially; trees with fewer than
+    ``PARALLEL_MIN_DIRS`` directories end there. Otherwise each remaining
+    subtree is one task for the thread pool, walked serially within it, and
+    the results are merged on the calling thread. With a cache, directories
+    whose fingerprint is unchanged reuse their cached scan and are not
+    listed; the cache is then updated with the new tree.
+
+    Args:
+        root: Directory to walk
+        workers: Thread pool size (default: ThreadPoolExecutor's default);
+            1 walks the whole tree serially
+        cache: Optional FrameworkCache to consult and update
+
+    Returns:
+        Mapping of relative directory path ("" for root, "/"-separated)
+        to its DirectoryScan
+    """
+    cache_key = os.path.abspath(root)
+    cached = cache.load(cache_key) if cache is not None else None
+    limit = PARALLEL_MIN_DIRS if workers != 1 else None
+    visited, frontier = _walk_serial(root, [""], cached, limit)
+    if frontier:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            tasks = [frontier[i::PARALLEL_TASKS] for i in range(min(PARALLEL_TASKS, len(frontier)))]
+            for subtree, _ in pool.map(lambda tops: _walk_serial(root, tops, cached), tasks):
+                visited.extend(subtree)
+
+    scans: Dict[str, DirectoryScan] = {}
+    fresh: Dict[str, Tuple[Fingerprint, DirectoryScan]] = {}
+    hits = 0
+    for rel, scan, fingerprint, hit in visited:
+        scans[rel] = scan
+        hits += hit
+        if fingerprint is not None:
+            fresh[rel] = (fingerprint, scan)
+    misses = len(visited) - hits
+
+    perf.count("framework.dirs", len(scans))
+    if cache is not None:
+        perf.cache("framework", hits, misses)
+        cache.record(hits, misses)
+        if misses or len(fresh) != len(cached):
+            cache.store(cache_key, fresh)
+    return scans
+
+
+def scans_from_paths(paths: Iterable[str]) -> Dict[str, DirectoryScan]:
+    """
+    Build per-directory scans from a list of relative file paths.
+
+    Paths with an ignored component (see ``is_ignored``) are skipped, so the
+    result matches what walk_tree would report for the same files.
+
+    Args:
+        paths: "/"-separated paths relative to the repository root
+
+    Returns:
+        Mapping of relative directory path to DirectoryScan, as walk_tree
+    """
+    files: Dict[str, List[str]] = {"": []}
+    subdirs: Dict[str, set] = {"": set()}
+    for path in paths:
+        parts = path.split("/")
+        if any(is_ignored(part) for part in parts):
+            continue
+        rel = ""
+        for part in parts[:-1]:
+            subdirs[rel].add(part)
+            rel = f"{rel}/{part}" if rel else part
+            if rel not in subdirs:
+                subdirs[rel] = set()
+                files[rel] = []
+        files[rel].append(parts[-1])
+
+    scans: Dict[str, DirectoryScan] = {}
+    for rel, names in files.items():
+        scan = DirectoryScan(file_count=len(names), subdirs=sorted(subdirs[rel]))
+        for name in names:
+            lang = LANG_EXTENSIONS.get(os.path.splitext(name)[1].lower())
+            if lang:
+                scan.languages[lang] = scan.languages.get(lang, 0) + 1
+        scan.samples = sorted(names)[:STRUCTURE_SAMPLE_SIZE]
+        scans[rel] = scan
+    return scans
+
+
+def merge_scans(
+    scans: Dict[str, DirectoryScan],
+) -> Tuple[int, Dict[str, int], Dict[str, List[str]]]:
+    """
+    Combine per-directory scans into repository totals.
+
+    Directories are visited in pre-order with names sorted, so structure
+    samples are deterministic regardless of scan completion order.
+
+    Returns:
+        Tuple of (file_count, languages, structure)
+    """
+    file_count = 0
+    languages: Dict[str, int] = {}
+    structure: Dict[str, List[str]] = {}
+
+    stack: List[Tuple[str, Optional[str]]] = [("", None)]
+    while stack:
+        rel, top = stack.pop()
+        scan = scans.get(rel)
+        if scan is None:
+            continue
+        file_count += scan.file_count
+        for lang, count in scan.languages.items():
+            languages[lang] = languages.get(lang, 0) + count
+        if top is not None and scan.file_count:
+            samples = structure.setdefault(top, [])
+            room = STRUCTURE_SAMPLE_SIZE - len(samples)
+            if room > 0:
+                samples.extend(scan.samples[:room])
+        for name in reversed(scan.subdirs):
+            child = f"{rel}/{name}" if rel else name
+            stack.append((child, top if top is not None else name))
+
+    return file_count, languages, structure
+
+
+@perf.profiled("framework.analyze_framework")
+def analyze_framework(
+    repo_path: str,
+    workers: Optional[int] = None,
+    cache: Optional[FrameworkCache] = None,
+    source: str = "walk",
+    include_untracked: bool = False,
+) -> Optional[FrameworkAnalysis]:
+    """
+    Analyze a framework/repository structure.
+
+    Args:
+        repo_path: Path to the repository
+        workers: Thread pool size for the directory walk
+        cache: Optional FrameworkCache; only changed directories are re-listed
+        source: "walk" to scan the working tree, or "git" to count the files
+            tracked in the git index (falls back to "walk" outside a repo)
+        include_untracked: With source="git", also count untracked files
+            that are not excluded by .gitignore
+
+    Returns:
+        FrameworkAnalysis object or None if path doesn't exist
+
+    Raises:
+        ValueError: If source is not one of ANALYSIS_SOURCES
+    """
+    if source not in ANALYSIS_SOURCES:
+        raise ValueError(
+            f"Unknown analysis source: {source}. "
+            f"Valid sources are: {', '.join(ANALYSIS_SOURCES)}"
+        )
+
+    path = Path(repo_path)
+    if not path.exists():
+        return None
+
+    tracked = read_git_index(str(path)) if source == "git" else None
+    if tracked is not None:
+        paths: List[str] = tracked
+        if include_untracked:
+            paths = tracked + list(iter_untracked(str(path), set(tracked), skip_dir=is_ignored))
+        scans = scans_from_paths(paths)
+    else:
+        scans = walk_tree(str(path), workers, cache)
+    file_count, languages, structure = merge_scans(scans)
+    perf.count("framework.files", file_count)
+
+    return FrameworkAnalysis(
+        path=str(path),
+        name=path.name,
+        file_count=file_count,
+        languages=languages,
+        structure=structure,
+        has_tests=(path / "tests").exists() or (path / "test").exists(),
+        has_docs=(path / "docs").exists() or (path / "README.md").exists(),
+        has_ai_agents_config=(path / "AI_AGENTS.md").exists()
+    )
@@ -0,0 +1,312 @@
+"""
+Git index and .gitignore support.
+
+``read_git_index`` lists tracked paths by parsing ``.git/index`` directly
+(versions 2, 3 and 4), so enumerating a repository costs one file read
+instead of a working-tree walk. ``GitIgnore`` implements ``.gitignore``
+matching for finding untracked, non-ignored files.
+"""
+
+import os
+import re
+import struct
+from pathlib import Path
+from typing import Iterator, List, Optional, Set, Tuple
+
+# Entry mode types (upper bits of the mode field)
+_MODE_TYPE_MASK = 0o170000
+_MODE_GITLINK = 0o160000
+
+_HEADER = struct.Struct(">4sLL")
+# ctime(2), mtime(2), dev, ino, mode, uid, gid, size
+_ENTRY_STAT = struct.Struct(">10L")
+_EXTENDED_FLAG = 0x4000
+_NAME_MASK = 0x0FFF
+
+
+def find_git_dir(repo_path: str) -> Optional[Path]:
+    """
+    Locate the git directory for a working tree.
+
+    Supports ``.git`` directories and ``.git`` files pointing elsewhere
+    (worktrees and submodules).
+
+    Returns:
+        Path to the git directory, or None if repo_path isn't a repository
+    """
+    dot_git = Path(repo_path) / ".git"
+    if dot_git.is_dir():
+        return dot_git
+    if dot_git.is_file():
+        try:
+            content = dot_git.read_text(encoding="utf-8").strip()
+        except OSError:
+            return None
+        if content.startswith("gitdir:"):
+            git_dir = Path(content[len("gitdir:"):].strip())
+            if not git_dir.is_absolute():
+                git_dir = Path(repo_path) / git_dir
+            return git_dir if git_dir.is_dir() else None
+    return None
+
+
+def _hash_size(git_dir: Path) -> int:
+    """Object ID length in bytes: 32 for SHA-256 repositories, else 20."""
+    try:
+        config = (git_dir / "config").read_text(encoding="utf-8", errors="replace")
+    except OSError:
+        return 20
+    if re.search(r"^\s*objectformat\s*=\s*sha256\s*$", config, re.MULTILINE | re.IGNORECASE):
+        return 32
+    return 20
+
+
+def _read_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    """Decode git's offset varint (used for v4 path prefix lengths)."""
+    byte = data[pos]
+    pos += 1
+    value = byte & 0x7F
+    while byte & 0x80:
+        byte = data[pos]
+        pos += 1
+        value = ((value + 1) << 7) | (byte & 0x7F)
+    return value, pos
+
+
+def parse_git_index(data: bytes, hash_size: int = 20) -> Iterator[Tuple[str, int]]:
+    """
+    Parse the entries of a git index file.
+
+    Args:
+        data: Raw contents of ``.git/index``
+        hash_size: Object ID length in bytes
+
+    Yields:
+        (path, mode) for every entry, in index order
+
+    Raises:
+        ValueError: If the data is not a supported git index
+    """
+    if len(data) < _HEADER.size:
+        raise ValueError("Git index is truncated")
+    signature, version, count = _HEADER.unpack_from(data, 0)
+    if signature != b"DIRC":
+        raise ValueError("Not a git index file (bad signature)")
+    if version not in (2, 3, 4):
+        raise ValueError(f"Unsupported git index version: {version}")
+
+    pos = _HEADER.size
+    previous = b""
+    for _ in range(count):
+        start = pos
+        mode = _ENTRY_STAT.unpack_from(data, pos)[6]
+        pos += _ENTRY_STAT.size + hash_size
+        flags = int.from_bytes(data[pos:pos + 2], "big")
+        pos += 2
+        if version >= 3 and flags & _EXTENDED_FLAG:
+            pos += 2
+        if version == 4:
+            strip, pos = _read_varint(data, pos)
+            end = data.index(b"\0", pos)
+            name = previous[:len(previous) - strip] + data[pos:end]
+            pos = end + 1
+        else:
+            name_len = flags & _NAME_MASK
+            if name_len == _NAME_MASK:
+                end = data.index(b"\0", pos)
+            else:
+                end = pos + name_len
+            name = data[pos:end]
+            # Entries are NUL-padded to a multiple of 8 bytes
+            entry_len = (end - start + 8) & ~7
+            pos = start + entry_len
+        previous = name
+        if pos > len(data):
+            raise ValueError("Git index is truncated")
+        yield name.decode("utf-8", errors="surrogateescape"), mode
+
+
+def read_git_index(repo_path: str) -> Optional[List[str]]:
+    """
+    List the files tracked in a repository's index.
+
+    Submodule entries (gitlinks) are skipped; conflicted paths appear once.
+
+    Args:
+        repo_path: Path to the working tree
+
+    Returns:
+        Sorted list of "/"-separated paths, or None if there is no index
+    """
+    git_dir = find_git_dir(repo_path)
+    if git_dir is None:
+        return None
+    try:
+        data = (git_dir / "index").read_bytes()
+    except OSError:
+        return None
+    paths = []
+    last = None
+    for path, mode in parse_git_index(data, _hash_size(git_dir)):
+        if mode & _MODE_TYPE_MASK == _MODE_GITLINK or path == last:
+            continue
+        paths.append(path)
+        last = path
+    return paths
+
+
+def _translate(pattern: str) -> str:
+    """Translate a gitignore glob (without anchoring) into a regex."""
+    out = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == "*":
+            if pattern[i:i + 2] == "**":
+                at_start = i == 0 or pattern[i - 1] == "/"
+                at_end = i + 2 == n or pattern[i + 2] == "/"
+                if at_start and at_end:
+                    if i + 2 == n:
+                        out.append(".*")
+                        i += 2
+                    else:
+                        out.append("(?:.*/)?")
+                        i += 3
+                    continue
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            j = i + 1
+            if j < n and pattern[j] in "!^":
+                j += 1
+            if j < n and pattern[j] == "]":
+                j += 1
+            while j < n and pattern[j] != "]":
+                j += 1
+            if j >= n:
+                out.append(re.escape(c))
+            else:
+                body = pattern[i + 1:j].replace("\\", "\\\\")
+                if body[:1] in ("!", "^"):
+                    body = "^" + body[1:]
+                out.append(f"[{body}]")
+                i = j
+        elif c == "\\" and i + 1 < n:
+            i += 1
+            out.append(re.escape(pattern[i]))
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
+
+
+class GitIgnore:
+    """
+    Ordered .gitignore rules for one repository.
+
+    Rules are added per directory (``base`` is the directory's path relative
+    to the repository root); the last matching rule wins.
+    """
+
+    def __init__(self):
+        # (regex, negated, dir_only)
+        self._rules: List[Tuple["re.Pattern[str]", bool, bool]] = []
+
+    def add_patterns(self, lines: List[str], base: str = "") -> None:
+        """Add rules from the lines of a .gitignore located at ``base``."""
+        prefix = f"{base}/" if base else ""
+        for raw in lines:
+            line = raw.rstrip("\n").rstrip("\r")
+            if not line or line.startswith("#"):
+                continue
+            # Trailing spaces are ignored unless escaped
+            stripped = line.rstrip(" ")
+            if stripped.endswith("\\") and len(stripped) < len(line):
+                stripped += " "
+            line = stripped
+            negated = line.startswith("!")
+            if negated:
+                line = line[1:]
+            elif line.startswith("\\!") or line.startswith("\\#"):
+                line = line[1:]
+            dir_only = line.endswith("/")
+            line = line.rstrip("/")
+            if not line:
+                continue
+            anchored = "/" in line
+            line = line.lstrip("/")
+            body = _translate(line)
+            if anchored:
+                regex = f"^{re.escape(prefix)}{body}$"
+            else:
+                regex = f"^{re.escape(prefix)}(?:.*/)?{body}$"
+            self._rules.append((re.compile(regex, re.DOTALL), negated, dir_only))
+
+    def add_file(self, path: Path, base: str = "") -> None:
+        """Add rules from a .gitignore (or info/exclude) file if it exists."""
+        try:
+            lines = path.read_text(encoding="utf-8", errors="replace").splitlines()
+        except OSError:
+            return
+        self.add_patterns(lines, base)
+
+    def is_ignored(self, rel_path: str, is_dir: bool = False) -> bool:
+        """Check a "/"-separated path relative to the repository root."""
+        ignored = False
+        for regex, negated, dir_only in self._rules:
+            if dir_only and not is_dir:
+                continue
+            if regex.match(rel_path):
+                ignored = not negated
+        return ignored
+
+
+def iter_untracked(
+    repo_path: str,
+    tracked: Set[str],
+    skip_dir=lambda name: name == ".git",
+) -> Iterator[str]:
+    """
+    Walk the working tree for untracked files that are not ignored.
+
+    Honors ``.git/info/exclude`` and ``.gitignore`` files at every level;
+    ignored directories are pruned without being listed.
+
+    Args:
+        repo_path: Path to the working tree
+        tracked: Paths already known from the index
+        skip_dir: Predicate for directory names never descended into
+
+    Yields:
+        "/"-separated relative paths of untracked files
+    """
+    root = Path(repo_path)
+    ignore = GitIgnore()
+    git_dir = find_git_dir(repo_path)
+    if git_dir is not None:
+        ignore.add_file(git_dir / "info" / "exclude")
+
+    stack = [""]
+    while stack:
+        rel = stack.pop()
+        directory = root / rel if rel else root
+        ignore.add_file(directory / ".gitignore", rel)
+        try:
+            with os.scandir(directory) as entries:
+                children = sorted(entries, key=lambda e: e.name)
+        except OSError:
+            continue
+        subdirs = []
+        for entry in children:
+            child = f"{rel}/{entry.name}" if rel else entry.name
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if not skip_dir(entry.name) and not ignore.is_ignored(child, is_dir=True):
+                        subdirs.append(child)
+                elif entry.is_file():
+                    if child not in tracked and not ignore.is_ignored(child):
+                        yield child
+            except OSError:
+                continue
+        stack.extend(reversed(subdirs))
@@ -0,0 +1,425 @@
+"""
+Handoff marker storage.
+
+Python counterpart of ``HandoffStorage`` (src/storage/HandoffStorage.ts):
+handshake markers live in ``.wave/handoffs/<sessionId>.jsonl``, one
+``JSON.stringify(marker)`` per line. ``HandoffStore`` streams these files,
+keeps a SQLite index of marker id -> (file, byte offset) plus the scalar
+marker fields, and extends it incrementally as files grow, so finding a
+marker or filtering across sessions doesn't rescan every file. It can also
+tail-follow new markers and export the indexed fields to a columnar
+``.npz`` file (requires NumPy).
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+DEFAULT_HANDOFFS_DIR = ".wave/handoffs"
+INDEX_FILENAME = "handoff_index.db"
+
+# HandoffState in src/handshake/types.ts
+HANDOFF_STATES = ("WAVE", "PASS", "BLOCK", "HOLD", "PUSH")
+
+# Indexed marker fields, in export column order
+MARKER_COLUMNS = (
+    "id",
+    "session_id",
+    "timestamp",
+    "from_agent",
+    "to_agent",
+    "state",
+    "coherence_score",
+    "atom_trail_id",
+    "filename",
+    "offset",
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    name TEXT PRIMARY KEY,
+    dev INTEGER NOT NULL,
+    ino INTEGER NOT NULL,
+    indexed INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS markers (
+    id TEXT,
+    session_id TEXT,
+    timestamp TEXT,
+    from_agent TEXT,
+    to_agent TEXT,
+    state TEXT,
+    coherence_score REAL,
+    atom_trail_id TEXT,
+    filename TEXT NOT NULL REFERENCES files(name) ON DELETE CASCADE,
+    offset INTEGER NOT NULL,
+    PRIMARY KEY (filename, offset)
+);
+CREATE INDEX IF NOT EXISTS idx_markers_id ON markers(id);
+CREATE INDEX IF NOT EXISTS idx_markers_session ON markers(session_id);
+CREATE INDEX IF NOT EXISTS idx_markers_timestamp ON markers(timestamp);
+"""
+
+TimeBound = Union[str, datetime, None]
+
+
+@dataclass
+class MarkerLocation:
+    """Where a marker is stored."""
+    file: str
+    offset: int
+
+
+def _iso(bound: TimeBound) -> Optional[str]:
+    return bound.isoformat() if isinstance(bound, datetime) else bound
+
+
+def _complete_lines(path: Path, offset: int) -> Iterator[Tuple[int, bytes]]:
+    """Yield (offset, line) for newline-terminated lines from ``offset`` onwards."""
+    with open(path, "rb") as f:
+        f.seek(offset)
+        for line in f:
+            if not line.endswith(b"\n"):
+                break  # Still being written
+            yield offset, line
+            offset += len(line)
+
+
+def _row(marker: Dict[str, Any], name: str, offset: int) -> Tuple:
+    score = marker.get("coherenceScore")
+    return (
+        marker.get("id"),
+        marker.get("sessionId"),
+        marker.get("timestamp"),
+        marker.get("fromAgent"),
+        marker.get("toAgent"),
+        marker.get("state"),
+        float(score) if isinstance(score, (int, float)) else None,
+        marker.get("atomTrailId"),
+        name,
+        offset,
+    )
+
+
+class HandoffStore:
+    """
+    Indexed reader/writer for ``.wave/handoffs``.
+
+    Example:
+        >>> with HandoffStore() as store:
+        ...     store.refresh()
+        ...     marker = store.get("handoff-123")
+        ...     blocked = store.query(state="BLOCK", since="2025-01-01")
+    """
+
+    def __init__(self, base_dir: str = DEFAULT_HANDOFFS_DIR, index_path: Optional[str] = None):
+        """
+        Args:
+            base_dir: Directory of ``<sessionId>.jsonl`` files
+            index_path: SQLite index (default: ``<base_dir>/handoff_index.db``)
+        """
+        self.base_dir = Path(base_dir)
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+        self.index_path = Path(index_path) if index_path else self.base_dir / INDEX_FILENAME
+        self._conn = sqlite3.connect(str(self.index_path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self):
+        """Close the underlying database connection."""
+        self._conn.close()
+
+    def __enter__(self) -> "HandoffStore":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # --- reading files ---------------------------------------------------
+
+    def session_file(self, session_id: str) -> Path:
+        """Path of a session's marker file."""
+        return self.base_dir / f"{session_id}.jsonl"
+
+    def sessions(self) -> List[str]:
+        """All session ids with a marker file."""
+        return sorted(
+            name[:-len(".jsonl")] for name in os.listdir(self.base_dir) if name.endswith(".jsonl")
+        )
+
+    def _read_from(self, path: Path, offset: int) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """Yield (offset, marker) for complete lines from ``offset`` onwards."""
+        for line_offset, line in _complete_lines(path, offset):
+            if line.strip():
+                try:
+                    yield line_offset, json.loads(line)
+                except ValueError:
+                    pass  # Skip corrupt lines, as a reader of appended logs must
+
+    def iter_markers(self, session_id: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Stream markers straight from the files, one line at a time.
+
+        Args:
+            session_id: Only this session (default: every session)
+        """
+        sessions = [session_id] if session_id is not None else self.sessions()
+        for session in sessions:
+            path = self.session_file(session)
+            if path.exists():
+                for _offset, marker in self._read_from(path, 0):
+                    yield marker
+
+    def _read_at(self, name: str, offset: int) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.base_dir / name, "rb") as f:
+                f.seek(offset)
+                return json.loads(f.readline())
+        except (OSError, ValueError):
+            return None
+
+    # --- writing ---------------------------------------------------------
+
+    def save_marker(self, marker: Dict[str, Any]) -> MarkerLocation:
+        """
+        Append a marker to its session file (as HandoffStorage.saveMarker does).
+
+        Returns:
+            Location of the new marker
+        """
+        path = self.session_file(marker["sessionId"])
+        line = (json.dumps(marker, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+        with open(path, "ab") as f:
+            offset = f.seek(0, os.SEEK_END)
+            f.write(line)
+        self.refresh()
+        return MarkerLocation(path.name, offset)
+
+    # --- index -----------------------------------------------------------
+
+    def _index_new(self) -> List[Dict[str, Any]]:
+        """Index appended lines in every file; return the newly indexed markers."""
+        known = {
+            name: (dev, ino, indexed)
+            for name, dev, ino, indexed in self._conn.execute("SELECT name, dev, ino, indexed FROM files")
+        }
+        seen = set()
+        added: List[Dict[str, Any]] = []
+        with self._conn:
+            with os.scandir(self.base_dir) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if not name.endswith(".jsonl") or not entry.is_file():
+                        continue
+                    seen.add(name)
+                    st = entry.stat()
+                    dev, ino, indexed = known.get(name, (st.st_dev, st.st_ino, 0))
+                    if (dev, ino) != (st.st_dev, st.st_ino) or st.st_size < indexed:
+                        # Replaced or truncated: index the file from scratch
+                        self._conn.execute("DELETE FROM files WHERE name = ?", (name,))
+                        indexed = 0
+                    elif st.st_size == indexed and name in known:
+                        continue
+
+                    rows = []
+                    end = indexed
+                    for offset, line in _complete_lines(Path(entry.path), indexed):
+                        end = offset + len(line)
+                        try:
+                            marker = json.loads(line) if line.strip() else None
+                        except ValueError:
+                            marker = None
+                        if isinstance(marker, dict):
+                            rows.append(_row(marker, name, offset))
+                            added.append(marker)
+                    self._conn.execute(
+                        "INSERT INTO files VALUES (?, ?, ?, ?) ON CONFLICT(name) DO UPDATE SET "
+                        "dev = excluded.dev, ino = excluded.ino, indexed = excluded.indexed",
+                        (name, st.st_dev, st.st_ino, end),
+                    )
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO markers VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+                    )
+            removed = [(name,) for name in known if name not in seen]
+            self._conn.executemany("DELETE FROM files WHERE name = ?", removed)
+        return added
+
+    def refresh(self) -> int:
+        """
+        Index markers appended since the last refresh.
+
+        Unchanged files cost a single ``stat``; grown files are read from
+        the last indexed offset; replaced or truncated files are re-read.
+
+        Returns:
+            Number of newly indexed markers
+        """
+        return len(self._index_new())
+
+    def locate(self, marker_id: str) -> Optional[MarkerLocation]:
+        """Index lookup of where a marker is stored."""
+        row = self._conn.execute(
+            "SELECT filename, offset FROM markers WHERE id = ? ORDER BY timestamp DESC LIMIT 1", (marker_id,)
+        ).fetchone()
+        return MarkerLocation(*row) if row else None
+
+    def get(self, marker_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Find a marker by id with one index lookup and one seek.
+
+        The index is refreshed once if the id is not found (or stale).
+        """
+        for attempt in range(2):
+            location = self.locate(marker_id)
+            if location is not None:
+                marker = self._read_at(location.file, location.offset)
+                if marker is not None and marker.get("id") == marker_id:
+                    return marker
+            if attempt == 0:
+                self.refresh()
+        return None
+
+    def query(
+        self,
+        session_id: Optional[str] = None,
+        from_agent: Optional[str] = None,
+        to_agent: Optional[str] = None,
+        state: Optional[str] = None,
+        since: TimeBound = None,
+        until: TimeBound = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Find markers matching all given criteria (as HandoffStorage.queryMarkers).
+
+        Filtering runs on the index; only matching markers are read.
+
+        Returns:
+            Matching markers in timestamp order
+        """
+        clauses = []
+        params: List[object] = []
+        for column, value in (
+            ("session_id", session_id),
+            ("from_agent", from_agent),
+            ("to_agent", to_agent),
+            ("state", state),
+        ):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if since is not None:
+            clauses.append("timestamp >= ?")
+            params.append(_iso(since))
+        if until is not None:
+            clauses.append("timestamp <= ?")
+            params.append(_iso(until))
+
+        sql = "SELECT filename, offset FROM markers"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY timestamp, filename, offset"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        markers = []
+        for name, offset in self._conn.execute(sql, params).fetchall():
+            marker = self._read_at(name, offset)
+            if marker is not None:
+                markers.append(marker)
+        return markers
+
+    def follow(
+        self,
+        interval: float = 1.0,
+        max_interval: float = 10.0,
+        stop: Optional[threading.Event] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yield markers as they are appended to any session file.
+
+        Markers already indexed are not repeated; polling backs off up to
+        ``max_interval`` while nothing changes.
+        """
+        delay = interval
+        while stop is None or not stop.is_set():
+            added = self._index_new()
+            if added:
+                delay = interval
+                yield from added
+                continue
+            if stop is not None:
+                if stop.wait(delay):
+                    break
+            else:
+                time.sleep(delay)
+            delay = min(delay * 2, max_interval)
+
+    # --- columnar export ---------------------------------------------------
+
+    def columns(self) -> Dict[str, List[Any]]:
+        """Indexed marker fields as column lists (see MARKER_COLUMNS)."""
+        rows = self._conn.execute(
+            f"SELECT {', '.join(MARKER_COLUMNS)} FROM markers ORDER BY timestamp, filename, offset"
+        ).fetchall()
+        return {name: [row[i] for row in rows] for i, name in enumerate(MARKER_COLUMNS)}
+
+    def export_columns(self, output_path: str) -> int:
+        """
+        Export the indexed marker fields to a compressed ``.npz`` file.
+
+        String fields become unicode arrays, ``timestamp`` becomes
+        datetime64[ms] (NaT when missing) and ``coherence_score`` float
+        (NaN when missing). Marker contexts are not exported.
+
+        Returns:
+            Number of exported markers
+        """
+        import numpy as np
+
+        data = self.columns()
+        arrays: Dict[str, Any] = {}
+        for name, values in data.items():
+            if name == "coherence_score":
+                arrays[name] = np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+            elif name == "offset":
+                arrays[name] = np.array(values, dtype=np.int64)
+            elif name == "timestamp":
+                arrays[name] = np.array([_to_datetime64(v) for v in values], dtype="datetime64[ms]")
+            else:
+                arrays[name] = np.array(["" if v is None else v for v in values], dtype=str)
+        output = Path(output_path)
+        output.parent.mkdir(parents=True, exist_ok=True)
+        tmp = output.with_name(f".{output.name}.{os.getpid()}.tmp")
+        with open(tmp, "wb") as f:
+            np.savez_compressed(f, **arrays)
+        os.replace(tmp, output)
+        return len(data["id"])
+
+
+def _to_datetime64(value: Optional[str]):
+    """ISO timestamp (as written by ``Date.toISOString``) to UTC datetime64[ms]."""
+    import numpy as np
+
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except (AttributeError, ValueError):
+        return np.datetime64("NaT", "ms")
+    if parsed.tzinfo is not None:
+        parsed = parsed.replace(tzinfo=None) - parsed.utcoffset()
+    return np.datetime64(parsed, "ms")
+
+
+def load_columns(path: str) -> Dict[str, Any]:
+    """Load a file written by ``HandoffStore.export_columns``."""
+    import numpy as np
+
+    with np.load(path) as data:
+        return {name: data[name] for name in data.files}
@@ -0,0 +1,366 @@
+"""
+Log ingestion.
+
+``LogIngestor`` tails every ``LogSource`` at once and turns new lines into
+normalized ``LogRecord`` batches, parsed by the source's ``kind`` (csv, json
+or text). Per-file byte offsets are persisted so restarts never re-read old
+data, and rotated (replaced) or truncated files are detected and read from
+the start. Idle polling costs one ``stat`` per file.
+"""
+
+import codecs
+import csv
+import json
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .logs import LogSource, discover_log_sources
+
+DEFAULT_OFFSETS_PATH = ".claude/cache/log_offsets.json"
+
+DEFAULT_BATCH_SIZE = 1000
+
+# Upper bound on bytes read from one file per poll
+DEFAULT_MAX_READ_BYTES = 1 << 20
+
+# Leading timestamps in text logs: ISO 8601-ish dates, or [HH:MM:SS] (Minecraft)
+_TEXT_TIMESTAMP = re.compile(
+    r"^\[?(\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(?:\.\d+)?(?:Z|[+-]\d{2}:?\d{2})?|\d{2}:\d{2}:\d{2})\]?"
+)
+
+_TIMESTAMP_FIELDS = ("timestamp", "Timestamp", "time", "Time", "ts")
+
+_BOMS = (
+    (codecs.BOM_UTF8, "utf-8"),
+    (codecs.BOM_UTF16_LE, "utf-16-le"),
+    (codecs.BOM_UTF16_BE, "utf-16-be"),
+)
+
+
+@dataclass
+class LogRecord:
+    """One normalized log line."""
+    path: str
+    source: str
+    repo: str
+    kind: str
+    offset: int
+    timestamp: Optional[str]
+    fields: Dict[str, Any]
+
+
+@dataclass
+class _FileState:
+    """Persisted tail position of one file."""
+    offset: int = 0
+    dev: int = 0
+    ino: int = 0
+    encoding: Optional[str] = None
+    header: Optional[List[str]] = None
+
+
+def _newline(encoding: str) -> bytes:
+    return "\n".encode(encoding)
+
+
+def _last_line_end(data: bytes, newline: bytes) -> int:
+    """Index just past the last complete line (0 if there is none)."""
+    width = len(newline)
+    pos = data.rfind(newline)
+    # Multi-byte newlines must be aligned to the code unit boundary
+    while pos > 0 and pos % width:
+        pos = data.rfind(newline, 0, pos)
+    return pos + width if pos >= 0 else 0
+
+
+def _detect_encoding(f) -> Tuple[str, int]:
+    """Encoding of an open binary file from its BOM, and the BOM length."""
+    f.seek(0)
+    head = f.read(4)
+    for bom, encoding in _BOMS:
+        if head.startswith(bom):
+            return encoding, len(bom)
+    return "utf-8", 0
+
+
+def _parse_text(line: str) -> Tuple[Optional[str], Dict[str, Any]]:
+    match = _TEXT_TIMESTAMP.match(line)
+    return (match.group(1) if match else None), {"message": line}
+
+
+def _parse_json(line: str) -> Tuple[Optional[str], Dict[str, Any]]:
+    try:
+        data = json.loads(line)
+    except ValueError:
+        return None, {"message": line, "parse_error": True}
+    if not isinstance(data, dict):
+        return None, {"value": data}
+    for name in _TIMESTAMP_FIELDS:
+        if name in data:
+            return str(data[name]), data
+    return None, data
+
+
+class LogIngestor:
+    """
+    Tail-follow ingestion over many log files.
+
+    Records are delivered at least once: offsets advance as lines are
+    parsed and are persisted by ``save_state`` (``follow`` does this after
+    each batch has been processed by the consumer).
+
+    Example:
+        >>> ingestor = LogIngestor()
+        >>> for batch in ingestor.follow(interval=2.0):
+        ...     for record in batch:
+        ...         print(record.repo, record.timestamp, record.fields)
+    """
+
+    def __init__(
+        self,
+        sources: Optional[Iterable[LogSource]] = None,
+        state_path: Optional[str] = DEFAULT_OFFSETS_PATH,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_read_bytes: int = DEFAULT_MAX_READ_BYTES,
+        start_at_end: bool = False,
+    ):
+        """
+        Args:
+            sources: Log sources to tail (default: discover_log_sources(),
+                including expected files that don't exist yet)
+            state_path: Offsets file, or None to keep offsets in memory only
+            batch_size: Maximum records returned by one poll
+            max_read_bytes: Maximum bytes read from one file per poll
+            start_at_end: For files without saved state, skip existing
+                content and only ingest lines appended from now on
+        """
+        self.sources: Dict[str, LogSource] = {}
+        for source in (sources if sources is not None else discover_log_sources()):
+            self.add_source(source)
+        self.state_path = Path(state_path) if state_path else None
+        self.batch_size = batch_size
+        self.max_read_bytes = max_read_bytes
+        self.start_at_end = start_at_end
+        self._states: Dict[str, _FileState] = self._load_state()
+        self._dirty = False
+        self._cursor = 0  # Round-robin start position across sources
+
+    def add_source(self, source: LogSource):
+        """Start tailing another source (no-op if already tracked)."""
+        self.sources.setdefault(os.path.abspath(source.path), source)
+
+    def _load_state(self) -> Dict[str, _FileState]:
+        if self.state_path is None:
+            return {}
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return {path: _FileState(**state) for path, state in data.items()}
+        except (OSError, ValueError, TypeError):
+            return {}
+
+    def save_state(self):
+        """Persist file offsets if they changed since the last save."""
+        if self.state_path is None or not self._dirty:
+            return
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        data = {path: state.__dict__ for path, state in self._states.items()}
+        tmp = self.state_path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp, self.state_path)
+        self._dirty = False
+
+    def _checkpoint(self) -> Tuple[Dict[str, _FileState], bool]:
+        return {path: replace(state) for path, state in self._states.items()}, self._dirty
+
+    def _restore(self, checkpoint: Tuple[Dict[str, _FileState], bool]):
+        self._states, self._dirty = checkpoint
+
+    def offsets(self) -> Dict[str, int]:
+        """Current byte offset of every tracked file."""
+        return {path: state.offset for path, state in self._states.items()}
+
+    def _sync_state(self, path: str, st: os.stat_result) -> _FileState:
+        """Get the tail state for a file, resetting it on rotation or truncation."""
+        state = self._states.get(path)
+        if state is None:
+            state = _FileState(dev=st.st_dev, ino=st.st_ino)
+            if self.start_at_end:
+                state.offset = st.st_size
+                if self.sources[path].kind == "csv":
+                    state.header = self._read_header(path, state)
+            self._states[path] = state
+            self._dirty = True
+        elif (state.dev, state.ino) != (st.st_dev, st.st_ino) or st.st_size < state.offset:
+            # Rotated (a new file at the same path) or truncated in place
+            self._states[path] = state = _FileState(dev=st.st_dev, ino=st.st_ino)
+            self._dirty = True
+        return state
+
+    def _read_header(self, path: str, state: _FileState) -> Optional[List[str]]:
+        """CSV header of a file whose earlier content is being skipped."""
+        try:
+            with open(path, "rb") as f:
+                state.encoding, bom_length = _detect_encoding(f)
+                f.seek(bom_length)
+                first = f.read(self.max_read_bytes)
+        except OSError:
+            return None
+        text = first.decode(state.encoding, errors="replace")
+        if "\n" not in text:
+            return None
+        line = text.split("\n", 1)[0].rstrip("\r")
+        return next(csv.reader([line])) if line else None
+
+    def _read_lines(self, path: str, state: _FileState, limit: int) -> List[Tuple[int, str]]:
+        """Read up to ``limit`` complete lines past the saved offset."""
+        with open(path, "rb") as f:
+            if state.encoding is None:
+                state.encoding, bom_length = _detect_encoding(f)
+                state.offset = max(state.offset, bom_length)
+            f.seek(state.offset)
+            data = f.read(self.max_read_bytes)
+            newline = _newline(state.encoding)
+            end = _last_line_end(data, newline)
+            # A line longer than max_read_bytes: keep reading until it ends
+            while not end:
+                chunk = f.read(self.max_read_bytes)
+                if not chunk:
+                    return []
+                data += chunk
+                end = _last_line_end(data, newline)
+
+        encoding = state.encoding
+
+        if len(newline) == 1:
+            # Byte-oriented encodings: split raw bytes so offsets stay exact
+            raw_lines = data[:end].split(b"\n")[:-1][:limit]
+            sized = [(line.decode(encoding, errors="replace"), len(line) + 1) for line in raw_lines]
+        else:
+            text = data[:end].decode(encoding, errors="replace")
+            sized = [
+                (line, len(line.encode(encoding)) + len(newline))
+                for line in text.split("\n")[:-1][:limit]
+            ]
+
+        results = []
+        offset = state.offset
+        for line, size in sized:
+            results.append((offset, line.rstrip("\r")))
+            offset += size
+        state.offset = offset
+        self._dirty = True
+        return results
+
+    def _to_records(self, source: LogSource, path: str, state: _FileState,
+                    lines: List[Tuple[int, str]]) -> List[LogRecord]:
+        records = []
+        kind = source.kind
+        for offset, line in lines:
+            if not line:
+                continue
+            if kind == "csv":
+                row = next(csv.reader([line]))
+                if state.header is None:
+                    state.header = row
+                    continue
+                fields: Dict[str, Any] = dict(zip(state.header, row))
+                timestamp = next((fields[n] for n in _TIMESTAMP_FIELDS if n in fields), None)
+            elif kind == "json":
+                timestamp, fields = _parse_json(line)
+            else:
+                timestamp, fields = _parse_text(line)
+            records.append(LogRecord(
+                path=path,
+                source=source.source,
+                repo=source.repo,
+                kind=kind,
+                offset=offset,
+                timestamp=timestamp,
+                fields=fields,
+            ))
+        return records
+
+    def poll(self) -> List[LogRecord]:
+        """
+        Read new lines from all sources.
+
+        Files are visited round-robin starting after the last file that
+        filled a batch, so one busy log can't starve the others.
+
+        Returns:
+            Up to ``batch_size`` new records (empty if nothing changed)
+        """
+        records: List[LogRecord] = []
+        paths = list(self.sources)
+        if not paths:
+            return records
+        start = self._cursor % len(paths)
+        for i in range(len(paths)):
+            index = (start + i) % len(paths)
+            path = paths[index]
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            state = self._sync_state(path, st)
+            if st.st_size <= state.offset:
+                continue
+            try:
+                lines = self._read_lines(path, state, self.batch_size - len(records))
+            except OSError:
+                continue
+            records.extend(self._to_records(self.sources[path], path, state, lines))
+            if len(records) >= self.batch_size:
+                self._cursor = index + 1
+                break
+        return records
+
+    def follow(
+        self,
+        interval: float = 1.0,
+        max_interval: float = 10.0,
+        stop: Optional[threading.Event] = None,
+    ) -> Iterator[List[LogRecord]]:
+        """
+        Yield record batches forever (or until ``stop`` is set).
+
+        When a poll finds nothing the sleep interval doubles up to
+        ``max_interval``; it resets as soon as data arrives. Offsets are
+        saved only after the consumer has processed each batch: if it
+        raises or stops the generator while holding a batch, the offsets
+        go back to before that batch, which is delivered again next time.
+
+        Args:
+            interval: Base seconds between polls when idle
+            max_interval: Longest idle sleep
+            stop: Optional event that ends the loop
+        """
+        delay = interval
+        while stop is None or not stop.is_set():
+            checkpoint = self._checkpoint()
+            batch = self.poll()
+            if batch:
+                delay = interval
+                try:
+                    yield batch
+                except BaseException:
+                    # The consumer failed or stopped mid-batch: deliver it again
+                    self._restore(checkpoint)
+                    raise
+                self.save_state()
+                continue
+            self.save_state()
+            if stop is not None:
+                if stop.wait(delay):
+                    break
+            else:
+                time.sleep(delay)
+            delay = min(delay * 2, max_interval)
+        self.save_state()
@@ -0,0 +1,61 @@
+"""
+JSON encoding helpers.
+
+``dumps`` produces either the pretty-printed output used across the toolkit
+(``indent=2``) or a compact form without whitespace. When ``orjson`` is
+installed it is used for both; otherwise, and for any other ``indent``, the
+standard library encoder is used. Both backends use the same separators and
+turn non-string dict keys into strings the same way. Note that orjson
+writes non-ASCII characters as UTF-8 instead of ``\\u`` escapes, so the
+bytes can differ while the decoded data is the same.
+"""
+
+import json
+from typing import Any, Optional
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+JSON_BACKENDS = ("auto", "orjson", "json")
+
+# Separators for compact stdlib output
+COMPACT_SEPARATORS = (",", ":")
+
+
+def available_backend() -> str:
+    """Name of the backend ``dumps`` uses by default."""
+    return "orjson" if orjson is not None else "json"
+
+
+def dumps(obj: Any, indent: Optional[int] = 2, compact: bool = False, backend: str = "auto") -> str:
+    """
+    Serialize to a JSON string.
+
+    Args:
+        obj: JSON-compatible data (dicts, lists, str, int, float, bool, None)
+        indent: Indentation for pretty output (ignored when compact)
+        compact: Emit no whitespace at all
+        backend: "auto" (orjson when installed), "orjson" or "json"
+
+    Returns:
+        JSON text
+
+    Raises:
+        ValueError: If backend is unknown, or "orjson" is requested but not installed
+    """
+    if backend not in JSON_BACKENDS:
+        raise ValueError(f"Unknown JSON backend: {backend}. Valid backends are: {', '.join(JSON_BACKENDS)}")
+    if backend == "orjson" and orjson is None:
+        raise ValueError("The orjson backend is not installed")
+
+    # orjson only supports two-space indentation, and no spaces at all without it
+    # (the stdlib's indent=None output has ", " and ": " separators)
+    use_orjson = backend != "json" and orjson is not None and (compact or indent == 2)
+    if use_orjson:
+        option = orjson.OPT_NON_STR_KEYS if compact else orjson.OPT_NON_STR_KEYS | orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option).decode("utf-8")
+    if compact:
+        return json.dumps(obj, separators=COMPACT_SEPARATORS)
+    return json.dumps(obj, indent=indent)
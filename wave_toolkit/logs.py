@@ -0,0 +1,296 @@
+"""
+Log source discovery.
+
+Finds log sources across the SpiralSafe ecosystem, as in project-book.ipynb.
+``LogDiscovery`` walks all log roots concurrently with a depth limit and a
+skip list for Minecraft world/cache directories, streams ``LogSource``
+results as they are found, and caches directory listings between calls,
+re-listing only directories whose mtime changed.
+"""
+
+import fnmatch
+import hashlib
+import json
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .framework import RACY_WINDOW_NS, Fingerprint, directory_fingerprint
+
+DEFAULT_LOG_CACHE = ".claude/cache/log_sources.json"
+
+DEFAULT_MAX_DEPTH = 8
+
+# Directories that never contain ecosystem logs but can be enormous
+DEFAULT_SKIP_DIRS = frozenset({
+    ".git",
+    "node_modules",
+    "__pycache__",
+    # Minecraft world data
+    "world",
+    "world_nether",
+    "world_the_end",
+    "region",
+    "playerdata",
+    "DIM-1",
+    "DIM1",
+    # Server runtime caches
+    "cache",
+    ".cache",
+    "libraries",
+    "versions",
+    "bundler",
+})
+
+
+@dataclass(slots=True)
+class LogSource:
+    """Represents a log source in the ecosystem."""
+    path: str
+    source: str
+    repo: str
+    kind: str  # 'csv', 'text', 'json'
+    exists: bool = False
+
+
+@dataclass
+class LogRoot:
+    """A directory searched for log files matching ``pattern``."""
+    path: str
+    source: str
+    repo: str
+    kind: str = "text"
+    pattern: str = "*.log"
+
+
+def default_log_roots(home: Optional[Path] = None) -> List[LogRoot]:
+    """Directories searched for ``*.log`` files across the ecosystem."""
+    home = home or Path.home()
+    return [
+        LogRoot(str(home / "SpiralSafe-FromGitHub" / "bridges"), "spiralsafe", "SpiralSafe"),
+        LogRoot(str(home / "quantum-redstone"), "quantum", "quantum-redstone"),
+        LogRoot(str(home / "repos" / "ClaudeNPC-Server-Suite"), "claudenpc", "ClaudeNPC-Server-Suite"),
+    ]
+
+
+def default_log_files(home: Optional[Path] = None) -> List[LogSource]:
+    """Well-known single-file log sources (reported even when missing)."""
+    home = home or Path.home()
+    return [
+        LogSource(str(home / "bf6_performance_log.csv"), "system", "gaming", "csv"),
+        LogSource(str(home / ".atom-trail"), "spiralsafe", "SpiralSafe", "text"),
+    ]
+
+
+# Cached listing of one directory: (fingerprint, matching file names, subdirectory names)
+_Listing = Tuple[Fingerprint, List[str], List[str]]
+
+
+class LogDiscovery:
+    """
+    Concurrent, cached discovery of ecosystem log sources.
+
+    Example:
+        >>> discovery = LogDiscovery()
+        >>> for source in discovery.iter_sources():
+        ...     print(source.repo, source.path)
+    """
+
+    def __init__(
+        self,
+        roots: Optional[List[LogRoot]] = None,
+        files: Optional[List[LogSource]] = None,
+        max_depth: int = DEFAULT_MAX_DEPTH,
+        skip_dirs: Iterable[str] = DEFAULT_SKIP_DIRS,
+        cache_path: Optional[str] = DEFAULT_LOG_CACHE,
+        workers: Optional[int] = None,
+    ):
+        """
+        Args:
+            roots: Directories to search (default: default_log_roots())
+            files: Fixed files to report (default: default_log_files())
+            max_depth: Maximum directory depth below each root
+            skip_dirs: Directory names never descended into
+            cache_path: Listing cache file, or None to cache in memory only
+            workers: Thread pool size (default: one thread per root)
+        """
+        self.roots = roots if roots is not None else default_log_roots()
+        self.files = files if files is not None else default_log_files()
+        self.max_depth = max_depth
+        self.skip_dirs = frozenset(skip_dirs)
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.workers = workers
+        self._cache: Optional[Dict[str, Dict[str, _Listing]]] = None
+
+    def _config_key(self) -> str:
+        config = json.dumps([self.max_depth, sorted(self.skip_dirs)])
+        return hashlib.sha1(config.encode("utf-8")).hexdigest()[:12]
+
+    def _load_cache(self) -> Dict[str, Dict[str, _Listing]]:
+        if self._cache is None:
+            self._cache = {}
+            if self.cache_path is not None:
+                try:
+                    with open(self.cache_path, "r", encoding="utf-8") as f:
+                        data = json.load(f)
+                    if data.get("config") == self._config_key():
+                        self._cache = {
+                            root: {
+                                rel: ((mtime_ns, nlink), matches, subdirs)
+                                for rel, (mtime_ns, nlink, matches, subdirs) in dirs.items()
+                            }
+                            for root, dirs in data["roots"].items()
+                        }
+                except (OSError, ValueError, KeyError, TypeError):
+                    self._cache = {}
+        return self._cache
+
+    def _save_cache(self):
+        if self.cache_path is None or self._cache is None:
+            return
+        data = {
+            "config": self._config_key(),
+            "roots": {
+                root: {
+                    rel: [fp[0], fp[1], matches, subdirs]
+                    for rel, (fp, matches, subdirs) in dirs.items()
+                }
+                for root, dirs in self._cache.items()
+            },
+        }
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.cache_path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp, self.cache_path)
+
+    def _list_directory(self, path: str, pattern: str) -> Tuple[List[str], List[str]]:
+        matches: List[str] = []
+        subdirs: List[str] = []
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    name = entry.name
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            if name not in self.skip_dirs:
+                                subdirs.append(name)
+                        elif fnmatch.fnmatch(name, pattern) and entry.is_file():
+                            matches.append(name)
+                    except OSError:
+                        continue
+        except OSError:
+            pass
+        matches.sort()
+        subdirs.sort()
+        return matches, subdirs
+
+    def _walk_root(self, root: LogRoot, cached: Dict[str, _Listing], stop: threading.Event) -> Iterator[LogSource]:
+        """Depth-limited walk of one root, reusing cached listings."""
+        fresh: Dict[str, _Listing] = {}
+        stack: List[Tuple[str, int]] = [("", 0)]
+        while stack and not stop.is_set():
+            rel, depth = stack.pop()
+            path = os.path.join(root.path, rel) if rel else root.path
+            fingerprint = directory_fingerprint(path)
+            if fingerprint is None:
+                continue
+            hit = cached.get(rel)
+            if hit is not None and hit[0] == fingerprint:
+                matches, subdirs = hit[1], hit[2]
+            else:
+                matches, subdirs = self._list_directory(path, root.pattern)
+            if fingerprint[0] <= time.time_ns() - RACY_WINDOW_NS:
+                fresh[rel] = (fingerprint, matches, subdirs)
+            for name in matches:
+                yield LogSource(
+                    path=os.path.join(path, name),
+                    source=root.source,
+                    repo=root.repo,
+                    kind=root.kind,
+                    exists=True,
+                )
+            if depth < self.max_depth:
+                for name in reversed(subdirs):
+                    stack.append((f"{rel}/{name}" if rel else name, depth + 1))
+        if not stop.is_set():
+            cached.clear()
+            cached.update(fresh)
+
+    def iter_sources(self) -> Iterator[LogSource]:
+        """
+        Stream log sources as they are found.
+
+        Fixed files come first; files under the roots follow in whatever
+        order the concurrent walks produce them. The listing cache is saved
+        once every root has been walked completely.
+        """
+        for log_file in self.files:
+            yield LogSource(
+                path=log_file.path,
+                source=log_file.source,
+                repo=log_file.repo,
+                kind=log_file.kind,
+                exists=os.path.exists(log_file.path),
+            )
+
+        cache = self._load_cache()
+        key = lambda root: f"{root.path}|{root.pattern}"
+        for root in self.roots:
+            cache.setdefault(key(root), {})
+
+        results: "queue.Queue" = queue.Queue()
+        stop = threading.Event()
+        done = object()
+
+        def worker(root: LogRoot):
+            try:
+                for source in self._walk_root(root, cache[key(root)], stop):
+                    results.put(source)
+            finally:
+                results.put(done)
+
+        pool = ThreadPoolExecutor(max_workers=self.workers or max(1, len(self.roots)))
+        try:
+            for root in self.roots:
+                pool.submit(worker, root)
+            remaining = len(self.roots)
+            while remaining:
+                item = results.get()
+                if item is done:
+                    remaining -= 1
+                else:
+                    yield item
+        finally:
+            stop.set()
+            pool.shutdown(wait=True)
+        self._save_cache()
+
+    def discover(self) -> List[LogSource]:
+        """
+        Discover all log sources.
+
+        Returns:
+            List of LogSource objects in a stable order: the default single
+            files first, then each root's files sorted by path
+        """
+        sources = list(self.iter_sources())
+        fixed = sources[:len(self.files)]
+        order = {(root.source, root.repo): i for i, root in enumerate(self.roots)}
+        found = sorted(sources[len(self.files):], key=lambda s: (order.get((s.source, s.repo), 0), s.path))
+        return fixed + found
+
+
+def discover_log_sources() -> List[LogSource]:
+    """
+    Discover log sources across the SpiralSafe ecosystem.
+
+    Returns:
+        List of LogSource objects
+    """
+    return LogDiscovery(cache_path=None).discover()
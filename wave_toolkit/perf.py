@@ -0,0 +1,302 @@
+"""
+Opt-in performance instrumentation.
+
+Hot paths are wrapped in ``stage`` context managers or ``@profiled`` and
+report counts through ``count`` and ``cache``. Nothing is recorded unless
+profiling is enabled - with ``WAVE_PROFILE=1`` in the environment, or by
+calling ``enable()`` - and while disabled each hook is a single global
+check.
+
+With ``WAVE_PROFILE=1`` the profile is written at exit to
+``WAVE_PROFILE_DIR`` (default ``.claude/perf``):
+
+- ``profile-<pid>.json``: per-stage calls, total and self time, counters,
+  cache hit rates and peak memory
+- ``profile-<pid>.collapsed``: one ``stage;substage <self-microseconds>``
+  line per stack, for flamegraph.pl, speedscope or inferno
+
+Peak memory is the process's peak RSS; set ``WAVE_PROFILE_MEMORY=1`` as
+well to also trace Python allocations with tracemalloc (slower).
+
+Example:
+    >>> from wave_toolkit import perf
+    >>> @perf.profiled("scan.file")
+    ... def scan(path):
+    ...     data = open(path, "rb").read()
+    ...     perf.count("scan.bytes", len(data))
+    >>> with perf.stage("scan"):
+    ...     scan("README.md")
+"""
+
+import atexit
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+ENV_VAR = "WAVE_PROFILE"
+DIR_ENV_VAR = "WAVE_PROFILE_DIR"
+MEMORY_ENV_VAR = "WAVE_PROFILE_MEMORY"
+DEFAULT_PROFILE_DIR = ".claude/perf"
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class _Stage:
+    """Active timing of one stage on the current thread."""
+    __slots__ = ("_profiler", "_name", "_start")
+
+    def __init__(self, profiler: "Profiler", name: str):
+        self._profiler = profiler
+        self._name = name
+
+    def __enter__(self) -> "_Stage":
+        self._profiler._stack().append(self._name)
+        self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info):
+        elapsed = time.perf_counter_ns() - self._start
+        stack = self._profiler._stack()
+        key = tuple(stack)
+        stack.pop()
+        self._profiler._record(key, elapsed)
+
+
+class _NullStage:
+    """Stage used while profiling is disabled."""
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullStage":
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+_NULL_STAGE = _NullStage()
+
+
+class Profiler:
+    """
+    Collects stage timings, counters and cache statistics.
+
+    Stages nest per thread; a stage's self time is its total time minus the
+    time spent in stages nested inside it.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        # stack -> [calls, total_ns, child_ns]
+        self._stages: Dict[Tuple[str, ...], List[int]] = {}
+        self._counters: Dict[str, int] = {}
+        self._caches: Dict[str, List[int]] = {}
+        self.started = time.time()
+        self._start_ns = time.perf_counter_ns()
+
+    def _stack(self) -> List[str]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _record(self, key: Tuple[str, ...], elapsed: int):
+        with self._lock:
+            entry = self._stages.get(key)
+            if entry is None:
+                entry = self._stages[key] = [0, 0, 0]
+            entry[0] += 1
+            entry[1] += elapsed
+            if len(key) > 1:
+                parent = self._stages.get(key[:-1])
+                if parent is None:
+                    parent = self._stages[key[:-1]] = [0, 0, 0]
+                parent[2] += elapsed
+
+    def stage(self, name: str) -> _Stage:
+        """Context manager timing ``name`` nested under the current stage."""
+        return _Stage(self, name)
+
+    def count(self, name: str, n: int = 1):
+        """Add ``n`` to counter ``name``."""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + n
+
+    def cache(self, name: str, hits: int = 0, misses: int = 0):
+        """Record cache hits and misses for cache ``name``."""
+        with self._lock:
+            entry = self._caches.setdefault(name, [0, 0])
+            entry[0] += hits
+            entry[1] += misses
+
+    def report(self) -> Dict[str, Any]:
+        """Profile as a JSON-serializable dictionary."""
+        with self._lock:
+            stages = [
+                {
+                    "stack": ";".join(key),
+                    "name": key[-1],
+                    "depth": len(key) - 1,
+                    "calls": calls,
+                    "total_ms": round(total / 1e6, 3),
+                    "self_ms": round(max(total - child, 0) / 1e6, 3),
+                }
+                for key, (calls, total, child) in sorted(self._stages.items())
+                if calls
+            ]
+            counters = dict(sorted(self._counters.items()))
+            caches = {
+                name: {
+                    "hits": hits,
+                    "misses": misses,
+                    "hit_rate": round(hits / (hits + misses), 4) if hits + misses else None,
+                }
+                for name, (hits, misses) in sorted(self._caches.items())
+            }
+        return {
+            "pid": os.getpid(),
+            "argv": sys.argv,
+            "started": self.started,
+            "wall_ms": round((time.perf_counter_ns() - self._start_ns) / 1e6, 3),
+            "peak_memory": peak_memory(),
+            "stages": stages,
+            "counters": counters,
+            "caches": caches,
+        }
+
+    def collapsed(self) -> str:
+        """Collapsed stacks (``a;b;c <self microseconds>``) for flamegraph tools."""
+        with self._lock:
+            items = sorted(self._stages.items())
+        lines = []
+        for key, (_calls, total, child) in items:
+            micros = max(total - child, 0) // 1000
+            if micros:
+                lines.append(f"{';'.join(key)} {micros}")
+        return "\n".join(lines) + ("\n" if lines else "")
+
+    def dump(self, directory: Optional[str] = None) -> Tuple[Path, Path]:
+        """
+        Write ``profile-<pid>.json`` and ``profile-<pid>.collapsed``.
+
+        Args:
+            directory: Output directory (default: ``$WAVE_PROFILE_DIR`` or
+                ``.claude/perf``)
+
+        Returns:
+            (json_path, collapsed_path)
+        """
+        out = Path(directory or os.environ.get(DIR_ENV_VAR) or DEFAULT_PROFILE_DIR)
+        out.mkdir(parents=True, exist_ok=True)
+        json_path = out / f"profile-{os.getpid()}.json"
+        collapsed_path = out / f"profile-{os.getpid()}.collapsed"
+        json_path.write_text(json.dumps(self.report(), indent=2), encoding="utf-8")
+        collapsed_path.write_text(self.collapsed(), encoding="utf-8")
+        return json_path, collapsed_path
+
+
+def peak_memory() -> Dict[str, Optional[int]]:
+    """Peak resident set size and, if tracemalloc is tracing, peak traced bytes."""
+    rss = None
+    if resource is not None:
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        if sys.platform != "darwin":
+            rss *= 1024  # Linux reports KiB
+    # Only imported by someone who wants it traced
+    tracemalloc = sys.modules.get("tracemalloc")
+    traced = tracemalloc.get_traced_memory()[1] if tracemalloc and tracemalloc.is_tracing() else None
+    return {"peak_rss_bytes": rss, "peak_traced_bytes": traced}
+
+
+# Active profiler; None while disabled
+_profiler: Optional[Profiler] = None
+
+
+def enable() -> Profiler:
+    """Start profiling (or return the active profiler)."""
+    global _profiler
+    if _profiler is None:
+        _profiler = Profiler()
+    return _profiler
+
+
+def disable() -> Optional[Profiler]:
+    """Stop profiling; return the profiler that was active."""
+    global _profiler
+    profiler, _profiler = _profiler, None
+    return profiler
+
+
+def enabled() -> bool:
+    """Whether profiling is active."""
+    return _profiler is not None
+
+
+def get_profiler() -> Optional[Profiler]:
+    """The active profiler, if any."""
+    return _profiler
+
+
+def stage(name: str):
+    """Time a block as stage ``name`` (no-op while disabled)."""
+    profiler = _profiler
+    return _NULL_STAGE if profiler is None else _Stage(profiler, name)
+
+
+def count(name: str, n: int = 1):
+    """Add ``n`` to counter ``name`` (no-op while disabled)."""
+    if _profiler is not None:
+        _profiler.count(name, n)
+
+
+def cache(name: str, hits: int = 0, misses: int = 0):
+    """Record cache hits and misses (no-op while disabled)."""
+    if _profiler is not None:
+        _profiler.cache(name, hits, misses)
+
+
+def profiled(name: Optional[str] = None) -> Callable[[F], F]:
+    """
+    Decorator timing every call as a stage.
+
+    Args:
+        name: Stage name (default: ``module.qualname`` of the function)
+    """
+    def decorator(func: F) -> F:
+        stage_name = name or f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            profiler = _profiler
+            if profiler is None:
+                return func(*args, **kwargs)
+            with _Stage(profiler, stage_name):
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def _dump_at_exit():
+    if _profiler is not None:
+        json_path, collapsed_path = _profiler.dump()
+        print(f"wave profile: {json_path} {collapsed_path}", file=sys.stderr)
+
+
+if os.environ.get(ENV_VAR, "").strip().lower() in ("1", "true", "yes", "on"):
+    enable()
+    if os.environ.get(MEMORY_ENV_VAR):
+        import tracemalloc
+        tracemalloc.start()
+    atexit.register(_dump_at_exit)
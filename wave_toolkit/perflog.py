@@ -0,0 +1,407 @@
+"""
+BF6 performance log loader.
+
+Reads the CSV written by scripts/gaming/BF6_Performance_Monitor.ps1
+(``~/bf6_performance_log.csv``) into NumPy column arrays. The file is parsed
+in chunks of complete lines; with a cache directory the columns are kept as
+raw binary files that are memory-mapped on load and only extended with rows
+appended since the last refresh. Requires NumPy.
+
+The monitor logs ``FPS_Estimate`` as a bucket ("60+", "45-60", "30-45",
+"<30") and "N/A" for unavailable readings. Buckets are converted to their
+bound ("45-60" -> 45, "60+" -> 60, "<30" -> 30) and "N/A" to NaN.
+"""
+
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .ingest import _detect_encoding, _last_line_end, _newline
+
+PERFORMANCE_COLUMNS = (
+    "CPU_Percent",
+    "RAM_Used_GB",
+    "RAM_Available_GB",
+    "GPU_Temp",
+    "FPS_Estimate",
+    "Network_Latency_ms",
+    "Disk_Usage_Percent",
+)
+
+DEFAULT_CACHE_DIR = ".claude/cache/perflog"
+
+DEFAULT_CHUNK_ROWS = 65536
+
+DEFAULT_PERCENTILES = (50, 95, 99)
+
+# Rolling windows are evaluated this many output rows at a time
+_ROLLING_BLOCK = 16384
+
+_FPS_BUCKET = re.compile(r"^\s*(?:<\s*)?(\d+(?:\.\d+)?)\s*(?:\+|-\s*\d+(?:\.\d+)?)?\s*$")
+
+
+def default_log_path() -> Path:
+    """Where the monitor script writes its log."""
+    return Path.home() / "bf6_performance_log.csv"
+
+
+def _to_float(value: str) -> float:
+    try:
+        return float(value)
+    except ValueError:
+        match = _FPS_BUCKET.match(value)
+        return float(match.group(1)) if match else np.nan
+
+
+def _parse_column(values: List[str], convert: Callable[[str], float] = _to_float) -> np.ndarray:
+    """Convert a column of strings, converting each distinct value once on the slow path."""
+    try:
+        return np.array(values, dtype=np.float64)
+    except ValueError:
+        uniques, inverse = np.unique(np.array(values), return_inverse=True)
+        return np.array([convert(u) for u in uniques], dtype=np.float64)[inverse]
+
+
+def _parse_timestamps(values: List[str]) -> np.ndarray:
+    try:
+        return np.array(values, dtype="datetime64[s]").astype(np.int64)
+    except ValueError:
+        out = np.empty(len(values), dtype=np.int64)
+        for i, value in enumerate(values):
+            try:
+                out[i] = np.datetime64(value, "s").astype(np.int64)
+            except ValueError:
+                out[i] = np.datetime64("NaT").astype(np.int64)
+        return out
+
+
+def _window_percentiles(windows: np.ndarray, percentiles: Sequence[float]) -> np.ndarray:
+    """NaN-ignoring linear percentiles of each row of ``windows``."""
+    ordered = np.sort(windows, axis=1)  # NaN sorts last
+    valid = np.count_nonzero(~np.isnan(windows), axis=1)
+    rows = np.arange(len(ordered))
+    out = np.full((len(percentiles), len(ordered)), np.nan)
+    has_data = valid > 0
+    for i, q in enumerate(percentiles):
+        position = (valid - 1).clip(min=0) * (q / 100.0)
+        lower = np.floor(position).astype(np.int64)
+        upper = np.minimum(lower + 1, (valid - 1).clip(min=0))
+        fraction = position - lower
+        value = ordered[rows, lower] * (1 - fraction) + ordered[rows, upper] * fraction
+        out[i, has_data] = value[has_data]
+    return out
+
+
+def rolling_percentiles(
+    values: np.ndarray,
+    window: int,
+    percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+) -> Dict[str, np.ndarray]:
+    """
+    Percentiles over a trailing window of ``window`` rows.
+
+    The first ``window - 1`` positions use the rows available so far. NaN
+    readings are ignored; windows without any data yield NaN.
+
+    Returns:
+        Arrays keyed "p50", "p95", ... with one value per input row
+    """
+    values = np.asarray(values, dtype=np.float64)
+    n = len(values)
+    out = {f"p{q:g}": np.full(n, np.nan) for q in percentiles}
+    if n == 0 or window < 1:
+        return out
+    # Pad the front so every position has a full window
+    padded = np.concatenate([np.full(window - 1, np.nan), values])
+    windows = np.lib.stride_tricks.sliding_window_view(padded, window)
+    for start in range(0, n, _ROLLING_BLOCK):
+        block = _window_percentiles(windows[start:start + _ROLLING_BLOCK], percentiles)
+        for i, q in enumerate(percentiles):
+            out[f"p{q:g}"][start:start + len(block[i])] = block[i]
+    return out
+
+
+def per_minute(timestamps: np.ndarray, values: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Aggregate a column by calendar minute.
+
+    Args:
+        timestamps: Seconds since the epoch (int64) or datetime64 values
+        values: Column values aligned with ``timestamps``
+
+    Returns:
+        Dict with "minute" (datetime64[m]) and "count", "mean", "min",
+        "max" arrays; NaN readings are excluded from every aggregate
+    """
+    seconds = np.asarray(timestamps).astype("datetime64[s]").astype(np.int64)
+    values = np.asarray(values, dtype=np.float64)
+    minutes = seconds // 60
+    if len(minutes) > 1 and np.any(minutes[1:] < minutes[:-1]):
+        order = np.argsort(minutes, kind="stable")
+        minutes, values = minutes[order], values[order]
+    if len(minutes) == 0:
+        empty = np.array([], dtype=np.float64)
+        return {"minute": np.array([], dtype="datetime64[m]"), "count": np.array([], dtype=np.int64),
+                "mean": empty, "min": empty, "max": empty}
+
+    starts = np.flatnonzero(np.r_[True, minutes[1:] != minutes[:-1]])
+    valid = ~np.isnan(values)
+    count = np.add.reduceat(valid.astype(np.int64), starts)
+    total = np.add.reduceat(np.where(valid, values, 0.0), starts)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.where(count > 0, total / count, np.nan)
+    return {
+        "minute": minutes[starts].astype("datetime64[m]"),
+        "count": count,
+        "mean": mean,
+        "min": np.fmin.reduceat(values, starts),
+        "max": np.fmax.reduceat(values, starts),
+    }
+
+
+class PerformanceLog:
+    """
+    Columnar view of a BF6 performance log with incremental refresh.
+
+    Example:
+        >>> log = PerformanceLog()
+        >>> stats = log.rolling_percentiles("frame_time_ms", window=30)
+        >>> log.refresh()  # later: parse only rows appended since
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        cache_dir: Optional[str] = DEFAULT_CACHE_DIR,
+        chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    ):
+        """
+        Args:
+            path: CSV file (default: ~/bf6_performance_log.csv)
+            cache_dir: Directory for memory-mapped column caches, or None
+                to keep the columns in memory only
+            chunk_rows: Approximate number of rows parsed per chunk
+        """
+        self.path = Path(path) if path else default_log_path()
+        self.chunk_rows = chunk_rows
+        self.cache_dir: Optional[Path] = None
+        if cache_dir:
+            key = hashlib.sha1(str(self.path.resolve()).encode("utf-8")).hexdigest()[:16]
+            self.cache_dir = Path(cache_dir) / key
+        self._meta = self._empty_meta()
+        self.timestamps = np.array([], dtype="datetime64[s]")
+        self.columns: Dict[str, np.ndarray] = {
+            name: np.array([], dtype=np.float64) for name in PERFORMANCE_COLUMNS
+        }
+        if self.cache_dir is not None:
+            self._load_cache()
+        self.refresh()
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @staticmethod
+    def _empty_meta() -> dict:
+        return {"rows": 0, "offset": 0, "dev": 0, "ino": 0, "encoding": None, "header": None}
+
+    # --- cache -----------------------------------------------------------
+
+    def _column_file(self, name: str) -> Path:
+        return self.cache_dir / f"{name}.bin"
+
+    def _load_cache(self):
+        try:
+            with open(self.cache_dir / "meta.json", "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta.get("source") != str(self.path.resolve()):
+                return
+        except (OSError, ValueError):
+            return
+        self._meta = {key: meta.get(key, value) for key, value in self._empty_meta().items()}
+        try:
+            self._map_columns()
+        except (OSError, ValueError):
+            self._reset()
+
+    def _map_columns(self):
+        rows = self._meta["rows"]
+
+        def mapped(name: str, dtype) -> np.ndarray:
+            if rows == 0:
+                return np.array([], dtype=dtype)
+            return np.memmap(self._column_file(name), dtype=dtype, mode="r", shape=(rows,))
+
+        self.timestamps = mapped("timestamp", np.int64).view("datetime64[s]")
+        self.columns = {name: mapped(name, np.float64) for name in PERFORMANCE_COLUMNS}
+
+    def _save_meta(self):
+        meta = dict(self._meta, source=str(self.path.resolve()))
+        target = self.cache_dir / "meta.json"
+        tmp = target.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp, target)
+
+    def _append_cache(self, timestamps: np.ndarray, columns: Dict[str, np.ndarray]):
+        """Append parsed rows to the column files, then commit the row count."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        rows = self._meta["rows"]
+        for name, array in [("timestamp", timestamps)] + list(columns.items()):
+            with open(self._column_file(name), "ab") as f:
+                # Drop bytes past the committed row count (an interrupted append)
+                f.truncate(rows * array.itemsize)
+                array.tofile(f)
+
+    def _reset(self):
+        self._meta = self._empty_meta()
+        self.timestamps = np.array([], dtype="datetime64[s]")
+        self.columns = {name: np.array([], dtype=np.float64) for name in PERFORMANCE_COLUMNS}
+
+    # --- parsing ---------------------------------------------------------
+
+    def _parse_chunk(self, text: str):
+        """Parse a block of complete lines into column arrays."""
+        text = text.replace("\r", "")
+        header = self._meta["header"]
+        if header is None:
+            first, _, text = text.partition("\n")
+            header = self._meta["header"] = first.strip().split(",")
+        width = len(header)
+        body = text.rstrip("\n")
+        row_count = body.count("\n") + 1 if body else 0
+        # Fast path: one split over the whole chunk, columns taken by stride
+        flat = body.replace("\n", ",").split(",") if body else []
+        if len(flat) == row_count * width:
+            fields = [flat[i::width] for i in range(width)]
+        else:
+            rows = [row for row in (line.split(",") for line in body.split("\n")) if len(row) == width]
+            row_count = len(rows)
+            fields = [list(column) for column in zip(*rows)] if rows else [[] for _ in range(width)]
+        index = {name: i for i, name in enumerate(header)}
+
+        if "Timestamp" in index:
+            timestamps = _parse_timestamps(fields[index["Timestamp"]])
+        else:
+            timestamps = np.full(row_count, np.datetime64("NaT").astype(np.int64))
+        columns = {
+            name: _parse_column(fields[index[name]]) if name in index else np.full(row_count, np.nan)
+            for name in PERFORMANCE_COLUMNS
+        }
+        return timestamps, columns
+
+    def refresh(self) -> int:
+        """
+        Parse rows appended since the last load or refresh.
+
+        A replaced or truncated log file is re-read from the start.
+
+        Returns:
+            Number of new rows
+        """
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return 0
+        meta = self._meta
+        if (meta["dev"], meta["ino"]) != (st.st_dev, st.st_ino) or st.st_size < meta["offset"]:
+            self._reset()
+            meta = self._meta
+            meta["dev"], meta["ino"] = st.st_dev, st.st_ino
+        if st.st_size <= meta["offset"]:
+            return 0
+
+        new_times: List[np.ndarray] = []
+        new_columns: Dict[str, List[np.ndarray]] = {name: [] for name in PERFORMANCE_COLUMNS}
+        chunk_bytes = max(self.chunk_rows, 1) * 96
+        with open(self.path, "rb") as f:
+            if meta["encoding"] is None:
+                meta["encoding"], bom_length = _detect_encoding(f)
+                meta["offset"] = max(meta["offset"], bom_length)
+            encoding = meta["encoding"]
+            newline = _newline(encoding)
+            f.seek(meta["offset"])
+            pending = b""
+            while True:
+                data = f.read(chunk_bytes)
+                if not data:
+                    break
+                pending += data
+                end = _last_line_end(pending, newline)
+                if not end:
+                    continue
+                text = pending[:end].decode(encoding, errors="replace")
+                pending = pending[end:]
+                meta["offset"] += end
+                if text.strip():
+                    timestamps, columns = self._parse_chunk(text)
+                    new_times.append(timestamps)
+                    for name in PERFORMANCE_COLUMNS:
+                        new_columns[name].append(columns[name])
+
+        if not new_times:
+            return 0
+        timestamps = np.concatenate(new_times)
+        columns = {name: np.concatenate(parts) for name, parts in new_columns.items()}
+        added = len(timestamps)
+
+        if self.cache_dir is not None:
+            # Release the current maps before extending the files underneath them
+            self.timestamps, self.columns = timestamps[:0].view("datetime64[s]"), {}
+            self._append_cache(timestamps, columns)
+            meta["rows"] += added
+            self._save_meta()
+            self._map_columns()
+        else:
+            meta["rows"] += added
+            self.timestamps = np.concatenate([self.timestamps, timestamps.view("datetime64[s]")])
+            self.columns = {
+                name: np.concatenate([self.columns[name], columns[name]]) for name in PERFORMANCE_COLUMNS
+            }
+        return added
+
+    # --- analytics -------------------------------------------------------
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Get a column by name.
+
+        Besides the CSV columns, ``frame_time_ms`` is derived from
+        ``FPS_Estimate`` as 1000 / fps.
+        """
+        if name == "frame_time_ms":
+            fps = self.columns["FPS_Estimate"]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                return np.where(fps > 0, 1000.0 / fps, np.nan)
+        return self.columns[name]
+
+    def rolling_percentiles(
+        self,
+        name: str = "frame_time_ms",
+        window: int = 60,
+        percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+    ) -> Dict[str, np.ndarray]:
+        """Trailing-window percentiles of a column (see rolling_percentiles())."""
+        return rolling_percentiles(self.column(name), window, percentiles)
+
+    def per_minute(self, name: str) -> Dict[str, np.ndarray]:
+        """Per-minute aggregates of a column (see per_minute())."""
+        return per_minute(self.timestamps, self.column(name))
+
+
+def load_performance_log(path: Optional[str] = None, **kwargs) -> PerformanceLog:
+    """
+    Load a BF6 performance log into column arrays.
+
+    Args:
+        path: CSV file (default: ~/bf6_performance_log.csv)
+        **kwargs: Passed to PerformanceLog
+
+    Returns:
+        PerformanceLog with ``timestamps`` and ``columns``
+    """
+    return PerformanceLog(path, **kwargs)
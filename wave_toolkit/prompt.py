@@ -0,0 +1,239 @@
+"""
+System prompt rendering.
+
+Renders the Claude system prompt for a Wave context, as
+``generate_system_prompt`` in project-book.ipynb. The template is split once
+into static text and named fields, and ``PromptRenderer`` compiles it into a
+single function around one f-string, with each field's expression inlined
+into it, so rendering runs at the speed of the hand-written f-string.
+"""
+
+import re
+from functools import wraps
+from itertools import product
+from operator import attrgetter
+from string import Formatter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+
+SYSTEM_PROMPT_TEMPLATE = """# Claude System Context
+
+You are Claude, running in an interactive Jupyter notebook within the Wave Toolkit ecosystem.
+
+## Environment (Auto-Detected)
+- **Machine:** {machine_name} ({machine_arch}, {machine_cores} cores)
+- **OS:** {machine_os}
+- **User:** {user_info}
+- **Environment:** {shell_name} {shell_version} ({shell_environment})
+- **Working Directory:** {cwd}
+- **Git Repo:** {git_status}
+- **Available Tools:** {tools}
+
+## Operating Principles
+1. Provide concrete, executable code cells for Python/Jupyter
+2. Prefer idempotent operations (safe to re-run)
+3. Include verification steps after actions
+4. State assumptions explicitly
+5. When uncertain, ask rather than guess
+
+## Collaboration Style
+- Think out loud - share reasoning
+- Offer alternatives when multiple approaches exist
+- Build on context from earlier in the session
+- Trust flows both ways
+
+"""
+
+TIMESTAMP_LINE = "*Context generated: {timestamp}*\n"
+
+# Tool flags in display order, with their labels
+PROMPT_TOOLS = (
+    ("git", "git"),
+    ("node", "node/npm"),
+    ("python", "python"),
+    ("docker", "docker"),
+    ("jupyter", "jupyter"),
+)
+
+# A field is a Python expression over the context ``ctx``, or a function of it
+FieldSpec = Union[str, Callable[[Any], Any]]
+
+# Plain attribute reads are inlined into the f-string itself
+_ATTRIBUTE_READ = re.compile(r"ctx(\.[A-Za-z_]\w*)+")
+
+_tool_flags = attrgetter(*(attr for attr, _label in PROMPT_TOOLS))
+
+# Every combination of tool flags -> its "Available Tools" text
+_TOOL_LABELS = {
+    flags: ", ".join(label for (_attr, label), on in zip(PROMPT_TOOLS, flags) if on) or "none detected"
+    for flags in product((False, True), repeat=len(PROMPT_TOOLS))
+}
+
+
+def _tools(ctx) -> str:
+    return _TOOL_LABELS[tuple(map(bool, _tool_flags(ctx.tools)))]
+
+
+# Template field -> how to read it from a WaveContext
+PROMPT_FIELDS: Dict[str, FieldSpec] = {
+    "machine_name": "ctx.machine.name",
+    "machine_arch": "ctx.machine.arch",
+    "machine_cores": "ctx.machine.cores",
+    "machine_os": "ctx.machine.os",
+    "user_info": 'f"{ctx.user.domain}\\\\{ctx.user.name}" if ctx.user.domain else ctx.user.name',
+    "shell_name": "ctx.shell.name",
+    "shell_version": "ctx.shell.version",
+    "shell_environment": "ctx.shell.environment",
+    "cwd": "ctx.session.cwd",
+    "git_status": 'f"Yes (branch: {ctx.session.git_branch})" if ctx.session.is_git_repo else "No"',
+    # Flags are bools in practice; anything else takes the slower, normalizing path
+    "tools": "_TOOL_LABELS.get((%s,)) or _tools(ctx)" % ", ".join(f"ctx.tools.{attr}" for attr, _label in PROMPT_TOOLS),
+    "timestamp": "ctx.timestamp",
+}
+
+
+class PromptTemplate:
+    """
+    A template pre-split into static and dynamic segments.
+
+    Only plain ``{name}`` fields are supported; rendering is a single join
+    over the precompiled segments.
+    """
+
+    def __init__(self, template: str):
+        self.template = template
+        self._static: List[str] = [""]
+        self.fields: List[str] = []
+        for literal, name, spec, conversion in Formatter().parse(template):
+            if spec or conversion:
+                raise ValueError(f"Unsupported field format in prompt template: {name!r}")
+            # Escaped braces arrive as extra literal-only pieces; merge them
+            self._static[-1] += literal
+            if name is not None:
+                self.fields.append(name)
+                self._static.append("")
+
+    def render(self, values: Iterable[Any]) -> str:
+        """Render with field values given in ``fields`` order."""
+        parts = [self._static[0]]
+        for value, literal in zip(values, self._static[1:]):
+            parts.append(str(value))
+            parts.append(literal)
+        return "".join(parts)
+
+
+def compile_template(template: PromptTemplate, fields: Dict[str, FieldSpec]) -> Callable[[Any], str]:
+    """
+    Compile a template into one function of the context.
+
+    The static text is inlined into a single f-string. Plain ``ctx.a.b``
+    reads go straight into it; other expressions are evaluated into locals
+    first (they may use this module's helpers) and functions are called.
+
+    Raises:
+        ValueError: If a field has no spec or its expression does not parse
+    """
+    missing = [name for name in template.fields if name not in fields]
+    if missing:
+        raise ValueError(f"No extractor for prompt fields: {', '.join(missing)}")
+    namespace: Dict[str, Any] = dict(globals())
+    lines = []
+    parts = []
+    for i, literal in enumerate(template._static):
+        parts.append(literal.replace("{", "{{").replace("}", "}}"))
+        if i == len(template.fields):
+            break
+        spec = fields[template.fields[i]]
+        if callable(spec):
+            namespace[f"_f{i}"] = spec
+            lines.append(f"_v{i} = _f{i}(ctx)")
+        elif isinstance(spec, str) and _ATTRIBUTE_READ.fullmatch(spec):
+            parts.append(f"{{{spec}}}")
+            continue
+        else:
+            try:
+                compile(spec, "<prompt field>", "eval")
+            except (SyntaxError, TypeError, ValueError) as e:
+                raise ValueError(f"Invalid field spec for {template.fields[i]!r}: {spec!r}") from e
+            lines.append(f"_v{i} = ({spec})")
+        parts.append(f"{{_v{i}}}")
+    # repr() escapes the static text; the replacement fields hold nothing it would touch
+    lines.append(f"return f{''.join(parts)!r}")
+    body = "".join(f"\n    {line}" for line in lines)
+    exec(f"def render(ctx):{body}\n", namespace)
+    return namespace["render"]
+
+
+class PromptRenderer:
+    """
+    Compiled system prompt renderer.
+
+    Example:
+        >>> renderer = PromptRenderer()
+        >>> prompt = renderer.render(get_wave_context())
+        >>> prompts = renderer.render_many(contexts)
+    """
+
+    def __init__(
+        self,
+        template: str = SYSTEM_PROMPT_TEMPLATE,
+        fields: Optional[Dict[str, FieldSpec]] = None,
+    ):
+        """
+        Args:
+            template: Prompt body with ``{field}`` placeholders; the
+                "Context generated" timestamp line is appended to it
+            fields: Field name -> expression over the context ``ctx``, or a
+                function computing the value from it (default: PROMPT_FIELDS)
+
+        Raises:
+            ValueError: If a template field has no usable spec
+        """
+        self.template = PromptTemplate(template + TIMESTAMP_LINE)
+        fields = fields if fields is not None else PROMPT_FIELDS
+        self._render = compile_template(self.template, {"timestamp": "ctx.timestamp", **fields})
+
+    def render(self, ctx) -> str:
+        """
+        Render the system prompt for a context.
+
+        Args:
+            ctx: WaveContext object containing environment information
+
+        Returns:
+            Formatted system prompt string
+        """
+        return self._render(ctx)
+
+    def render_many(self, contexts: Iterable[Any]) -> List[str]:
+        """
+        Render prompts for many contexts.
+
+        Returns:
+            Prompts in the same order as ``contexts``
+        """
+        return list(map(self._render, contexts))
+
+
+_default_renderer = PromptRenderer()
+
+
+def generate_system_prompt(ctx) -> str:
+    """
+    Generate a Claude system prompt based on the current Wave context.
+
+    Args:
+        ctx: WaveContext object containing environment information
+
+    Returns:
+        Formatted system prompt string
+    """
+    return _default_renderer.render(ctx)
+
+
+# Expose the compiled function itself: a wrapper call would cost as much as the f-string
+generate_system_prompt = wraps(generate_system_prompt)(_default_renderer._render)
+
+
+def render_system_prompts(contexts: Iterable[Any]) -> List[str]:
+    """Generate system prompts for many contexts in one call."""
+    return _default_renderer.render_many(contexts)
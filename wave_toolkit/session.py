@@ -0,0 +1,103 @@
+"""
+Wave collaboration sessions.
+
+``WaveSession`` and ``create_wave_session`` from project-book.ipynb. Saved
+session files are recorded in the ``SessionIndex`` and can be written in a
+compact JSON form for high-frequency use.
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from . import perf
+from .context import WaveContext, get_wave_context
+from .jsonutil import dumps
+from .prompt import generate_system_prompt
+from .session_index import SessionIndex
+
+
+@dataclass
+class WaveSession:
+    """Represents a Wave collaboration session."""
+    session_id: str
+    timestamp: str
+    context: WaveContext
+    system_prompt: str
+    task: Optional[str] = None
+    log_entries: List[Dict[str, Any]] = field(default_factory=list)
+
+    def add_log(self, entry_type: str, content: str):
+        """Add a log entry to the session."""
+        self.log_entries.append({
+            "timestamp": datetime.now().isoformat(),
+            "type": entry_type,
+            "content": content
+        })
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to the dictionary written by ``save``."""
+        return {
+            "session_id": self.session_id,
+            "timestamp": self.timestamp,
+            "task": self.task,
+            "context": self.context.to_dict(),
+            "system_prompt": self.system_prompt,
+            "log_entries": self.log_entries
+        }
+
+    def save(self, output_dir: str = ".claude/logs/sessions", update_index: bool = True, compact: bool = False):
+        """
+        Save the session log to a file and record it in the session index.
+
+        Args:
+            output_dir: Directory for session files
+            update_index: Record the file in the SessionIndex
+            compact: Write JSON without indentation
+        """
+        output_path = Path(output_dir)
+        output_path.mkdir(parents=True, exist_ok=True)
+
+        log_file = output_path / f"session_{self.session_id}.json"
+
+        with perf.stage("session.save"):
+            payload = dumps(self.to_dict(), indent=2, compact=compact)
+            with open(log_file, "w", encoding="utf-8") as f:
+                f.write(payload)
+                perf.count("session.bytes", f.tell())
+
+            if update_index:
+                with perf.stage("session.index"):
+                    with SessionIndex(output_dir) as index:
+                        index.add(str(log_file))
+
+        return str(log_file)
+
+
+def create_wave_session(task: Optional[str] = None) -> WaveSession:
+    """
+    Create a new Wave session with captured context.
+
+    Args:
+        task: Optional task description for the session
+
+    Returns:
+        WaveSession object
+    """
+    ctx = get_wave_context()
+    session_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+    session = WaveSession(
+        session_id=session_id,
+        timestamp=ctx.timestamp,
+        context=ctx,
+        system_prompt=generate_system_prompt(ctx),
+        task=task
+    )
+
+    session.add_log("session_start", f"Session created: {session_id}")
+    if task:
+        session.add_log("task", task)
+
+    return session
@@ -0,0 +1,316 @@
+"""
+Session index.
+
+Keeps a SQLite index of the ``session_<id>.json`` files that
+``WaveSession.save`` writes to ``.claude/logs/sessions``, so reports can query
+months of sessions by task text, time range, machine, git branch or entry
+type without parsing every file. The index is updated incrementally: files
+are only re-read when their size or mtime changed.
+"""
+
+import os
+import sqlite3
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from .summary import read_session_file
+
+DEFAULT_SESSIONS_DIR = ".claude/logs/sessions"
+INDEX_FILENAME = "session_index.db"
+
+# Stay under SQLite's default bound-parameter limit
+_MAX_PARAMS = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    path TEXT PRIMARY KEY,
+    session_id TEXT,
+    timestamp TEXT,
+    task TEXT,
+    machine TEXT,
+    user TEXT,
+    cwd TEXT,
+    git_branch TEXT,
+    entry_count INTEGER NOT NULL,
+    first_entry TEXT,
+    last_entry TEXT,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entry_types (
+    path TEXT NOT NULL REFERENCES sessions(path) ON DELETE CASCADE,
+    type TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (path, type)
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_timestamp ON sessions(timestamp);
+CREATE INDEX IF NOT EXISTS idx_sessions_machine ON sessions(machine);
+CREATE INDEX IF NOT EXISTS idx_sessions_branch ON sessions(git_branch);
+CREATE INDEX IF NOT EXISTS idx_entry_types_type ON entry_types(type);
+"""
+
+TimeBound = Union[str, date, datetime, None]
+
+
+@dataclass
+class SessionRecord:
+    """Indexed metadata for one saved session."""
+    path: str
+    session_id: Optional[str]
+    timestamp: Optional[str]
+    task: Optional[str]
+    machine: Optional[str]
+    user: Optional[str]
+    cwd: Optional[str]
+    git_branch: Optional[str]
+    entry_count: int
+    first_entry: Optional[str]
+    last_entry: Optional[str]
+    entry_types: Dict[str, int]
+
+
+def _iso(bound: TimeBound) -> Optional[str]:
+    return bound.isoformat() if isinstance(bound, date) else bound
+
+
+def _day(bound: TimeBound) -> Optional[date]:
+    """The day a date-only bound ("2026-03-01" or a date) names, else None."""
+    if isinstance(bound, datetime):
+        return None
+    if isinstance(bound, date):
+        return bound
+    if isinstance(bound, str) and len(bound) == 10:
+        try:
+            return date.fromisoformat(bound)
+        except ValueError:
+            return None
+    return None
+
+
+class SessionIndex:
+    """
+    Incrementally maintained index over a sessions directory.
+
+    Example:
+        >>> with SessionIndex() as index:
+        ...     index.refresh()
+        ...     for record in index.query(git_branch="main", entry_type="task"):
+        ...         print(record.session_id, record.task)
+    """
+
+    def __init__(
+        self,
+        sessions_dir: str = DEFAULT_SESSIONS_DIR,
+        index_path: Optional[str] = None,
+    ):
+        self.sessions_dir = Path(sessions_dir)
+        self.sessions_dir.mkdir(parents=True, exist_ok=True)
+        self.index_path = Path(index_path) if index_path else self.sessions_dir / INDEX_FILENAME
+        self._conn = sqlite3.connect(str(self.index_path), timeout=30)
+        self._conn.execute("PRAGMA foreign_keys = ON")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self):
+        """Close the underlying database connection."""
+        self._conn.close()
+
+    def __enter__(self) -> "SessionIndex":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _indexed_stats(self) -> Dict[str, Tuple[int, int]]:
+        rows = self._conn.execute("SELECT path, mtime_ns, size FROM sessions")
+        return {path: (mtime_ns, size) for path, mtime_ns, size in rows}
+
+    def _index_file(self, path: str, stat: os.stat_result):
+        header, entries = read_session_file(path)
+        type_counts: Dict[str, int] = {}
+        count = 0
+        first_entry = last_entry = None
+        for entry in entries:
+            count += 1
+            entry_type = str(entry.get("type"))
+            type_counts[entry_type] = type_counts.get(entry_type, 0) + 1
+            timestamp = entry.get("timestamp")
+            if first_entry is None:
+                first_entry = timestamp
+            last_entry = timestamp
+
+        ctx = header.get("context") or {}
+        machine = ctx.get("machine") or {}
+        user = ctx.get("user") or {}
+        session_ctx = ctx.get("session") or {}
+
+        self._conn.execute("DELETE FROM sessions WHERE path = ?", (path,))
+        self._conn.execute(
+            "INSERT INTO sessions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                path,
+                header.get("session_id"),
+                header.get("timestamp"),
+                header.get("task"),
+                machine.get("name"),
+                user.get("name"),
+                session_ctx.get("cwd"),
+                session_ctx.get("git_branch"),
+                count,
+                first_entry,
+                last_entry,
+                stat.st_mtime_ns,
+                stat.st_size,
+            ),
+        )
+        self._conn.executemany(
+            "INSERT INTO entry_types VALUES (?, ?, ?)",
+            [(path, entry_type, n) for entry_type, n in type_counts.items()],
+        )
+
+    def add(self, session_file: str) -> bool:
+        """
+        Index (or re-index) a single session file.
+
+        Call after ``WaveSession.save``; unchanged files are skipped.
+
+        Returns:
+            True if the file was (re)indexed, False if it was up to date
+        """
+        path = str(Path(session_file).resolve())
+        stat = os.stat(path)
+        row = self._conn.execute(
+            "SELECT mtime_ns, size FROM sessions WHERE path = ?", (path,)
+        ).fetchone()
+        if row == (stat.st_mtime_ns, stat.st_size):
+            return False
+        with self._conn:
+            self._index_file(path, stat)
+        return True
+
+    def refresh(self) -> Tuple[int, int]:
+        """
+        Bring the index in line with the sessions directory.
+
+        New or modified ``session_*.json`` files are parsed; rows for deleted
+        files are dropped. Unchanged files cost a single ``stat``.
+
+        Returns:
+            Tuple of (files indexed, files removed)
+        """
+        indexed = self._indexed_stats()
+        seen = set()
+        updated = 0
+        with self._conn:
+            with os.scandir(self.sessions_dir) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if not (name.startswith("session_") and name.endswith(".json")):
+                        continue
+                    if not entry.is_file():
+                        continue
+                    path = str(Path(entry.path).resolve())
+                    seen.add(path)
+                    stat = entry.stat()
+                    if indexed.get(path) == (stat.st_mtime_ns, stat.st_size):
+                        continue
+                    try:
+                        self._index_file(path, stat)
+                    except (OSError, ValueError):
+                        # Skip partially written or corrupt files; retried next refresh
+                        continue
+                    updated += 1
+            removed = [path for path in indexed if path not in seen]
+            self._conn.executemany(
+                "DELETE FROM sessions WHERE path = ?", [(path,) for path in removed]
+            )
+        return updated, len(removed)
+
+    def query(
+        self,
+        task: Optional[str] = None,
+        since: TimeBound = None,
+        until: TimeBound = None,
+        machine: Optional[str] = None,
+        git_branch: Optional[str] = None,
+        entry_type: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[SessionRecord]:
+        """
+        Find indexed sessions matching all given criteria.
+
+        Args:
+            task: Case-insensitive substring of the session task
+            since: Earliest session timestamp (inclusive)
+            until: Latest session timestamp (inclusive); a date-only bound
+                such as "2026-03-01" includes that whole day
+            machine: Exact machine name
+            git_branch: Exact git branch
+            entry_type: Only sessions with at least one entry of this type
+            limit: Maximum number of records
+
+        Returns:
+            Matching SessionRecords, newest first
+        """
+        clauses = []
+        params: List[object] = []
+        if task is not None:
+            clauses.append("s.task LIKE ? ESCAPE '\\'")
+            escaped = task.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            params.append(f"%{escaped}%")
+        if since is not None:
+            clauses.append("s.timestamp >= ?")
+            params.append(_iso(since))
+        if until is not None:
+            day = _day(until)
+            if day is not None:
+                # A date-only bound covers that whole day
+                clauses.append("s.timestamp < ?")
+                params.append((day + timedelta(days=1)).isoformat())
+            else:
+                clauses.append("s.timestamp <= ?")
+                params.append(_iso(until))
+        if machine is not None:
+            clauses.append("s.machine = ?")
+            params.append(machine)
+        if git_branch is not None:
+            clauses.append("s.git_branch = ?")
+            params.append(git_branch)
+        if entry_type is not None:
+            clauses.append(
+                "EXISTS (SELECT 1 FROM entry_types t WHERE t.path = s.path AND t.type = ?)"
+            )
+            params.append(entry_type)
+
+        sql = "SELECT * FROM sessions s"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY s.timestamp DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        rows = self._conn.execute(sql, params).fetchall()
+        types: Dict[str, Dict[str, int]] = {}
+        paths = [row[0] for row in rows]
+        for start in range(0, len(paths), _MAX_PARAMS):
+            batch = paths[start:start + _MAX_PARAMS]
+            placeholders = ",".join("?" * len(batch))
+            for path, entry_type_name, count in self._conn.execute(
+                f"SELECT path, type, count FROM entry_types WHERE path IN ({placeholders})",
+                batch,
+            ):
+                types.setdefault(path, {})[entry_type_name] = count
+
+        return [
+            SessionRecord(*row[:11], entry_types=types.get(row[0], {}))
+            for row in rows
+        ]
+
+    def entry_type_totals(self) -> Dict[str, int]:
+        """Total log entries per type across all indexed sessions."""
+        rows = self._conn.execute(
+            "SELECT type, SUM(count) FROM entry_types GROUP BY type ORDER BY 2 DESC"
+        )
+        return {entry_type: total for entry_type, total in rows}
@@ -0,0 +1,415 @@
+"""
+Delta-encoded context snapshot store.
+
+``SnapshotStore`` appends ``WaveContext`` snapshots to one JSON Lines file,
+grouped into streams (by default one per machine). Each stream starts with a
+keyframe holding the full context; later snapshots only record the fields
+that changed and the time since the previous snapshot, with a fresh keyframe
+every ``keyframe_interval`` snapshots. A snapshot that only differs by its
+timestamp costs about 20 bytes instead of a full ``wave_context.json``.
+
+``SnapshotReader`` indexes the byte offset of every record and the position
+of every keyframe per stream (persisted in a sidecar file and extended
+incrementally), rebuilds any snapshot by reading at most one keyframe
+interval of that stream's records, and streams a stream's change history.
+
+Several ``SnapshotStore`` instances, in one process or many, may append to
+the same file: each append holds an exclusive ``flock`` on it (where
+``fcntl`` is available), picks up records written by others and only then
+allocates stream ids and sequence numbers.
+
+Record format (one compact JSON object per line):
+    {"s": 0, "n": "spiral"}                      stream declaration
+    {"s": 0, "k": {"timestamp": ..., ...}}       keyframe (flattened fields)
+    {"s": 0, "t": 10000000, "d": {"session.cwd": "/x"}}
+                                                 delta: microseconds since the
+                                                 previous snapshot (or the full
+                                                 timestamp string) and changes
+"""
+
+import json
+import os
+import threading
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from itertools import accumulate
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - depends on the environment
+    fcntl = None
+
+from .context import WaveContext
+from .jsonutil import dumps
+
+DEFAULT_SNAPSHOT_PATH = ".claude/snapshots/contexts.jsonl"
+
+DEFAULT_KEYFRAME_INTERVAL = 64
+
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def flatten(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Flatten ``WaveContext.to_dict`` output to dotted keys."""
+    flat: Dict[str, Any] = {}
+    for key, value in data.items():
+        if isinstance(value, dict):
+            for sub_key, sub_value in value.items():
+                flat[f"{key}.{sub_key}"] = sub_value
+        else:
+            flat[key] = value
+    return flat
+
+
+def unflatten(flat: Dict[str, Any]) -> Dict[str, Any]:
+    """Inverse of ``flatten``."""
+    data: Dict[str, Any] = {}
+    for key, value in flat.items():
+        group, _, name = key.partition(".")
+        if name:
+            data.setdefault(group, {})[name] = value
+        else:
+            data[key] = value
+    return data
+
+
+def _encode_time(previous: str, current: str) -> Any:
+    """Microseconds between two ISO timestamps, or ``current`` if that can't round-trip."""
+    try:
+        delta = datetime.fromisoformat(current) - datetime.fromisoformat(previous)
+    except (ValueError, TypeError):
+        return current
+    micros = delta // _MICROSECOND
+    if _decode_time(previous, micros) != current:
+        return current
+    return micros
+
+
+def _decode_time(previous: str, encoded: Any) -> str:
+    if isinstance(encoded, int):
+        return (datetime.fromisoformat(previous) + timedelta(microseconds=encoded)).isoformat()
+    return encoded
+
+
+@dataclass
+class _StreamIndex:
+    """Per-stream position data."""
+    id: int
+    offsets: List[int] = field(default_factory=list)  # Byte offset of each snapshot record
+    keyframes: List[int] = field(default_factory=list)  # Sequence numbers of keyframes
+
+    @property
+    def count(self) -> int:
+        return len(self.offsets)
+
+
+class SnapshotReader:
+    """
+    Random access and history over a snapshot file.
+
+    Example:
+        >>> reader = SnapshotReader()
+        >>> latest = reader.get("spiral")
+        >>> for seq, timestamp, changes in reader.history("spiral"):
+        ...     print(timestamp, changes)
+    """
+
+    def __init__(self, path: str = DEFAULT_SNAPSHOT_PATH, index_path: Optional[str] = None):
+        """
+        Args:
+            path: Snapshot file
+            index_path: Keyframe index sidecar (default: ``<path>.idx``)
+        """
+        self.path = Path(path)
+        self.index_path = Path(index_path) if index_path else self.path.with_name(self.path.name + ".idx")
+        self._streams: Dict[str, _StreamIndex] = {}
+        self._names: Dict[int, str] = {}
+        self._indexed = 0
+        self._load_index()
+        self.refresh()
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            # Offsets are stored as gaps from the previous record of the stream
+            streams = {
+                name: _StreamIndex(s["id"], list(accumulate(s["offsets"])), list(s["keyframes"]))
+                for name, s in data["streams"].items()
+            }
+            indexed = data["size"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            return
+        if indexed <= size:
+            self._streams = streams
+            self._names = {s.id: name for name, s in streams.items()}
+            self._indexed = indexed
+
+    def _save_index(self):
+        data = {
+            "size": self._indexed,
+            "streams": {
+                name: {
+                    "id": s.id,
+                    "offsets": [b - a for a, b in zip([0] + s.offsets, s.offsets)],
+                    "keyframes": s.keyframes,
+                }
+                for name, s in self._streams.items()
+            },
+        }
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        # Writers in one process share the pid; the thread id keeps their temp files apart
+        tmp = self.index_path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp, self.index_path)
+
+    def refresh(self) -> int:
+        """
+        Index records appended since the last refresh.
+
+        Returns:
+            Number of new snapshots
+        """
+        indexed = self._indexed
+        added = self._scan()
+        if self._indexed != indexed:
+            self._save_index()
+        return added
+
+    def _scan(self) -> int:
+        """``refresh`` without persisting the index."""
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            return 0
+        if size < self._indexed:
+            # The file was replaced; start over
+            self._streams, self._names, self._indexed = {}, {}, 0
+        if size == self._indexed:
+            return 0
+
+        added = 0
+        with open(self.path, "rb") as f:
+            f.seek(self._indexed)
+            offset = self._indexed
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # Partially written record
+                record = json.loads(line)
+                stream_id = record["s"]
+                if "n" in record:
+                    self._names[stream_id] = record["n"]
+                    self._streams.setdefault(record["n"], _StreamIndex(stream_id))
+                else:
+                    stream = self._streams[self._names[stream_id]]
+                    if "k" in record:
+                        stream.keyframes.append(stream.count)
+                    stream.offsets.append(offset)
+                    added += 1
+                offset += len(line)
+        self._indexed = offset
+        return added
+
+    def streams(self) -> List[str]:
+        """Stream names in the order they were created."""
+        return sorted(self._streams, key=lambda name: self._streams[name].id)
+
+    def count(self, stream: str) -> int:
+        """Number of snapshots in a stream."""
+        entry = self._streams.get(stream)
+        return entry.count if entry else 0
+
+    def __len__(self) -> int:
+        return sum(s.count for s in self._streams.values())
+
+    def _replay(self, stream: str, start: int) -> Iterator[Tuple[int, Dict[str, Any], Optional[Dict[str, Any]]]]:
+        """
+        Yield (seq, full flattened fields, changed fields) from the keyframe
+        at or before ``start`` onwards; changed fields are None for keyframes.
+        """
+        entry = self._streams[stream]
+        first = entry.keyframes[max(0, bisect_right(entry.keyframes, start) - 1)]
+        state: Dict[str, Any] = {}
+        with open(self.path, "rb") as f:
+            for seq in range(first, entry.count):
+                f.seek(entry.offsets[seq])
+                record = json.loads(f.readline())
+                if "k" in record:
+                    changes = None
+                    state = dict(record["k"])
+                else:
+                    changes = dict(record.get("d", {}))
+                    changes["timestamp"] = _decode_time(state["timestamp"], record["t"])
+                    state.update(changes)
+                yield seq, state, changes
+
+    def get_dict(self, stream: str, seq: int = -1) -> Dict[str, Any]:
+        """Rebuild one snapshot as ``WaveContext.to_dict`` output (negative seq counts from the end)."""
+        count = self.count(stream)
+        if seq < 0:
+            seq += count
+        if not 0 <= seq < count:
+            raise IndexError(f"Snapshot {seq} out of range for stream {stream!r} ({count} snapshots)")
+        for current, state, _changes in self._replay(stream, seq):
+            if current == seq:
+                return unflatten(state)
+        raise IndexError(f"Snapshot {seq} of stream {stream!r} is missing from {self.path}")
+
+    def get(self, stream: str, seq: int = -1) -> WaveContext:
+        """Rebuild one snapshot (negative seq counts from the end)."""
+        return WaveContext.from_dict(self.get_dict(stream, seq))
+
+    def history(self, stream: str, start: int = 0) -> Iterator[Tuple[int, str, Dict[str, Any]]]:
+        """
+        Stream the change history of a stream.
+
+        Yields:
+            (seq, timestamp, changed fields) per snapshot. Changed fields
+            use dotted keys and exclude the timestamp; the first entry
+            reports every field when no earlier snapshot was replayed
+        """
+        previous: Optional[Dict[str, Any]] = None
+        for seq, state, changes in self._replay(stream, start):
+            if seq >= start:
+                if changes is None:
+                    # Keyframe: diff against the previous snapshot when known
+                    base = previous or {}
+                    changes = {k: v for k, v in state.items() if base.get(k) != v}
+                changed = {k: v for k, v in changes.items() if k != "timestamp"}
+                yield seq, state["timestamp"], changed
+            previous = dict(state)
+
+    def iter_snapshots(self, stream: str, start: int = 0) -> Iterator[WaveContext]:
+        """Rebuild every snapshot of a stream from ``start`` onwards."""
+        for seq, state, _changes in self._replay(stream, start):
+            if seq >= start:
+                yield WaveContext.from_dict(unflatten(state))
+
+
+class SnapshotStore:
+    """
+    Append-only writer for delta-encoded context snapshots.
+
+    Example:
+        >>> with SnapshotStore() as store:
+        ...     store.append(get_wave_context())
+    """
+
+    def __init__(
+        self,
+        path: str = DEFAULT_SNAPSHOT_PATH,
+        keyframe_interval: int = DEFAULT_KEYFRAME_INTERVAL,
+        fsync: bool = False,
+    ):
+        """
+        Args:
+            path: Snapshot file (created if missing)
+            keyframe_interval: Snapshots between full keyframes per stream
+            fsync: fsync after every append
+        """
+        self.path = Path(path)
+        self.keyframe_interval = max(1, keyframe_interval)
+        self.fsync = fsync
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "ab")
+        self._reader = SnapshotReader(str(self.path))
+        # Per stream: (count, flattened snapshot) of the last snapshot seen
+        self._last: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        """Close the file and bring the keyframe index up to date."""
+        if not self._file.closed:
+            self._file.close()
+            self._reader.refresh()
+
+    def _lock(self):
+        if fcntl is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+
+    def _unlock(self):
+        if fcntl is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+
+    def _sync(self):
+        """Index records other writers appended; call with the lock held."""
+        self._reader._scan()
+        if os.fstat(self._file.fileno()).st_size > self._reader._indexed:
+            # Nobody is mid-append while we hold the lock, so a trailing
+            # partial record was left by an interrupted writer: drop it
+            self._file.truncate(self._reader._indexed)
+
+    def _last_snapshot(self, stream: str, count: int) -> Optional[Dict[str, Any]]:
+        if not count:
+            return None
+        cached = self._last.get(stream)
+        if cached is not None and cached[0] == count:
+            return cached[1]
+        return flatten(self._reader.get_dict(stream, count - 1))
+
+    def append(self, ctx: Any, stream: Optional[str] = None) -> int:
+        """
+        Append a snapshot.
+
+        Args:
+            ctx: WaveContext (or anything with a compatible ``to_dict``, or
+                that dict itself)
+            stream: Stream name (default: the machine name)
+
+        Returns:
+            Sequence number of the snapshot within its stream
+        """
+        data = ctx if isinstance(ctx, dict) else ctx.to_dict()
+        flat = flatten(data)
+        if stream is None:
+            stream = str(flat.get("machine.name") or "default")
+
+        self._lock()
+        try:
+            self._sync()
+            records: List[Dict[str, Any]] = []
+            entry = self._reader._streams.get(stream)
+            if entry is None:
+                stream_id, count, since = len(self._reader._streams), 0, 0
+                records.append({"s": stream_id, "n": stream})
+            else:
+                stream_id, count = entry.id, entry.count
+                since = count - entry.keyframes[-1] if entry.keyframes else 0
+            last = self._last_snapshot(stream, count)
+
+            if last is None or since >= self.keyframe_interval or set(last) != set(flat):
+                records.append({"s": stream_id, "k": flat})
+            else:
+                record: Dict[str, Any] = {"s": stream_id, "t": _encode_time(last["timestamp"], flat["timestamp"])}
+                changes = {k: v for k, v in flat.items() if k != "timestamp" and last[k] != v}
+                if changes:
+                    record["d"] = changes
+                records.append(record)
+            self._file.write(b"".join(dumps(r, compact=True).encode("utf-8") + b"\n" for r in records))
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+        finally:
+            self._unlock()
+
+        self._last[stream] = (count + 1, flat)
+        return count
+
+    def reader(self) -> SnapshotReader:
+        """A reader over everything appended so far."""
+        self._file.flush()
+        self._reader.refresh()
+        return self._reader
@@ -0,0 +1,234 @@
+"""
+Session summary generation.
+
+``generate_session_summary`` renders a Wave session as markdown, as in
+project-book.ipynb. ``write_session_summary`` is the streaming variant: it
+writes to a file or text stream incrementally and can read log entries
+straight from a saved ``session_<id>.json`` without loading it, so memory
+stays constant regardless of session size.
+"""
+
+import io
+import os
+from collections import Counter, deque
+from itertools import chain
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional, TextIO, Tuple, Union
+
+from ._jsonstream import iter_object
+
+# Summary sections that can be requested from write_session_summary
+SUMMARY_MODES = ("entries", "counts", "histogram", "edges")
+
+# Timestamp prefix length for each histogram bucket (ISO 8601 timestamps)
+HISTOGRAM_BUCKETS = {
+    "day": 10,     # 2026-01-21
+    "hour": 13,    # 2026-01-21T00
+    "minute": 16,  # 2026-01-21T00:31
+}
+
+SessionSource = Union[str, os.PathLike, Any]
+
+
+def _format_entry(entry: Dict[str, Any]) -> str:
+    return f"- [{entry['timestamp']}] **{entry['type']}**: {entry['content']}\n"
+
+
+def _header_from_session(session: Any) -> Dict[str, Any]:
+    """Extract header fields from a WaveSession-like object."""
+    ctx = session.context
+    return {
+        "session_id": session.session_id,
+        "timestamp": session.timestamp,
+        "task": session.task,
+        "context": ctx if isinstance(ctx, dict) else ctx.to_dict(),
+    }
+
+
+def read_session_file(path: Union[str, os.PathLike]) -> Tuple[Dict[str, Any], Iterator[Dict[str, Any]]]:
+    """
+    Open a saved session file for streaming.
+
+    Header fields (everything before ``log_entries``, which is how
+    ``WaveSession.save`` orders them) are decoded eagerly; log entries are
+    returned as a lazy iterator that reads the file as it is consumed.
+
+    Args:
+        path: Path to a ``session_<id>.json`` file
+
+    Returns:
+        Tuple of (header dict, iterator over log entry dicts)
+
+    Raises:
+        FileNotFoundError: If the session file doesn't exist
+        json.JSONDecodeError: If the file contains invalid JSON
+    """
+    if not Path(path).exists():
+        raise FileNotFoundError(f"Session file not found: {path}")
+
+    fp = open(path, "r", encoding="utf-8")
+    events = iter_object(fp, stream_keys=("log_entries",))
+    header: Dict[str, Any] = {}
+    first: Optional[Tuple[str, str, Any]] = None
+    try:
+        for event in events:
+            kind, key, value = event
+            if kind == "item":
+                first = event
+                break
+            header[key] = value
+    except Exception:
+        fp.close()
+        raise
+
+    def entries() -> Iterator[Dict[str, Any]]:
+        with fp:
+            for kind, _key, value in chain([first] if first else [], events):
+                if kind == "item":
+                    yield value
+
+    return header, entries()
+
+
+def _render_header(header: Dict[str, Any]) -> str:
+    ctx = header.get("context") or {}
+    machine = ctx.get("machine") or {}
+    session_ctx = ctx.get("session") or {}
+    return f"""# Wave Session Summary
+
+## Session Info
+- **ID:** {header.get('session_id')}
+- **Timestamp:** {header.get('timestamp')}
+- **Task:** {header.get('task') or 'Not specified'}
+
+## Environment
+- **Machine:** {machine.get('name')} ({machine.get('arch')})
+- **OS:** {machine.get('os')}
+- **Working Directory:** {session_ctx.get('cwd')}
+- **Git Repo:** {'Yes' if session_ctx.get('is_git_repo') else 'No'}
+"""
+
+
+def write_session_summary(
+    source: SessionSource,
+    out: Union[str, os.PathLike, TextIO],
+    modes: Iterable[str] = ("entries",),
+    edge_count: int = 10,
+    histogram_bucket: str = "hour",
+) -> int:
+    """
+    Write a markdown summary of a Wave session incrementally.
+
+    All requested sections are computed in a single pass over the log
+    entries. Only aggregates are kept in memory: per-type counts, one counter
+    per histogram bucket and the last ``edge_count`` entries.
+
+    Args:
+        source: WaveSession object, or path to a saved session file
+        out: Output file path or writable text stream
+        modes: Sections to include - any of SUMMARY_MODES:
+            "entries" (every log entry), "counts" (entries per type),
+            "histogram" (entries per time bucket), "edges" (first/last N)
+        edge_count: Number of entries shown at each end in "edges" mode
+        histogram_bucket: Bucket size for "histogram" mode - day, hour or minute
+
+    Returns:
+        Number of log entries summarised
+
+    Raises:
+        ValueError: If an unknown mode or bucket is requested
+    """
+    modes = tuple(modes)
+    unknown = [m for m in modes if m not in SUMMARY_MODES]
+    if unknown:
+        raise ValueError(
+            f"Unknown summary mode(s): {', '.join(unknown)}. "
+            f"Valid modes are: {', '.join(SUMMARY_MODES)}"
+        )
+    if histogram_bucket not in HISTOGRAM_BUCKETS:
+        raise ValueError(
+            f"Unknown histogram bucket: {histogram_bucket}. "
+            f"Valid buckets are: {', '.join(HISTOGRAM_BUCKETS)}"
+        )
+
+    if isinstance(source, (str, os.PathLike)):
+        header, entries = read_session_file(source)
+    else:
+        header, entries = _header_from_session(source), iter(source.log_entries)
+
+    if isinstance(out, (str, os.PathLike)):
+        Path(out).parent.mkdir(parents=True, exist_ok=True)
+        with open(out, "w", encoding="utf-8") as f:
+            return _write_summary(header, entries, f, modes, edge_count, histogram_bucket)
+    return _write_summary(header, entries, out, modes, edge_count, histogram_bucket)
+
+
+def _write_summary(
+    header: Dict[str, Any],
+    entries: Iterator[Dict[str, Any]],
+    out: TextIO,
+    modes: Tuple[str, ...],
+    edge_count: int,
+    histogram_bucket: str,
+) -> int:
+    write = out.write
+    write(_render_header(header))
+
+    show_entries = "entries" in modes
+    type_counts: Counter = Counter()
+    histogram: Counter = Counter()
+    prefix = HISTOGRAM_BUCKETS[histogram_bucket]
+    first_entries = []
+    last_entries: deque = deque(maxlen=edge_count)
+    track_edges = "edges" in modes and edge_count > 0
+    total = 0
+
+    if show_entries:
+        write("\n## Log Entries\n")
+    for entry in entries:
+        total += 1
+        if show_entries:
+            write(_format_entry(entry))
+        type_counts[entry.get("type")] += 1
+        histogram[str(entry.get("timestamp", ""))[:prefix]] += 1
+        if track_edges:
+            if len(first_entries) < edge_count:
+                first_entries.append(entry)
+            else:
+                last_entries.append(entry)
+
+    for mode in modes:
+        if mode == "counts":
+            write("\n## Entry Types\n")
+            for entry_type, count in type_counts.most_common():
+                write(f"- **{entry_type}**: {count}\n")
+        elif mode == "histogram":
+            write(f"\n## Timeline (per {histogram_bucket})\n")
+            for bucket in sorted(histogram):
+                write(f"- {bucket}: {histogram[bucket]}\n")
+        elif mode == "edges":
+            write(f"\n## First {len(first_entries)} Entries\n")
+            for entry in first_entries:
+                write(_format_entry(entry))
+            if last_entries:
+                write(f"\n## Last {len(last_entries)} Entries\n")
+                for entry in last_entries:
+                    write(_format_entry(entry))
+
+    write("\n---\n*Generated by Wave Toolkit Project Book*\n")
+    return total
+
+
+def generate_session_summary(session: Any) -> str:
+    """
+    Generate a markdown summary of a Wave session.
+
+    Args:
+        session: WaveSession object
+
+    Returns:
+        Markdown summary string
+    """
+    buffer = io.StringIO()
+    write_session_summary(session, buffer)
+    return buffer.getvalue()
@@ -0,0 +1,211 @@
+"""
+AI_AGENTS.md and ecosystem badge templates.
+
+The template generators from project-book.ipynb, plus
+``generate_ecosystem_templates`` which analyzes and renders every available
+ecosystem repository concurrently. Files are written atomically, and a file
+whose content hash already matches the rendered output is left untouched,
+so reruns only cost the (cached) analysis. Generated files end with
+``GENERATED_MARKER``; an existing file without it is treated as
+hand-written and skipped unless ``overwrite`` is set.
+"""
+
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from .ecosystem import EcosystemRepo, RepoDiscovery
+from .framework import FrameworkCache, analyze_framework
+
+AGENTS_FILENAME = "AI_AGENTS.md"
+
+TEMPLATE_STATUSES = ("written", "unchanged", "skipped", "unavailable", "error")
+
+# Appended to every generated file; files without it are never replaced by default
+GENERATED_MARKER = "<!-- Generated by wave_toolkit.templates; edits here are overwritten -->\n"
+
+
+def generate_ai_agents_template(repo_name: str, structure: Dict[str, List[str]]) -> str:
+    """
+    Generate an AI_AGENTS.md template for a repository.
+
+    Args:
+        repo_name: Name of the repository
+        structure: Directory structure dictionary
+
+    Returns:
+        Markdown template string
+    """
+    dirs_list = "\n".join([f"├── {d}/" for d in structure.keys()])
+
+    template = f"""# AI Agent Coordination Rules
+
+*This file tells ALL AI agents (Claude, Ollama, GPT, etc.) where to put things in {repo_name}.*
+
+[![SpiralSafe](https://img.shields.io/badge/🌀_SpiralSafe-Ecosystem-purple?style=flat-square)](https://github.com/toolate28/SpiralSafe)
+[![Wave Toolkit](https://img.shields.io/badge/🌊_Wave_Toolkit-Blueprint-0066FF?style=flat-square)](https://github.com/toolate28/wave-toolkit)
+
+> **Part of the [SpiralSafe Ecosystem](https://github.com/toolate28/SpiralSafe)**
+
+---
+
+## The Golden Rule
+
+**Follow the established directory structure. Never create loose files in root.**
+
+---
+
+## Directory Structure
+
+```text
+{repo_name}/
+{dirs_list}
+```
+
+---
+
+## Placement Rules
+
+| Type | Location | Example |
+|------|----------|---------||
+| Documentation | `docs/` | `*.md` |
+| Tests | `tests/` | `*_test.py`, `*.Tests.ps1` |
+| Configuration | root or `config/` | `*.json`, `*.yaml` |
+
+---
+
+*This file is the source of truth for AI agent behavior in this workspace.*
+"""
+    return template
+
+
+def generate_ecosystem_badge_header(repo_name: str) -> str:
+    """
+    Generate ecosystem badge header for documentation files.
+
+    Args:
+        repo_name: Name of the repository
+
+    Returns:
+        Markdown badge header string
+    """
+    return f"""[![SpiralSafe](https://img.shields.io/badge/🌀_SpiralSafe-Ecosystem-purple?style=flat-square)](https://github.com/toolate28/SpiralSafe)
+[![{repo_name}](https://img.shields.io/badge/📦_{repo_name}-Main-blue?style=flat-square)](README.md)
+
+> **Part of the [SpiralSafe Ecosystem](https://github.com/toolate28/SpiralSafe)**
+"""
+
+
+@dataclass
+class TemplateResult:
+    """Outcome of generating one file for one repository."""
+    repo: str
+    path: Optional[str]
+    status: str  # one of TEMPLATE_STATUSES
+    error: Optional[str] = None  # Reason for "error" and "skipped"
+
+
+def write_if_changed(path: Path, content: str) -> bool:
+    """
+    Atomically write ``content`` unless the file already holds it.
+
+    Returns:
+        True if the file was written, False if it was already up to date
+    """
+    data = content.encode("utf-8")
+    try:
+        with open(path, "rb") as f:
+            if hashlib.sha256(f.read()).digest() == hashlib.sha256(data).digest():
+                return False
+    except OSError:
+        pass
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+    return True
+
+
+def _generate_for_repo(
+    repo: EcosystemRepo,
+    cache: Optional[FrameworkCache],
+    badge_filename: Optional[str],
+    dry_run: bool,
+    overwrite: bool,
+) -> List[TemplateResult]:
+    if not repo.is_available or not repo.local_path:
+        return [TemplateResult(repo.name, None, "unavailable")]
+    root = Path(repo.local_path)
+
+    def emit(filename: str, render: Callable[[], str]) -> TemplateResult:
+        target = root / filename
+        try:
+            content = render() + GENERATED_MARKER
+            if not overwrite and target.exists():
+                existing = target.read_bytes()
+                if existing != content.encode("utf-8") and GENERATED_MARKER.encode("utf-8") not in existing:
+                    return TemplateResult(repo.name, str(target), "skipped", "hand-written")
+            if dry_run:
+                changed = not target.exists() or target.read_bytes() != content.encode("utf-8")
+            else:
+                changed = write_if_changed(target, content)
+            return TemplateResult(repo.name, str(target), "written" if changed else "unchanged")
+        except OSError as e:
+            return TemplateResult(repo.name, str(target), "error", str(e))
+
+    def agents() -> str:
+        analysis = analyze_framework(repo.local_path, cache=cache)
+        if analysis is None:
+            raise FileNotFoundError(repo.local_path)
+        return generate_ai_agents_template(repo.name, analysis.structure)
+
+    results = []
+    if badge_filename:
+        # Written first so a new directory for it shows up in the structure
+        results.append(emit(badge_filename, lambda: generate_ecosystem_badge_header(repo.name)))
+    results.insert(0, emit(AGENTS_FILENAME, agents))
+    return results
+
+
+def generate_ecosystem_templates(
+    repos: Optional[List[EcosystemRepo]] = None,
+    cache: Optional[FrameworkCache] = None,
+    badge_filename: Optional[str] = None,
+    workers: Optional[int] = None,
+    dry_run: bool = False,
+    overwrite: bool = False,
+) -> List[TemplateResult]:
+    """
+    Generate AI_AGENTS.md (and optionally a badge header file) for every
+    available ecosystem repository in parallel.
+
+    Args:
+        repos: Repositories to process (default: RepoDiscovery().discover())
+        cache: FrameworkCache for the analyses (default: a cache in the
+            default location, so reruns only re-list changed directories)
+        badge_filename: Also write the badge header to this path relative
+            to each repository root (e.g. "docs/ECOSYSTEM_BADGE.md")
+        workers: Number of repositories processed at once
+        dry_run: Report what would change without writing
+        overwrite: Also replace existing files that lack GENERATED_MARKER
+            (by default they are reported as "skipped")
+
+    Returns:
+        One TemplateResult per file (or per unavailable repository), in
+        repository order
+    """
+    if repos is None:
+        repos = RepoDiscovery().discover()
+    if cache is None:
+        cache = FrameworkCache()
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        batches = list(pool.map(
+            lambda repo: _generate_for_repo(repo, cache, badge_filename, dry_run, overwrite),
+            repos,
+        ))
+    return [result for batch in batches for result in batch]
@@ -0,0 +1,373 @@
+"""
+Vectorized trace analytics.
+
+Summaries over traces - counts and error ratios per ``state`` (or any other
+field), output/input payload size distributions, and error ratios over
+time - computed as NumPy column operations instead of loops over dicts.
+
+Traces are consumed in chunks: each chunk is turned into columns once,
+grouped with ``np.unique`` and reduced with ``np.bincount``, and the
+partial aggregates are merged. Memory stays bounded by the chunk size, so
+``summarize_traces`` over a file path streams it in one pass whatever its
+size.
+
+Example:
+    >>> summary = summarize_traces("traces.jsonl", by="state", bucket_seconds=3600)
+    >>> summary.groups["completed"].count
+    >>> summary.groups["completed"].output_p95
+    >>> summary.timeline[0]
+"""
+
+import json
+import math
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+
+from . import perf
+from .traces import iter_traces
+
+DEFAULT_CHUNK_SIZE = 65536
+DEFAULT_BUCKET_SECONDS = 3600
+
+# States that count as errors (compared case-insensitively)
+ERROR_STATES = ("error", "errored", "failed", "failure", "timeout", "cancelled", "aborted")
+
+# Optional fields holding a trace's time, in order of preference
+TIMESTAMP_FIELDS = ("timestamp", "start_time", "created_at", "time")
+
+# Payload size histogram edges: four buckets per power of two, up to 1 TiB
+SIZE_EDGES = np.unique(np.floor(2.0 ** (np.arange(0, 40 * 4 + 1) / 4))).astype(np.int64)
+
+MISSING_LABEL = "<none>"
+
+
+def payload_size(value: Any) -> int:
+    """Size of a payload as the length of its compact JSON encoding."""
+    if isinstance(value, str):
+        return len(value) + 2
+    return len(json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=str))
+
+
+def _label(value: Any) -> str:
+    if value is None:
+        return MISSING_LABEL
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+    return str(value)
+
+
+def _epoch(value: Any) -> float:
+    """Seconds since the epoch, or NaN if the value is not a time."""
+    if value is None or isinstance(value, bool):
+        return math.nan
+    if isinstance(value, (int, float)):
+        # Millisecond epochs are common in JS-produced traces
+        return value / 1000.0 if abs(value) > 1e11 else float(value)
+    if isinstance(value, str):
+        try:
+            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return math.nan
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return parsed.timestamp()
+    return math.nan
+
+
+def _timestamp(trace: Dict[str, Any]) -> Any:
+    for name in TIMESTAMP_FIELDS:
+        value = trace.get(name)
+        if value is not None:
+            return value
+    return None
+
+
+def trace_columns(traces: Sequence[Dict[str, Any]], by: str = "state") -> Dict[str, np.ndarray]:
+    """
+    Extract the analyzed fields of a batch of traces as columns.
+
+    Returns:
+        Mapping with ``key`` (group label, str), ``state`` (str),
+        ``input_size`` and ``output_size`` (int64), ``timestamp`` (float64
+        epoch seconds, NaN if unknown) and ``is_error`` (bool)
+    """
+    n = len(traces)
+    keys = np.array([_label(t.get(by)) for t in traces], dtype=str) if n else np.array([], dtype=str)
+    states = keys if by == "state" else (
+        np.array([_label(t.get("state")) for t in traces], dtype=str) if n else np.array([], dtype=str)
+    )
+    input_size = np.fromiter((payload_size(t.get("input")) for t in traces), dtype=np.int64, count=n)
+    output_size = np.fromiter((payload_size(t.get("output")) for t in traces), dtype=np.int64, count=n)
+    timestamp = np.fromiter((_epoch(_timestamp(t)) for t in traces), dtype=np.float64, count=n)
+    has_error = np.fromiter((t.get("error") not in (None, "", False) for t in traces), dtype=bool, count=n)
+    is_error = has_error | np.isin(np.char.lower(states), ERROR_STATES)
+    return {
+        "key": keys,
+        "state": states,
+        "input_size": input_size,
+        "output_size": output_size,
+        "timestamp": timestamp,
+        "is_error": is_error,
+    }
+
+
+@dataclass
+class GroupStats:
+    """Aggregates for one group of traces."""
+    key: str
+    count: int
+    errors: int
+    input_bytes: int
+    output_bytes: int
+    output_min: int
+    output_max: int
+    output_p50: int
+    output_p95: int
+    output_p99: int
+
+    @property
+    def error_ratio(self) -> float:
+        return self.errors / self.count if self.count else 0.0
+
+    @property
+    def output_mean(self) -> float:
+        return self.output_bytes / self.count if self.count else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "key": self.key,
+            "count": self.count,
+            "errors": self.errors,
+            "error_ratio": self.error_ratio,
+            "input_bytes": self.input_bytes,
+            "output_bytes": self.output_bytes,
+            "output_mean": self.output_mean,
+            "output_min": self.output_min,
+            "output_max": self.output_max,
+            "output_p50": self.output_p50,
+            "output_p95": self.output_p95,
+            "output_p99": self.output_p99,
+        }
+
+
+@dataclass
+class TimeBucket:
+    """Trace and error counts for one time interval."""
+    start: str
+    count: int
+    errors: int
+
+    @property
+    def error_ratio(self) -> float:
+        return self.errors / self.count if self.count else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"start": self.start, "count": self.count, "errors": self.errors, "error_ratio": self.error_ratio}
+
+
+@dataclass
+class TraceSummary:
+    """Result of ``summarize_traces``."""
+    by: str
+    total: int
+    errors: int
+    groups: Dict[str, GroupStats] = field(default_factory=dict)
+    timeline: List[TimeBucket] = field(default_factory=list)
+    bucket_seconds: int = DEFAULT_BUCKET_SECONDS
+
+    @property
+    def error_ratio(self) -> float:
+        return self.errors / self.total if self.total else 0.0
+
+    def counts(self) -> Dict[str, int]:
+        """Trace count per group, largest first."""
+        return {key: g.count for key, g in sorted(self.groups.items(), key=lambda item: -item[1].count)}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "by": self.by,
+            "total": self.total,
+            "errors": self.errors,
+            "error_ratio": self.error_ratio,
+            "bucket_seconds": self.bucket_seconds,
+            "groups": [g.to_dict() for g in self.groups.values()],
+            "timeline": [b.to_dict() for b in self.timeline],
+        }
+
+
+class TraceAggregator:
+    """
+    Mergeable, chunk-at-a-time trace aggregates.
+
+    Per-group state lives in NumPy arrays indexed by group id; each
+    ``update`` reduces a chunk with bincount and scatters the partial
+    results into those arrays.
+    """
+
+    def __init__(self, by: str = "state", bucket_seconds: int = DEFAULT_BUCKET_SECONDS):
+        self.by = by
+        self.bucket_seconds = bucket_seconds
+        self._index: Dict[str, int] = {}
+        self._labels: List[str] = []
+        self._nbins = len(SIZE_EDGES) + 1
+        self._count = np.zeros(0, dtype=np.int64)
+        self._errors = np.zeros(0, dtype=np.int64)
+        self._input_bytes = np.zeros(0, dtype=np.int64)
+        self._output_bytes = np.zeros(0, dtype=np.int64)
+        self._output_min = np.zeros(0, dtype=np.int64)
+        self._output_max = np.zeros(0, dtype=np.int64)
+        self._histogram = np.zeros((0, self._nbins), dtype=np.int64)
+        self._timeline: Dict[int, np.ndarray] = {}
+
+    def _group_ids(self, labels: np.ndarray) -> np.ndarray:
+        new = [str(label) for label in labels if str(label) not in self._index]
+        if new:
+            for label in new:
+                self._index[label] = len(self._labels)
+                self._labels.append(label)
+            grow = len(new)
+            self._count = np.concatenate([self._count, np.zeros(grow, np.int64)])
+            self._errors = np.concatenate([self._errors, np.zeros(grow, np.int64)])
+            self._input_bytes = np.concatenate([self._input_bytes, np.zeros(grow, np.int64)])
+            self._output_bytes = np.concatenate([self._output_bytes, np.zeros(grow, np.int64)])
+            self._output_min = np.concatenate([self._output_min, np.full(grow, np.iinfo(np.int64).max)])
+            self._output_max = np.concatenate([self._output_max, np.zeros(grow, np.int64)])
+            self._histogram = np.vstack([self._histogram, np.zeros((grow, self._nbins), np.int64)])
+        return np.array([self._index[str(label)] for label in labels], dtype=np.intp)
+
+    def update(self, traces: Sequence[Dict[str, Any]]):
+        """Add a chunk of traces."""
+        if not len(traces):
+            return
+        self.update_columns(trace_columns(traces, self.by))
+
+    def update_columns(self, cols: Dict[str, np.ndarray]):
+        """Add a chunk already converted with ``trace_columns``."""
+        labels, inverse = np.unique(cols["key"], return_inverse=True)
+        groups = len(labels)
+        ids = self._group_ids(labels)
+        output = cols["output_size"]
+        errors = cols["is_error"]
+
+        self._count[ids] += np.bincount(inverse, minlength=groups)
+        self._errors[ids] += np.bincount(inverse, weights=errors, minlength=groups).astype(np.int64)
+        self._input_bytes[ids] += np.bincount(inverse, weights=cols["input_size"], minlength=groups).astype(np.int64)
+        self._output_bytes[ids] += np.bincount(inverse, weights=output, minlength=groups).astype(np.int64)
+
+        chunk_min = np.full(groups, np.iinfo(np.int64).max)
+        np.minimum.at(chunk_min, inverse, output)
+        self._output_min[ids] = np.minimum(self._output_min[ids], chunk_min)
+        chunk_max = np.zeros(groups, np.int64)
+        np.maximum.at(chunk_max, inverse, output)
+        self._output_max[ids] = np.maximum(self._output_max[ids], chunk_max)
+
+        bins = np.searchsorted(SIZE_EDGES, output, side="right")
+        flat = np.bincount(inverse * self._nbins + bins, minlength=groups * self._nbins)
+        self._histogram[ids] += flat.reshape(groups, self._nbins)
+
+        timestamps = cols["timestamp"]
+        known = ~np.isnan(timestamps)
+        if known.any():
+            buckets = np.floor(timestamps[known] / self.bucket_seconds).astype(np.int64)
+            starts, bucket_inverse = np.unique(buckets, return_inverse=True)
+            counts = np.bincount(bucket_inverse, minlength=len(starts))
+            bucket_errors = np.bincount(bucket_inverse, weights=errors[known], minlength=len(starts))
+            for start, count, errs in zip(starts.tolist(), counts.tolist(), bucket_errors.tolist()):
+                entry = self._timeline.setdefault(start, np.zeros(2, np.int64))
+                entry += (count, int(errs))
+
+    def _percentile(self, histogram: np.ndarray, count: int, q: float, lo: int, hi: int) -> int:
+        """Percentile estimate: the upper edge of the bucket holding rank q (clamped to min/max)."""
+        rank = math.ceil(q / 100.0 * count)
+        index = int(np.searchsorted(np.cumsum(histogram), max(rank, 1)))
+        upper = int(SIZE_EDGES[index]) - 1 if index < len(SIZE_EDGES) else hi
+        return min(max(upper, lo), hi)
+
+    def result(self) -> TraceSummary:
+        """Snapshot of the aggregates so far."""
+        groups = {}
+        for label, gid in sorted(self._index.items()):
+            count = int(self._count[gid])
+            lo, hi = int(self._output_min[gid]), int(self._output_max[gid])
+            hist = self._histogram[gid]
+            groups[label] = GroupStats(
+                key=label,
+                count=count,
+                errors=int(self._errors[gid]),
+                input_bytes=int(self._input_bytes[gid]),
+                output_bytes=int(self._output_bytes[gid]),
+                output_min=lo,
+                output_max=hi,
+                output_p50=self._percentile(hist, count, 50, lo, hi),
+                output_p95=self._percentile(hist, count, 95, lo, hi),
+                output_p99=self._percentile(hist, count, 99, lo, hi),
+            )
+        timeline = [
+            TimeBucket(
+                start=datetime.fromtimestamp(start * self.bucket_seconds, tz=timezone.utc).isoformat(),
+                count=int(entry[0]),
+                errors=int(entry[1]),
+            )
+            for start, entry in sorted(self._timeline.items())
+        ]
+        return TraceSummary(
+            by=self.by,
+            total=int(self._count.sum()),
+            errors=int(self._errors.sum()),
+            groups=groups,
+            timeline=timeline,
+            bucket_seconds=self.bucket_seconds,
+        )
+
+
+def _chunks(traces: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    chunk: List[Dict[str, Any]] = []
+    for trace in traces:
+        chunk.append(trace)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+@perf.profiled("traces.summarize")
+def summarize_traces(
+    source: Union[str, Path, Iterable[Dict[str, Any]]],
+    by: str = "state",
+    bucket_seconds: int = DEFAULT_BUCKET_SECONDS,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    skip_invalid: bool = False,
+) -> TraceSummary:
+    """
+    Group and aggregate traces.
+
+    Args:
+        source: Trace file path (streamed; JSON array, object or JSON
+            Lines) or an iterable of trace dicts, e.g. from ``import_traces``
+        by: Field to group by
+        bucket_seconds: Width of the error-ratio timeline buckets
+        chunk_size: Traces converted to columns at a time
+        skip_invalid: For file input, skip invalid records instead of raising
+
+    Returns:
+        TraceSummary with per-group counts, error ratios and output size
+        distribution (percentiles are histogram estimates within ~19%,
+        clamped to the exact min/max), plus a timeline of traces that carry
+        one of TIMESTAMP_FIELDS
+    """
+    if isinstance(source, (str, Path)):
+        traces: Iterable[Dict[str, Any]] = iter_traces(str(source), skip_invalid=skip_invalid)
+    else:
+        traces = source
+    aggregator = TraceAggregator(by=by, bucket_seconds=bucket_seconds)
+    for chunk in _chunks(traces, chunk_size):
+        aggregator.update(chunk)
+        perf.count("traces.analyzed", len(chunk))
+    return aggregator.result()
@@ -0,0 +1,249 @@
+"""
+Streaming diff and dedupe of trace files keyed by ``trace_id``.
+
+Both operations are hash-partitioned joins. Each input is streamed once
+with ``iter_traces`` and every trace is reduced to one short line - its
+JSON-encoded ``trace_id`` and a digest of its canonical JSON - appended
+to one of N partition files on disk, chosen by a hash of the id. A given
+id lands in the same partition for both inputs, so each partition pair
+is joined on its own, with only that partition's ids in memory. The
+partition count grows with the (estimated decompressed) input size, so
+memory stays flat for inputs much larger than RAM.
+
+Example:
+    >>> for change in diff_traces("traces-monday.jsonl", "traces-tuesday.jsonl"):
+    ...     print(change.kind, change.trace_id)
+    >>> unique = list(dedupe_traces("traces.jsonl"))
+"""
+
+import hashlib
+import heapq
+import json
+import os
+import tempfile
+import zlib
+from contextlib import ExitStack
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Set, Union
+
+from . import perf
+from ._compressed import detect_compression
+from .traces import iter_traces
+
+TraceSource = Union[str, Path, Iterable[Dict[str, Any]]]
+
+# Input bytes per partition when the count is chosen automatically
+PARTITION_BYTES = 64 * 1024 * 1024
+MAX_PARTITIONS = 256
+
+# Assumed expansion of compressed inputs; traces compress up to ~40x, and
+# too many partitions only costs file handles while too few costs memory
+COMPRESSION_RATIO = 40
+
+# Partitions for inputs of unknown size (iterables of trace dicts)
+ITERABLE_PARTITIONS = 16
+
+ADDED = "added"
+REMOVED = "removed"
+CHANGED = "changed"
+
+
+@dataclass(frozen=True)
+class TraceChange:
+    """One difference between two trace files."""
+    kind: str  # ADDED, REMOVED or CHANGED
+    trace_id: Any
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"kind": self.kind, "trace_id": self.trace_id}
+
+
+def trace_digest(trace: Dict[str, Any]) -> str:
+    """Content hash of a trace, independent of key order and whitespace."""
+    canonical = json.dumps(trace, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _key(trace_id: Any) -> str:
+    # JSON keeps ids of different types apart (1 vs "1") and never contains a tab or newline
+    return json.dumps(trace_id, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def _partition(key: str, partitions: int) -> int:
+    return zlib.crc32(key.encode("utf-8")) % partitions
+
+
+def _source_size(source: Union[str, Path]) -> int:
+    """Estimated decompressed size of a trace file."""
+    try:
+        size = os.path.getsize(source)
+        compressed = detect_compression(str(source)) is not None
+    except OSError:
+        return 0
+    return size * COMPRESSION_RATIO if compressed else size
+
+
+def _partition_count(sources: Iterable[TraceSource], partitions: Optional[int]) -> int:
+    if partitions is not None:
+        if partitions < 1:
+            raise ValueError(f"partitions must be at least 1, got {partitions}")
+        return partitions
+    total, minimum = 0, 1
+    for source in sources:
+        if isinstance(source, (str, Path)):
+            total += _source_size(source)
+        else:
+            minimum = ITERABLE_PARTITIONS
+    return min(MAX_PARTITIONS, max(minimum, total // PARTITION_BYTES + 1))
+
+
+def _traces(source: TraceSource, skip_invalid: bool) -> Iterator[Dict[str, Any]]:
+    if isinstance(source, (str, Path)):
+        return iter_traces(str(source), skip_invalid=skip_invalid)
+    return iter(source)
+
+
+def _write_partitions(
+    traces: Iterable[Dict[str, Any]], directory: Path, prefix: str, partitions: int, value
+) -> List[Path]:
+    """Split ``key\\tvalue(index, trace)`` lines across partition files."""
+    paths = [directory / f"{prefix}-{i:03d}" for i in range(partitions)]
+    records = 0
+    with ExitStack() as stack:
+        files: List[IO[str]] = [
+            stack.enter_context(open(path, "w", encoding="utf-8", newline="\n")) for path in paths
+        ]
+        for index, trace in enumerate(traces):
+            key = _key(trace["trace_id"])
+            files[_partition(key, partitions)].write(f"{key}\t{value(index, trace)}\n")
+            records += 1
+    perf.count("traces.partitioned", records)
+    return paths
+
+
+def _digest_value(index: int, trace: Dict[str, Any]) -> str:
+    return trace_digest(trace)
+
+
+def _index_value(index: int, trace: Dict[str, Any]) -> str:
+    return str(index)
+
+
+def _read_partition(path: Path) -> Iterator[List[str]]:
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            yield line.rstrip("\n").split("\t")
+
+
+def diff_traces(
+    a: TraceSource,
+    b: TraceSource,
+    partitions: Optional[int] = None,
+    tmp_dir: Optional[str] = None,
+    skip_invalid: bool = False,
+) -> Iterator[TraceChange]:
+    """
+    Stream the differences between two trace collections.
+
+    Args:
+        a: Old traces - a file path (streamed) or an iterable of trace dicts
+        b: New traces, same forms as ``a``
+        partitions: Number of on-disk partitions (default: one per 64 MiB
+            of decompressed input, at least 16 for iterables, at most 256)
+        tmp_dir: Directory for the partition files (default: system temp)
+        skip_invalid: For file input, skip invalid records instead of raising
+
+    Yields:
+        TraceChange for every id only in ``b`` (added), only in ``a``
+        (removed), or in both with different content (changed). Changes
+        come partition by partition, not in file order. When an id repeats
+        within one input, its first occurrence is the one compared.
+    """
+    partitions = _partition_count((a, b), partitions)
+    with tempfile.TemporaryDirectory(prefix="trace-diff-", dir=tmp_dir) as directory:
+        with perf.stage("traces.diff.partition"):
+            old = _write_partitions(_traces(a, skip_invalid), Path(directory), "a", partitions, _digest_value)
+            new = _write_partitions(_traces(b, skip_invalid), Path(directory), "b", partitions, _digest_value)
+
+        for old_path, new_path in zip(old, new):
+            with perf.stage("traces.diff.join"):
+                before: Dict[str, str] = {}
+                for key, value in _read_partition(old_path):
+                    before.setdefault(key, value)
+                changes: List[TraceChange] = []
+                seen: Set[str] = set()
+                for key, value in _read_partition(new_path):
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    previous = before.pop(key, None)
+                    if previous is None:
+                        changes.append(TraceChange(ADDED, json.loads(key)))
+                    elif previous != value:
+                        changes.append(TraceChange(CHANGED, json.loads(key)))
+                changes.extend(TraceChange(REMOVED, json.loads(key)) for key in before)
+            yield from changes
+
+
+def _duplicate_indexes(path: Path, out: Path) -> Path:
+    """Write the sorted record indexes of repeated ids in one partition."""
+    seen: Set[str] = set()
+    with open(out, "w", encoding="utf-8") as f:
+        for key, index in _read_partition(path):
+            if key in seen:
+                f.write(f"{index}\n")
+            else:
+                seen.add(key)
+    return out
+
+
+def _read_indexes(path: Path) -> Iterator[int]:
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            yield int(line)
+
+
+def dedupe_traces(
+    source: TraceSource,
+    partitions: Optional[int] = None,
+    tmp_dir: Optional[str] = None,
+    skip_invalid: bool = False,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Stream traces, dropping every repeat of a ``trace_id`` after its first.
+
+    File input takes two passes in bounded memory: the first partitions
+    ids with their record index to find the indexes of repeats, the
+    second streams the file again and skips them. Any other iterable is
+    deduplicated in one pass with an in-memory set of ids.
+
+    Yields:
+        Traces in their original order
+    """
+    if not isinstance(source, (str, Path)):
+        seen: Set[str] = set()
+        for trace in source:
+            key = _key(trace["trace_id"])
+            if key not in seen:
+                seen.add(key)
+                yield trace
+        return
+
+    partitions = _partition_count((source,), partitions)
+    with tempfile.TemporaryDirectory(prefix="trace-dedupe-", dir=tmp_dir) as directory:
+        with perf.stage("traces.dedupe.partition"):
+            parts = _write_partitions(_traces(source, skip_invalid), Path(directory), "ids", partitions, _index_value)
+            duplicates = [_duplicate_indexes(path, path.with_suffix(".dup")) for path in parts]
+
+        # Indexes within each partition are ascending, so a k-way merge yields all repeats in order
+        repeats = heapq.merge(*(_read_indexes(path) for path in duplicates))
+        next_repeat = next(repeats, None)
+        dropped = 0
+        for position, trace in enumerate(_traces(source, skip_invalid)):
+            if position == next_repeat:
+                next_repeat = next(repeats, None)
+                dropped += 1
+                continue
+            yield trace
+        perf.count("traces.deduped", dropped)
@@ -0,0 +1,319 @@
+"""
+Trace import.
+
+``import_traces`` from project-book.ipynb: loads and validates trace
+records (``trace_id``, ``state``, ``input``, ``output``) from a JSON file.
+``iter_traces`` streams the same records one at a time, so files larger
+than memory can be processed in a single pass. Both read gzip, bzip2, xz
+and zstd files directly (detected from their magic bytes), decompressing
+multi-frame archives on all cores.
+"""
+
+import itertools
+import json
+import os
+import random
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple, Union
+
+from . import perf
+
+REQUIRED_FIELDS = ['trace_id', 'state', 'input', 'output']
+
+
+def validate_trace(trace: Any, idx: Union[int, str], required_fields: List[str] = REQUIRED_FIELDS) -> Optional[str]:
+    """
+    Check one trace record.
+    
+    Returns:
+        None if the trace is valid, otherwise a description of the problem
+    """
+    if not isinstance(trace, dict):
+        return f"Trace at index {idx} is not a dictionary: {type(trace).__name__}"
+    
+    # Check for missing required fields
+    missing_fields = [field for field in required_fields if field not in trace]
+    
+    if missing_fields:
+        # Build a helpful error message
+        return (
+            f"Trace at index {idx} is missing required fields: {', '.join(missing_fields)}. "
+            f"Available fields: {', '.join(trace.keys()) if trace.keys() else 'none'}. "
+            f"Required fields are: {', '.join(required_fields)}"
+        )
+    
+    # Validate that required fields are not None
+    none_fields = [field for field in required_fields if trace[field] is None]
+    if none_fields:
+        return f"Trace at index {idx} has null values for required fields: {', '.join(none_fields)}"
+    
+    return None
+
+
+@perf.profiled("traces.import_traces")
+def import_traces(
+    json_file_path: str,
+    head: Optional[int] = None,
+    sample: Optional[int] = None,
+    seed: Optional[int] = None,
+    seek: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    Import trace data from a JSON file with proper error handling.
+    
+    Handles JSON files containing trace data with required fields:
+    - trace_id: Unique identifier for the trace
+    - state: Current state of the trace
+    - input: Input data for the trace
+    - output: Output data from the trace
+    
+    Args:
+        json_file_path: Path to the JSON file containing trace data,
+            optionally gzip/bzip2/xz/zstd-compressed
+        head: Only read the first ``head`` traces
+        sample: Return a uniform random sample of ``sample`` traces (all of
+            them if the file has fewer), in file order
+        seed: Random seed for ``sample``
+        seek: With ``sample``, read JSON Lines files at random byte offsets
+            instead of streaming the whole file: each offset selects the line
+            after it (the first line when past the last). Time depends on the
+            sample size, not the file size; the sample is approximately
+            uniform when line lengths are similar and may hold fewer traces
+            than requested on very short files
+        
+    Returns:
+        List of trace dictionaries with validated fields. With ``head`` or
+        ``sample`` only the returned traces are validated.
+        
+    Raises:
+        FileNotFoundError: If the JSON file doesn't exist
+        json.JSONDecodeError: If the file contains invalid JSON
+        ValueError: If required fields are missing or invalid
+        
+    Example:
+        >>> traces = import_traces("traces.json")
+        >>> for trace in traces:
+        ...     print(f"Trace {trace['trace_id']}: {trace['state']}")
+        >>> preview = import_traces("huge.jsonl", sample=1000, seed=1, seek=True)
+    """
+    # Check if file exists
+    if not Path(json_file_path).exists():
+        raise FileNotFoundError(f"Trace file not found: {json_file_path}")
+    
+    if perf.enabled():
+        perf.count("traces.files")
+        perf.count("traces.bytes", os.path.getsize(json_file_path))
+    
+    if head is not None and sample is not None:
+        raise ValueError("head and sample are mutually exclusive")
+    if seek and sample is None:
+        raise ValueError("seek sampling needs sample=N")
+    for name, n in (("head", head), ("sample", sample)):
+        if n is not None and n < 1:
+            raise ValueError(f"{name} must be at least 1, got {n}")
+    
+    if head is not None:
+        records = _head_records(json_file_path, head)
+    elif sample is not None:
+        rng = random.Random(seed)
+        if seek:
+            records = _seek_records(json_file_path, sample, rng)
+        else:
+            records = _reservoir_records(json_file_path, sample, rng)
+    else:
+        records = enumerate(_load_all(json_file_path))
+    
+    # Required fields for trace data
+    required_fields = REQUIRED_FIELDS
+    
+    # Validate each trace
+    validated_traces = []
+    errors = []
+    
+    for idx, trace in records:
+        error_msg = validate_trace(trace, idx, required_fields)
+        if error_msg is not None:
+            errors.append(error_msg)
+            continue
+        
+        validated_traces.append(trace)
+    
+    # If we have errors, raise a comprehensive error message
+    if errors:
+        error_summary = f"Found {len(errors)} invalid trace(s) in {json_file_path}:\n"
+        error_summary += "\n".join(f"  - {err}" for err in errors[:5])  # Show first 5 errors
+        if len(errors) > 5:
+            error_summary += f"\n  ... and {len(errors) - 5} more error(s)"
+        raise ValueError(error_summary)
+    
+    if not validated_traces:
+        raise ValueError(f"No valid traces found in {json_file_path}")
+    
+    perf.count("traces.records", len(validated_traces))
+    return validated_traces
+
+
+def _load_all(json_file_path: str) -> List[Any]:
+    """Parse a whole trace file (JSON array, object or JSON Lines) into a list of records."""
+    from ._compressed import open_text
+    from ._jsonstream import iter_json_lines
+
+    # Read and parse JSON
+    try:
+        with open_text(json_file_path) as f:
+            text = f.read()
+        try:
+            data = json.loads(text)
+        except json.JSONDecodeError as e:
+            # Several top-level values are only accepted as JSON Lines
+            if e.msg != "Extra data":
+                raise
+            try:
+                data = list(iter_json_lines(text))
+            except json.JSONDecodeError:
+                raise e from None
+    except json.JSONDecodeError as e:
+        raise json.JSONDecodeError(
+            f"Invalid JSON in file {json_file_path}: {str(e)}", 
+            e.doc, 
+            e.pos
+        )
+    
+    # Ensure data is a list
+    if isinstance(data, dict):
+        # If it's a single trace object, wrap it in a list
+        data = [data]
+    elif not isinstance(data, list):
+        raise ValueError(
+            f"Expected JSON to contain a list or dict, got {type(data).__name__}"
+        )
+    return data
+
+
+def _head_records(json_file_path: str, n: int) -> List[Tuple[int, Any]]:
+    """The first n records, parsed incrementally."""
+    from ._compressed import open_text
+
+    with open_text(json_file_path) as f:
+        return list(itertools.islice(enumerate(iter_trace_values(f)), n))
+
+
+def _reservoir_records(json_file_path: str, n: int, rng: random.Random) -> List[Tuple[int, Any]]:
+    """Uniform sample of n records in one streamed pass (reservoir sampling)."""
+    from ._compressed import open_text
+
+    reservoir: List[Tuple[int, Any]] = []
+    with open_text(json_file_path) as f:
+        for idx, record in enumerate(iter_trace_values(f)):
+            if idx < n:
+                reservoir.append((idx, record))
+            else:
+                slot = rng.randrange(idx + 1)
+                if slot < n:
+                    reservoir[slot] = (idx, record)
+    reservoir.sort(key=lambda item: item[0])
+    return reservoir
+
+
+def _line_after(f: BinaryIO, offset: int) -> Optional[Tuple[int, bytes]]:
+    """Start and content of the first non-blank line starting at or after offset, wrapping at EOF."""
+    if offset:
+        # Finish the line holding offset - 1; this is where a line at offset starts
+        f.seek(offset - 1)
+        f.readline()
+    else:
+        f.seek(0)
+    wrapped = False
+    while True:
+        start = f.tell()
+        line = f.readline()
+        if not line:
+            if wrapped:
+                return None
+            f.seek(0)
+            wrapped = True
+        elif line.strip():
+            return start, line
+
+
+def _seek_records(json_file_path: str, n: int, rng: random.Random) -> List[Tuple[str, Any]]:
+    """Sample n JSON Lines records by seeking to random byte offsets."""
+    from ._compressed import detect_compression
+
+    if detect_compression(json_file_path) is not None:
+        raise ValueError(f"Seek sampling needs an uncompressed JSON Lines file: {json_file_path}")
+    size = os.path.getsize(json_file_path)
+    lines: Dict[int, bytes] = {}
+    with open(json_file_path, 'rb') as f:
+        # Offsets falling into an already sampled line are redrawn a bounded number of times
+        for _ in range(4 * n + 16):
+            if len(lines) >= n or not size:
+                break
+            found = _line_after(f, rng.randrange(size))
+            if found is None:
+                break
+            lines.setdefault(*found)
+    
+    records = []
+    for idx, (start, line) in enumerate(sorted(lines.items())):
+        try:
+            records.append((f"{idx} (byte offset {start})", json.loads(line)))
+        except json.JSONDecodeError as e:
+            raise json.JSONDecodeError(
+                f"Invalid JSON line at byte offset {start} in {json_file_path} "
+                f"(seek sampling needs JSON Lines): {e.msg}",
+                e.doc,
+                e.pos
+            )
+    return records
+
+
+def iter_trace_values(fp) -> Iterator[Any]:
+    """
+    Yield the top-level records of a trace stream one at a time.
+    
+    Accepts a JSON array of traces, a single trace object, or JSON Lines
+    (any whitespace-separated sequence of JSON values).
+    """
+    from ._jsonstream import JSONStreamReader
+
+    reader = JSONStreamReader(fp)
+    if reader.peek() == "[":
+        reader.expect("[")
+        yield from reader.items()
+        if not reader.at_end():
+            raise reader._error("Unexpected data after the trace array")
+        return
+    while not reader.at_end():
+        yield reader.value()
+
+
+def iter_traces(json_file_path: str, skip_invalid: bool = False) -> Iterator[Dict[str, Any]]:
+    """
+    Stream validated traces from a file in constant memory.
+    
+    Args:
+        json_file_path: JSON array, single trace object or JSON Lines file,
+            optionally compressed
+        skip_invalid: Skip invalid records instead of raising
+    
+    Yields:
+        Trace dictionaries with the required fields
+    
+    Raises:
+        FileNotFoundError: If the file doesn't exist
+        json.JSONDecodeError: If the file contains invalid JSON
+        ValueError: On the first invalid trace, unless skip_invalid is set
+    """
+    if not Path(json_file_path).exists():
+        raise FileNotFoundError(f"Trace file not found: {json_file_path}")
+    
+    from ._compressed import open_text
+
+    with open_text(json_file_path) as f:
+        for idx, trace in enumerate(iter_trace_values(f)):
+            error_msg = validate_trace(trace, idx)
+            if error_msg is None:
+                yield trace
+            elif not skip_invalid:
+                raise ValueError(f"Invalid trace in {json_file_path}: {error_msg}")